@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+
+class LatestValueChannel:
+    def __init__(self, name):
+        """
+        Görevler arasında en son değeri taşıyan kanal. Yazıcı hiçbir zaman
+        beklemez; okuyucu yalnızca en son değeri görür, arada kalan değerler atlanır.
+
+        Args:
+            name (str): Kanal adı
+        """
+        self.name = name
+        self.value = None
+        self.version = 0  # 0: henüz değer yok
+        self.timestamp = None  # Değerin yayınlandığı zaman (time.monotonic)
+        self._updated = asyncio.Event()
+
+    def publish(self, value, timestamp=None):
+        """
+        Yeni bir değer yayınlar
+
+        Args:
+            value: Değer
+            timestamp (float, optional): Değerin ait olduğu zaman (varsayılan: şimdi)
+        """
+        self.value = value
+        self.version += 1
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+        self._updated.set()
+
+    def get(self):
+        """
+        En son değeri beklemeden döndürür
+
+        Returns:
+            object: Değer (henüz yoksa None)
+            int: Değer sürümü
+            float: Değerin zamanı
+        """
+        return self.value, self.version, self.timestamp
+
+    def age(self, now=None):
+        """En son değerin yaşını saniye olarak döndürür (değer yoksa sonsuz)"""
+        if self.timestamp is None:
+            return float("inf")
+        return (time.monotonic() if now is None else now) - self.timestamp
+
+    async def wait_newer(self, version):
+        """
+        Verilen sürümden daha yeni bir değer gelene kadar bekler
+
+        Args:
+            version (int): Okuyucunun en son gördüğü sürüm
+
+        Returns:
+            object: Değer
+            int: Değer sürümü
+            float: Değerin zamanı
+        """
+        while self.version <= version:
+            self._updated.clear()
+            await self._updated.wait()
+        return self.get()
+
+
+class PeriodicTask:
+    def __init__(self, name, step, period, deadline=None):
+        """
+        Sabit periyotla çalışan görev. Her adımın süresi son tarihle karşılaştırılır;
+        son tarihi aşan adımlar sayılır. Bir adım periyottan uzun sürerse kaçırılan
+        periyotlar telafi edilmez, bir sonraki periyot başından devam edilir.
+
+        Args:
+            name (str): Görev adı
+            step (coroutine function): Her periyotta çağrılan async fonksiyon
+            period (float): Periyot (saniye)
+            deadline (float, optional): Adım başına son tarih (saniye, varsayılan: periyot)
+        """
+        self.name = name
+        self.step = step
+        self.period = period
+        self.deadline = period if deadline is None else deadline
+
+        # İstatistikler
+        self.runs = 0
+        self.deadline_misses = 0
+        self.skipped_periods = 0
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+
+    async def run(self):
+        """Görevi iptal edilene kadar çalıştırır"""
+        next_time = time.monotonic()
+        while True:
+            start_time = time.monotonic()
+            await self.step()
+            duration = time.monotonic() - start_time
+
+            self.runs += 1
+            self.total_duration += duration
+            if duration > self.max_duration:
+                self.max_duration = duration
+            if duration > self.deadline:
+                self.deadline_misses += 1
+
+            next_time += self.period
+            now = time.monotonic()
+            if next_time < now:
+                # Geride kalındı: kaçırılan periyotları atla
+                missed = int((now - next_time) / self.period) + 1
+                self.skipped_periods += missed
+                next_time += missed * self.period
+            await asyncio.sleep(next_time - now)
+
+    def get_stats(self):
+        """
+        Görev istatistiklerini döndürür
+
+        Returns:
+            dict: runs, deadline_misses, skipped_periods, mean_ms, max_ms, period_ms, deadline_ms
+        """
+        return {
+            "runs": self.runs,
+            "deadline_misses": self.deadline_misses,
+            "skipped_periods": self.skipped_periods,
+            "mean_ms": self.total_duration / self.runs * 1000 if self.runs else 0.0,
+            "max_ms": self.max_duration * 1000,
+            "period_ms": self.period * 1000,
+            "deadline_ms": self.deadline * 1000
+        }
+
+
+def format_task_stats(tasks):
+    """
+    Görev istatistiklerinin okunabilir özetini döndürür
+
+    Args:
+        tasks (list): PeriodicTask nesneleri
+
+    Returns:
+        str: Özet tablo
+    """
+    lines = [f"{'Görev':<12} {'Periyot':>8} {'Son tarih':>10} {'Adım':>7} {'Aşım':>6} {'Atlanan':>8} "
+             f"{'Ort (ms)':>9} {'Maks (ms)':>10}"]
+    for task in tasks:
+        s = task.get_stats()
+        lines.append(f"{task.name:<12} {s['period_ms']:>8.1f} {s['deadline_ms']:>10.1f} {s['runs']:>7} "
+                     f"{s['deadline_misses']:>6} {s['skipped_periods']:>8} {s['mean_ms']:>9.3f} {s['max_ms']:>10.3f}")
+    return "\n".join(lines)
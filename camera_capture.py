@@ -0,0 +1,96 @@
+import threading
+import time
+
+
+class FrameGrabber:
+    def __init__(self, camera):
+        """
+        Arka planda kameradan sürekli görüntü okuyan sınıf.
+        Yalnızca en son görüntü saklanır (posta kutusu mantığı), böylece
+        sürücü tamponunda eski görüntüler birikmez.
+
+        Args:
+            camera (cv2.VideoCapture): Açılmış kamera nesnesi
+        """
+        self.camera = camera
+        self.running = False
+        self.thread = None
+
+        # En son görüntü ve ona ait bilgiler
+        self.frame = None
+        self.sequence = -1  # Görüntü sıra numarası (-1: henüz görüntü yok)
+        self.timestamp = None  # Yakalama zamanı (time.monotonic)
+        self.error = None
+
+        self.condition = threading.Condition()
+
+    def start(self):
+        """Yakalama iş parçacığını başlatır"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, name="FrameGrabber", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Yakalama iş parçacığını durdurur"""
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _capture_loop(self):
+        """Kameradan sürekli görüntü okur ve en son görüntüyü saklar"""
+        while self.running:
+            ret, frame = self.camera.read()
+            timestamp = time.monotonic()
+
+            with self.condition:
+                if not ret:
+                    # Kamera görüntü vermiyorsa bekleyenleri uyandır ve çık
+                    self.error = "Kameradan görüntü alınamadı"
+                    self.running = False
+                    self.condition.notify_all()
+                    break
+
+                self.frame = frame
+                self.sequence += 1
+                self.timestamp = timestamp
+                self.condition.notify_all()
+
+    def get_latest(self):
+        """
+        En son görüntüyü beklemeden döndürür
+
+        Returns:
+            np.array: En son görüntü (henüz görüntü yoksa None)
+            int: Görüntü sıra numarası
+            float: Yakalama zamanı (time.monotonic)
+        """
+        with self.condition:
+            return self.frame, self.sequence, self.timestamp
+
+    def wait_for_frame(self, last_sequence=-1, timeout=None):
+        """
+        Verilen sıra numarasından daha yeni bir görüntü gelene kadar bekler
+
+        Args:
+            last_sequence (int): Tüketicinin en son işlediği görüntünün sıra numarası
+            timeout (float, optional): Maksimum bekleme süresi (saniye). None ise süresiz bekler.
+
+        Returns:
+            np.array: Yeni görüntü (zaman aşımı veya hata durumunda None)
+            int: Görüntü sıra numarası
+            float: Yakalama zamanı (time.monotonic)
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.sequence > last_sequence or not self.running,
+                timeout=timeout
+            )
+            if self.sequence <= last_sequence:
+                return None, self.sequence, self.timestamp
+            return self.frame, self.sequence, self.timestamp
+
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import cv2
+import numpy as np
+
+# Önbellekteki harita dosyalarının biçim sürümü (harita hesabı değişirse artırılır)
+MAP_FORMAT_VERSION = 1
+
+
+def load_camera_calibration(path):
+    """
+    Kamera kalibrasyonunu dosyadan okur. JSON dosyası veya cv2.calibrateCamera
+    sonuçlarıyla kaydedilmiş .npz dosyası olabilir; her ikisi de camera_matrix,
+    dist_coeffs ve image_size ([genişlik, yükseklik]) anahtarlarını içerir.
+
+    Args:
+        path (str): Kalibrasyon dosyası
+
+    Returns:
+        dict: camera_matrix (3x3), dist_coeffs ve image_size (genişlik, yükseklik)
+    """
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            values = {key: data[key] for key in ("camera_matrix", "dist_coeffs", "image_size")}
+    else:
+        with open(path) as f:
+            values = json.load(f)
+    return {
+        "camera_matrix": np.array(values["camera_matrix"], np.float64).reshape(3, 3),
+        "dist_coeffs": np.array(values["dist_coeffs"], np.float64).ravel(),
+        "image_size": tuple(int(v) for v in values["image_size"])
+    }
+
+
+def scaled_camera_matrix(calibration, frame_size):
+    """
+    Kamera matrisini kalibrasyon çözünürlüğünden görüntü çözünürlüğüne ölçekler
+    (distorsiyon katsayıları normalize koordinatlarda olduğundan değişmez)
+
+    Args:
+        calibration (dict): load_camera_calibration sonucu
+        frame_size (tuple): Görüntü boyutu (genişlik, yükseklik)
+
+    Returns:
+        np.array: 3x3 kamera matrisi
+    """
+    scale_x = frame_size[0] / calibration["image_size"][0]
+    scale_y = frame_size[1] / calibration["image_size"][1]
+    return np.diag([scale_x, scale_y, 1.0]) @ calibration["camera_matrix"]
+
+
+def build_birdseye_maps(frame_size, output_size, warp_matrix, calibration=None):
+    """
+    Distorsiyon giderme ve perspektif dönüşümünü tek bir cv2.remap haritasında
+    birleştirir. Harita yalnızca çıktı görüntüsünün pikselleri için hesaplanır: her
+    çıktı pikseli ters perspektifle düzeltilmiş görüntüye, oradan da lens
+    modeliyle ham görüntüdeki konumuna götürülür.
+
+    Args:
+        frame_size (tuple): Ham görüntü boyutu (genişlik, yükseklik)
+        output_size (tuple): Çıktı boyutu (genişlik, yükseklik)
+        warp_matrix (np.array): Düzeltilmiş görüntüden çıktıya 3x3 perspektif matrisi
+        calibration (dict, optional): load_camera_calibration sonucu (None: distorsiyon yok)
+
+    Returns:
+        np.array: Sabit noktalı koordinat haritası (H, W, 2) int16 (CV_16SC2)
+        np.array: İnterpolasyon tablosu indeksleri (H, W) uint16
+    """
+    width, height = output_size
+    u, v = np.meshgrid(np.arange(width, dtype=np.float64), np.arange(height, dtype=np.float64))
+    points = np.stack([u.ravel(), v.ravel(), np.ones(u.size)])
+
+    # Çıktı pikseli -> düzeltilmiş görüntü pikseli
+    source = np.linalg.inv(warp_matrix) @ points
+    source = source[:2] / source[2]
+
+    if calibration is not None:
+        # Düzeltilmiş piksel -> normalize kamera koordinatı -> ham (distorsiyonlu) piksel
+        camera_matrix = scaled_camera_matrix(calibration, frame_size)
+        fx, fy = camera_matrix[0, 0], camera_matrix[1, 1]
+        cx, cy = camera_matrix[0, 2], camera_matrix[1, 2]
+        rays = np.stack([(source[0] - cx) / fx, (source[1] - cy) / fy, np.ones(source.shape[1])], axis=1)
+        projected, _ = cv2.projectPoints(rays.reshape(-1, 1, 3), np.zeros(3), np.zeros(3),
+                                         camera_matrix, calibration["dist_coeffs"])
+        source = projected.reshape(-1, 2).T
+
+    map_x = source[0].reshape(height, width).astype(np.float32)
+    map_y = source[1].reshape(height, width).astype(np.float32)
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+
+def map_cache_key(frame_size, output_size, warp_matrix, calibration=None):
+    """
+    Harita önbelleği anahtarını döndürür (kalibrasyon, çözünürlükler ve perspektif matrisinden)
+
+    Returns:
+        str: Onaltılık özet
+    """
+    digest = hashlib.sha1()
+    digest.update(f"v{MAP_FORMAT_VERSION}:{tuple(frame_size)}:{tuple(output_size)}".encode())
+    digest.update(np.ascontiguousarray(warp_matrix, np.float64).tobytes())
+    if calibration is not None:
+        digest.update(np.ascontiguousarray(calibration["camera_matrix"], np.float64).tobytes())
+        digest.update(np.ascontiguousarray(calibration["dist_coeffs"], np.float64).tobytes())
+        digest.update(str(tuple(calibration["image_size"])).encode())
+    return digest.hexdigest()[:16]
+
+
+class BirdseyeRemap:
+    def __init__(self, frame_size, output_size, warp_matrix, calibration=None, cache_dir=None):
+        """
+        Ham kamera görüntüsünü tek bir cv2.remap geçişiyle distorsiyonu giderilmiş kuş
+        bakışı görünüme çeviren sınıf. Haritalar sabit noktalıdır (CV_16SC2) ve
+        verilirse önbellek klasöründe .npy dosyaları olarak saklanır; sonraki
+        açılışlarda bellek eşlemeli (mmap) olarak hemen yüklenir.
+
+        Args:
+            frame_size (tuple): Ham görüntü boyutu (genişlik, yükseklik)
+            output_size (tuple): Çıktı boyutu (genişlik, yükseklik)
+            warp_matrix (np.array): Düzeltilmiş görüntüden çıktıya 3x3 perspektif matrisi
+            calibration (dict, optional): load_camera_calibration sonucu (None: distorsiyon yok)
+            cache_dir (str, optional): Harita önbelleği klasörü (None: önbellek yok)
+        """
+        self.frame_size = tuple(frame_size)
+        self.output_size = tuple(output_size)
+        self.loaded_from_cache = False
+
+        key = map_cache_key(frame_size, output_size, warp_matrix, calibration)
+        paths = None
+        if cache_dir is not None:
+            paths = [os.path.join(cache_dir, f"birdseye_{key}_{part}.npy") for part in ("xy", "fraction")]
+            if all(os.path.exists(path) for path in paths):
+                self.map_xy, self.map_fraction = [np.load(path, mmap_mode="r") for path in paths]
+                self.loaded_from_cache = True
+                return
+
+        self.map_xy, self.map_fraction = build_birdseye_maps(frame_size, output_size, warp_matrix, calibration)
+        if paths is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            for path, data in zip(paths, (self.map_xy, self.map_fraction)):
+                # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yaz
+                temporary = f"{path}.{os.getpid()}.tmp"
+                with open(temporary, "wb") as f:
+                    np.save(f, data)
+                os.replace(temporary, path)
+
+    def remap(self, frame, out=None):
+        """
+        Görüntüyü kuş bakışı görünüme çevirir
+
+        Args:
+            frame (np.array): Ham BGR görüntü (frame_size boyutunda)
+            out (np.array, optional): Sonucun yazılacağı tampon
+
+        Returns:
+            np.array: Kuş bakışı görüntü (output_size boyutunda)
+        """
+        return cv2.remap(frame, self.map_xy, self.map_fraction, cv2.INTER_LINEAR, dst=out)
@@ -0,0 +1,320 @@
+import cv2
+import numpy as np
+
+
+class Bgr565LookupTable:
+    def __init__(self):
+        """
+        5-6-5 bit nicemlenmiş BGR değerleriyle indekslenen arama tablosu (65536 girdi,
+        64 KB), böylece işlemci önbelleğine sığar. OpenCV'nin BGR565 dönüşümü indeks
+        hesaplamasını tek bir hızlı geçişte yapar. Tabloyu alt sınıflar doldurur.
+        """
+        self.table = np.zeros(1 << 16, np.uint8)
+
+        # Yeniden kullanılan ara tamponlar (görüntü boyutuna göre)
+        self._packed_buffer = None
+        self._index_buffer = None
+
+    def hsv_blocks(self):
+        """
+        Tüm BGR renklerini B'nin 5 bitlik değerine göre 32 blokta HSV'ye çevirir.
+        Her 5-6-5 hücresi 8x4x8 = 256 farklı BGR rengini kapsar.
+
+        Yields:
+            np.array: Bloktaki renklerin HSV değerleri (8 * 256, 256, 3)
+            np.array: Bloktaki hücrelerin tablo indeksleri (64, 32)
+        """
+        g = np.arange(256, dtype=np.uint8)
+        r = np.arange(256, dtype=np.uint8)
+        block = np.empty((8, 256, 256, 3), np.uint8)
+        block[..., 1] = g[None, :, None]
+        block[..., 2] = r[None, None, :]
+
+        # 5-6-5 indeks düzeni: B alt 5 bit, G orta 6 bit, R üst 5 bit
+        g6 = np.arange(64)[:, None]
+        r5 = np.arange(32)[None, :]
+
+        for b5 in range(32):
+            block[..., 0] = np.arange(b5 * 8, b5 * 8 + 8, dtype=np.uint8)[:, None, None]
+            hsv = cv2.cvtColor(block.reshape(8 * 256, 256, 3), cv2.COLOR_BGR2HSV)
+            yield hsv, b5 | (g6 << 5) | (r5 << 11)
+
+    @staticmethod
+    def majority(mask):
+        """
+        Bir bloğun maskesinden hücre başına çoğunluk oyunu hesaplar
+
+        Args:
+            mask (np.array): hsv_blocks bloğunun maskesi (8 * 256, 256)
+
+        Returns:
+            np.array: (64, 32) bool, hücredeki renklerin en az yarısı maskedeyse True
+        """
+        # (B düşük bitleri, G6, G düşük bitleri, R5, R düşük bitleri)
+        votes = (mask.reshape(8, 64, 4, 32, 8) > 0).sum(axis=(0, 2, 4))
+        return votes * 2 >= 256
+
+    def classify(self, bgr, out=None):
+        """
+        BGR görüntüyü tablo değerlerine çevirir
+
+        Args:
+            bgr (np.array): BGR görüntü (H, W, 3)
+            out (np.array, optional): Sonucun yazılacağı (H, W) uint8 tampon
+
+        Returns:
+            np.array: Tablo değerleri (H, W) uint8
+        """
+        height, width = bgr.shape[:2]
+        if self._index_buffer is None or self._index_buffer.shape != (height, width):
+            self._packed_buffer = np.empty((height, width, 2), np.uint8)
+            self._index_buffer = np.empty((height, width), np.intp)
+
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2BGR565, dst=self._packed_buffer)
+
+        # np.take indeksleri intp'ye çevirirken her seferinde yeni dizi ayırır;
+        # önceden ayrılmış tampona kopyalamak hem bellek ayırmayı önler hem de daha hızlıdır
+        np.copyto(self._index_buffer, self._packed_buffer.view(np.uint16)[..., 0])
+
+        return self.lookup(self._index_buffer, out)
+
+    def last_index(self):
+        """
+        Son sınıflandırılan görüntünün tablo indekslerini döndürür. Aynı görüntüyü
+        başka bir tabloyla da sınıflandırmak için lookup ile kullanılır; böylece
+        BGR565 dönüşümü tekrarlanmaz. Tampon sonraki classify çağrısında üzerine yazılır.
+
+        Returns:
+            np.array: (H, W) intp indeksler veya henüz sınıflandırma yapılmadıysa None
+        """
+        return self._index_buffer
+
+    def lookup(self, index, out=None):
+        """
+        Hazır tablo indekslerini tablo değerlerine çevirir
+
+        Args:
+            index (np.array): (H, W) intp indeksler (ör. başka bir tablonun last_index çıktısı)
+            out (np.array, optional): Sonucun yazılacağı (H, W) uint8 tampon
+
+        Returns:
+            np.array: Tablo değerleri (H, W) uint8
+        """
+        if out is None:
+            out = np.empty(index.shape, np.uint8)
+        np.take(self.table, index, out=out, mode="clip")  # "raise" modu çıktıyı tamponlar
+        return out
+
+
+class ColorLookupTable(Bgr565LookupTable):
+    def __init__(self, lower_hsv, upper_hsv):
+        """
+        BGR piksellerini tek geçişte maske değerine çeviren arama tablosu.
+        classify çıktısı cv2.inRange çıktısıyla aynı biçimdedir (0 veya 255).
+
+        Args:
+            lower_hsv (np.array): Alt HSV değerleri [H, S, V]
+            upper_hsv (np.array): Üst HSV değerleri [H, S, V]
+        """
+        super().__init__()
+        self.lower_hsv = None
+        self.upper_hsv = None
+        self.set_range(lower_hsv, upper_hsv)
+
+    def set_range(self, lower_hsv, upper_hsv):
+        """
+        HSV aralığını ayarlar. Tablo yalnızca aralık değiştiyse yeniden oluşturulur.
+
+        Args:
+            lower_hsv (np.array): Alt HSV değerleri [H, S, V]
+            upper_hsv (np.array): Üst HSV değerleri [H, S, V]
+
+        Returns:
+            bool: Tablo yeniden oluşturulduysa True
+        """
+        lower_hsv = np.array(lower_hsv)
+        upper_hsv = np.array(upper_hsv)
+        if (self.lower_hsv is not None
+                and np.array_equal(lower_hsv, self.lower_hsv)
+                and np.array_equal(upper_hsv, self.upper_hsv)):
+            return False
+
+        self.lower_hsv = lower_hsv
+        self.upper_hsv = upper_hsv
+        self.build()
+        return True
+
+    def build(self):
+        """
+        Tabloyu oluşturur. Hücre, renklerin çoğunluğu HSV aralığına giriyorsa
+        maskeye dahil edilir.
+        """
+        for hsv, index in self.hsv_blocks():
+            mask = cv2.inRange(hsv, self.lower_hsv, self.upper_hsv)
+            self.table[index] = np.where(self.majority(mask), 255, 0)
+
+
+class LabelLookupTable(Bgr565LookupTable):
+    def __init__(self, class_ranges):
+        """
+        BGR piksellerini tek geçişte sınıf etiketine çeviren arama tablosu. Her sınıf
+        etiketin bir bitidir (en fazla 8 sınıf); aralıkları çakışan sınıflarda piksel
+        birden fazla bit taşır.
+
+        Args:
+            class_ranges (list): Her sınıf için (alt HSV, üst HSV) aralıklarının listesi.
+                                 Sınıfın bit sırası listedeki sırasıdır.
+        """
+        super().__init__()
+        self.class_ranges = None
+        self._key = None
+        self.set_class_ranges(class_ranges)
+
+    def set_class_ranges(self, class_ranges):
+        """
+        Sınıf aralıklarını ayarlar. Tablo yalnızca aralıklar değiştiyse yeniden oluşturulur.
+
+        Args:
+            class_ranges (list): Her sınıf için (alt HSV, üst HSV) aralıklarının listesi
+
+        Returns:
+            bool: Tablo yeniden oluşturulduysa True
+        """
+        if len(class_ranges) > 8:
+            raise ValueError(f"En fazla 8 sınıf desteklenir: {len(class_ranges)}")
+
+        # Karşılaştırma için aralıkları tek bir diziye düzleştir
+        class_ranges = [[(np.array(lower), np.array(upper)) for lower, upper in ranges]
+                        for ranges in class_ranges]
+        key = [np.concatenate([np.concatenate(pair) for pair in ranges]).tolist() for ranges in class_ranges]
+        if key == self._key:
+            return False
+
+        self.class_ranges = class_ranges
+        self._key = key
+        self.build()
+        return True
+
+    def build(self):
+        """
+        Tabloyu oluşturur. Her blok bir kez HSV'ye çevrilir; hücre, renklerin
+        çoğunluğu sınıfın aralıklarından birine giriyorsa sınıfın bitini alır.
+        """
+        for hsv, index in self.hsv_blocks():
+            labels = np.zeros(index.shape, np.uint8)
+            for bit, ranges in enumerate(self.class_ranges):
+                mask = cv2.inRange(hsv, ranges[0][0], ranges[0][1])
+                for lower, upper in ranges[1:]:
+                    cv2.bitwise_or(mask, cv2.inRange(hsv, lower, upper), dst=mask)
+                labels[self.majority(mask)] |= 1 << bit
+            self.table[index] = labels
+
+
+class YuvLookupTable:
+    def __init__(self, lower_hsv, upper_hsv):
+        """
+        YUV420 görüntülerde (Y, U, V) üçlülerini doğrudan maske değerine çeviren
+        arama tablosu. Tablo HSV aralığından türetilir, böylece mevcut kalibrasyon
+        değerleri aynen kullanılabilir. İndeks düzeni: Y üst 6 bit, U orta 5 bit,
+        V alt 5 bit (65536 girdi, 64 KB).
+
+        Renk dönüşümü OpenCV'nin COLOR_YUV2BGR_I420 dönüşümüyle aynıdır.
+
+        Args:
+            lower_hsv (np.array): Alt HSV değerleri [H, S, V]
+            upper_hsv (np.array): Üst HSV değerleri [H, S, V]
+        """
+        self.lower_hsv = None
+        self.upper_hsv = None
+        self.table = np.zeros(1 << 16, np.uint8)
+
+        # Yeniden kullanılan ara tamponlar (kroma düzlemi boyutuna göre)
+        self._index_buffer = None
+        self._part_buffer = None
+
+        self.set_range(lower_hsv, upper_hsv)
+
+    def set_range(self, lower_hsv, upper_hsv):
+        """
+        HSV aralığını ayarlar. Tablo yalnızca aralık değiştiyse yeniden oluşturulur.
+
+        Args:
+            lower_hsv (np.array): Alt HSV değerleri [H, S, V]
+            upper_hsv (np.array): Üst HSV değerleri [H, S, V]
+
+        Returns:
+            bool: Tablo yeniden oluşturulduysa True
+        """
+        lower_hsv = np.array(lower_hsv)
+        upper_hsv = np.array(upper_hsv)
+        if (self.lower_hsv is not None
+                and np.array_equal(lower_hsv, self.lower_hsv)
+                and np.array_equal(upper_hsv, self.upper_hsv)):
+            return False
+
+        self.lower_hsv = lower_hsv
+        self.upper_hsv = upper_hsv
+        self.build()
+        return True
+
+    def build(self):
+        """
+        Tabloyu oluşturur. Her hücreden 2x2x2 = 8 örnek alınır; hücre, örneklerin
+        çoğunluğu HSV aralığına giriyorsa maskeye dahil edilir.
+        """
+        # Hücre içindeki örnek konumları (hücre genişliğinin 1/4 ve 3/4'ü)
+        y_samples = (np.arange(64)[:, None] * 4 + np.array([1, 3])[None, :]).ravel()
+        uv_samples = (np.arange(32)[:, None] * 8 + np.array([2, 6])[None, :]).ravel()
+        y, u, v = np.meshgrid(y_samples, uv_samples, uv_samples, indexing="ij")
+        count = y.size
+
+        # Her örnek için 2x2 aynı renkli blok içeren bir I420 görüntü oluştur
+        columns = 512
+        rows = count // columns
+        y_plane = np.repeat(np.repeat(y.reshape(rows, columns), 2, axis=0), 2, axis=1)
+        i420 = np.concatenate([
+            y_plane.astype(np.uint8).ravel(),
+            u.astype(np.uint8).ravel(),
+            v.astype(np.uint8).ravel()
+        ]).reshape(rows * 3, columns * 2)
+
+        bgr = cv2.cvtColor(i420, cv2.COLOR_YUV2BGR_I420)[::2, ::2]
+        hsv = cv2.cvtColor(np.ascontiguousarray(bgr), cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, self.lower_hsv, self.upper_hsv)
+
+        # (Y6, Y örneği, U5, U örneği, V5, V örneği)
+        votes = (mask.reshape(64, 2, 32, 2, 32, 2) > 0).sum(axis=(1, 3, 5))
+        self.table[:] = np.where(votes.ravel() * 2 >= 8, 255, 0)
+
+    def classify(self, y, u, v, out=None):
+        """
+        Kroma çözünürlüğündeki Y, U, V düzlemlerini maskeye çevirir
+
+        Args:
+            y (np.array): Kroma çözünürlüğüne örneklenmiş Y düzlemi (H, W)
+            u (np.array): U düzlemi (H, W)
+            v (np.array): V düzlemi (H, W)
+            out (np.array, optional): Sonucun yazılacağı (H, W) uint8 tampon
+
+        Returns:
+            np.array: Maske (H, W) uint8
+        """
+        shape = u.shape
+        if self._index_buffer is None or self._index_buffer.shape != shape:
+            self._index_buffer = np.empty(shape, np.intp)
+            self._part_buffer = np.empty(shape, np.intp)
+
+        index = self._index_buffer
+        part = self._part_buffer
+        np.right_shift(y, 2, out=index)
+        np.left_shift(index, 10, out=index)
+        np.right_shift(u, 3, out=part)
+        np.left_shift(part, 5, out=part)
+        np.bitwise_or(index, part, out=index)
+        np.right_shift(v, 3, out=part)
+        np.bitwise_or(index, part, out=index)
+
+        if out is None:
+            out = np.empty(shape, np.uint8)
+        np.take(self.table, index, out=out, mode="clip")  # "raise" modu çıktıyı tamponlar
+        return out
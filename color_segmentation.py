@@ -0,0 +1,271 @@
+import cv2
+import numpy as np
+from color_lut import LabelLookupTable
+
+# Varsayılan renk sınıfları: (ad, [(alt HSV, üst HSV), ...]). Kırmızı renk tonu 0 ve 179
+# etrafında iki parçadır. Kırmızı lamba ve kırmızı park alanı renkçe çakışır; ayrımı
+# sorgulanan bölge (ROI) yapar.
+DEFAULT_COLOR_CLASSES = [
+    ("green_lamp", [([40, 50, 50], [90, 255, 255])]),
+    ("red_lamp", [([0, 100, 100], [10, 255, 255]), ([170, 100, 100], [179, 255, 255])]),
+    ("orange_obstacle", [([11, 120, 120], [25, 255, 255])]),
+    ("red_parking", [([0, 70, 50], [10, 255, 255]), ([170, 70, 50], [179, 255, 255])])
+]
+
+
+class SegmentationResult:
+    def __init__(self, labels, class_names, frame_shape, box=None):
+        """
+        Bir görüntünün renk bölütleme sonucu. Algılayıcılar görüntüyü yeniden
+        işlemek yerine bu sonucu bölge bazında sorgular.
+
+        Args:
+            labels (np.array): Etiket görüntüsü (H, W) uint8; her sınıf bir bittir
+            class_names (list): Sınıf adları (bit sırasıyla)
+            frame_shape (tuple): Bölütlenen görüntünün boyutu
+            box (tuple, optional): Bölütlenen bölge (x1, y1, x2, y2) görüntü koordinatlarında
+                                   (None: tüm görüntü). Sorgular bu bölgeyle kırpılır.
+        """
+        self.labels = labels
+        self.class_names = list(class_names)
+        self.bits = {name: 1 << index for index, name in enumerate(self.class_names)}
+        self.frame_shape = frame_shape[:2]
+        self.box = box if box is not None else (0, 0, frame_shape[1], frame_shape[0])
+
+        # Etiket görüntüsü ile bölütlenen bölge arasındaki ölçek (küçültülmüş bölütlemede < 1)
+        self.scale_x = labels.shape[1] / max(1, self.box[2] - self.box[0])
+        self.scale_y = labels.shape[0] / max(1, self.box[3] - self.box[1])
+        self.area_scale = self.scale_x * self.scale_y
+
+    def region(self, box=None):
+        """
+        Görüntü koordinatlarındaki bölgenin etiketlerini döndürür
+
+        Args:
+            box (tuple, optional): (x1, y1, x2, y2) görüntü koordinatları (None: bölütlenen bölge)
+
+        Returns:
+            np.array: Bölgenin etiketleri (kopyalanmaz)
+            tuple: Bölgenin etiket görüntüsündeki sol üst köşesi (x, y)
+        """
+        if box is None:
+            return self.labels, (0, 0)
+        height, width = self.labels.shape
+        x1, y1, x2, y2 = box
+        x1, x2 = [min(width, max(0, int(round((x - self.box[0]) * self.scale_x)))) for x in (x1, x2)]
+        y1, y2 = [min(height, max(0, int(round((y - self.box[1]) * self.scale_y)))) for y in (y1, y2)]
+        return self.labels[y1:y2, x1:x2], (x1, y1)
+
+    def mask(self, name, box=None, out=None):
+        """
+        Bir sınıfın bölgedeki maskesini etiket çözünürlüğünde döndürür
+
+        Args:
+            name (str): Sınıf adı
+            box (tuple, optional): (x1, y1, x2, y2) görüntü koordinatları (None: tüm görüntü)
+            out (np.array, optional): Sonucun yazılacağı uint8 tampon
+
+        Returns:
+            np.array: Maske (0 veya 255, cv2.inRange çıktısıyla aynı biçimde)
+        """
+        labels, _ = self.region(box)
+        if out is None:
+            out = np.empty(labels.shape, np.uint8)
+        np.bitwise_and(labels, self.bits[name], out=out)
+        cv2.threshold(out, 0, 255, cv2.THRESH_BINARY, dst=out)
+        return out
+
+    def counts(self, box=None):
+        """
+        Bölgedeki her sınıfın piksel sayısını tek geçişte hesaplar
+
+        Args:
+            box (tuple, optional): (x1, y1, x2, y2) görüntü koordinatları (None: tüm görüntü)
+
+        Returns:
+            dict: Sınıf adı -> görüntü çözünürlüğünde piksel sayısı
+        """
+        labels, _ = self.region(box)
+        if labels.size == 0:
+            return {name: 0 for name in self.class_names}
+
+        # Etiket değerlerinin histogramı; her sınıf, bitini taşıyan değerlerin toplamıdır
+        histogram = cv2.calcHist([labels], [0], None, [256], [0, 256]).ravel()
+        values = np.arange(256)
+        return {name: int(round(histogram[(values & bit) > 0].sum() / self.area_scale))
+                for name, bit in self.bits.items()}
+
+    def components(self, name, box=None, min_area=0):
+        """
+        Bir sınıfın bölgedeki bağlı bileşenlerini döndürür
+
+        Args:
+            name (str): Sınıf adı
+            box (tuple, optional): (x1, y1, x2, y2) görüntü koordinatları (None: tüm görüntü)
+            min_area (float): Görüntü çözünürlüğünde en küçük bileşen alanı
+
+        Returns:
+            list: Alana göre büyükten küçüğe (x, y, genişlik, yükseklik, alan) kayıtları,
+                  görüntü koordinatlarında
+        """
+        mask = self.mask(name, box)
+        if mask.size == 0:
+            return []
+        _, origin = self.region(box)
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        components = []
+        # 0 etiketi arka plandır
+        for x, y, w, h, area in stats[1:count]:
+            area = area / self.area_scale
+            if area < min_area:
+                continue
+            components.append((self.box[0] + int((origin[0] + x) / self.scale_x),
+                               self.box[1] + int((origin[1] + y) / self.scale_y),
+                               int(w / self.scale_x), int(h / self.scale_y), int(round(area))))
+        components.sort(key=lambda component: component[4], reverse=True)
+        return components
+
+    def region_stats(self, box=None, min_area=0):
+        """
+        Bölgedeki tüm sınıfların piksel sayılarını ve bağlı bileşenlerini döndürür
+
+        Args:
+            box (tuple, optional): (x1, y1, x2, y2) görüntü koordinatları (None: tüm görüntü)
+            min_area (float): Görüntü çözünürlüğünde en küçük bileşen alanı
+
+        Returns:
+            dict: Sınıf adı -> {"count": piksel sayısı, "components": bileşen listesi}
+        """
+        counts = self.counts(box)
+        return {name: {"count": counts[name],
+                       "components": self.components(name, box, min_area) if counts[name] else []}
+                for name in self.class_names}
+
+
+class ColorSegmenter:
+    def __init__(self, classes=None, classifier="lut", scale=1.0):
+        """
+        Görüntüyü tek geçişte tüm renk sınıflarına bölütleyen sınıf. Her görüntü bir
+        kez dönüştürülür ve tek bir etiket görüntüsü üretilir; yeşil lamba, kırmızı
+        lamba, turuncu engel ve kırmızı park alanı algılayıcıları bu sonucu sorgular.
+
+        Args:
+            classes (list, optional): (ad, [(alt HSV, üst HSV), ...]) sınıfları
+                                      (varsayılan: DEFAULT_COLOR_CLASSES, en fazla 8)
+            classifier (str): "lut" (BGR565 arama tablosu, tek geçiş) veya
+                              "hsv" (bir kez cvtColor, sınıf başına inRange)
+            scale (float): Bölütleme ölçeği (0-1 arası, 1: tam çözünürlük)
+        """
+        self.class_names = []
+        self.class_ranges = []
+        self.classifier = None
+        self.scale = 1.0
+        self.lut = None
+
+        # Yeniden kullanılan tamponlar: etiket görüntüsü bir sonraki bölütlemede üzerine yazılır
+        self._buffers = {}
+
+        self.set_classes(DEFAULT_COLOR_CLASSES if classes is None else classes)
+        self.set_classifier(classifier)
+        self.set_scale(scale)
+
+    def set_classes(self, classes):
+        """
+        Renk sınıflarını ayarlar
+
+        Args:
+            classes (list): (ad, [(alt HSV, üst HSV), ...]) sınıfları
+        """
+        if len(classes) > 8:
+            raise ValueError(f"En fazla 8 renk sınıfı desteklenir: {len(classes)}")
+        self.class_names = [name for name, _ in classes]
+        self.class_ranges = [[(np.array(lower), np.array(upper)) for lower, upper in ranges]
+                             for _, ranges in classes]
+        if self.lut is not None:
+            self.lut.set_class_ranges(self.class_ranges)
+
+    def set_class_range(self, name, ranges):
+        """
+        Bir sınıfın HSV aralıklarını değiştirir
+
+        Args:
+            name (str): Sınıf adı
+            ranges (list): [(alt HSV, üst HSV), ...]
+        """
+        if name not in self.class_names:
+            raise ValueError(f"Bilinmeyen renk sınıfı: {name}")
+        classes = list(zip(self.class_names, self.class_ranges))
+        classes[self.class_names.index(name)] = (name, ranges)
+        self.set_classes(classes)
+
+    def set_classifier(self, classifier):
+        """
+        Renk sınıflandırma yöntemini seçer
+
+        Args:
+            classifier (str): "lut" veya "hsv"
+        """
+        if classifier not in ("lut", "hsv"):
+            raise ValueError(f"Bilinmeyen renk sınıflandırıcı: {classifier}")
+        if classifier == "lut" and self.lut is None:
+            self.lut = LabelLookupTable(self.class_ranges)
+        self.classifier = classifier
+
+    def set_scale(self, scale):
+        """
+        Bölütleme ölçeğini ayarlar
+
+        Args:
+            scale (float): Ölçek faktörü (0-1 arası, 1: tam çözünürlük)
+        """
+        if not 0 < scale <= 1:
+            raise ValueError(f"Ölçek faktörü 0 ile 1 arasında olmalı: {scale}")
+        self.scale = float(scale)
+
+    def _get_buffer(self, name, shape, dtype=np.uint8):
+        """Verilen isim ve boyutta yeniden kullanılan bir tampon döndürür"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            self._buffers[name] = buffer
+        return buffer
+
+    def segment(self, frame, box=None):
+        """
+        Görüntüyü bölütler. Dönen sonuç bir sonraki segment çağrısına kadar geçerlidir
+        (etiket tamponu yeniden kullanılır).
+
+        Args:
+            frame (np.array): BGR görüntü
+            box (tuple, optional): Yalnızca bu bölgeyi (x1, y1, x2, y2) bölütler; sorgular
+                                   görüntü koordinatlarında kalır (None: tüm görüntü)
+
+        Returns:
+            SegmentationResult: Bölütleme sonucu
+        """
+        work = frame if box is None else frame[box[1]:box[3], box[0]:box[2]]
+        if self.scale < 1.0:
+            width = max(1, int(round(work.shape[1] * self.scale)))
+            height = max(1, int(round(work.shape[0] * self.scale)))
+            work = cv2.resize(work, (width, height), dst=self._get_buffer("scaled", (height, width, 3)),
+                              interpolation=cv2.INTER_AREA)
+
+        shape = work.shape[:2]
+        labels = self._get_buffer("labels", shape)
+        if self.classifier == "lut":
+            self.lut.classify(work, out=labels)
+        else:
+            hsv = cv2.cvtColor(work, cv2.COLOR_BGR2HSV, dst=self._get_buffer("hsv", work.shape))
+            mask = self._get_buffer("mask", shape)
+            part = self._get_buffer("part", shape)
+            labels.fill(0)
+            for bit, ranges in enumerate(self.class_ranges):
+                cv2.inRange(hsv, ranges[0][0], ranges[0][1], dst=mask)
+                for lower, upper in ranges[1:]:
+                    cv2.inRange(hsv, lower, upper, dst=part)
+                    cv2.bitwise_or(mask, part, dst=mask)
+                np.bitwise_and(mask, 1 << bit, out=mask)
+                np.bitwise_or(labels, mask, out=labels)
+
+        return SegmentationResult(labels, self.class_names, frame.shape, box)
@@ -0,0 +1,205 @@
+import cv2
+import numpy as np
+
+
+def find_runs(values):
+    """
+    Bir boolean dizideki ardışık True bölümlerini bulur
+
+    Args:
+        values (np.array): 1 boyutlu boolean dizi
+
+    Returns:
+        np.array: Bölüm başlangıçları
+        np.array: Bölüm sonları (dahil değil)
+    """
+    edges = np.diff(np.concatenate(([0], values.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class CrossingDetector:
+    def __init__(self):
+        """
+        Yaya geçidi ve hemzemin geçit dur çizgisi tespit edici sınıf. Görüntünün
+        tamamı yerine aracın önündeki ince bir satır bandı işlenir: band gri tona
+        çevrilip eşiklenir, satır izdüşümüyle beyaz işaretin bulunduğu satırlar ve
+        aracın uzaklığı, bu satırların sütun izdüşümüyle de işaretin türü bulunur.
+        Yaya geçidi eşit aralıklı şeritlerden, dur çizgisi kesintisiz bir banttan oluşur.
+        """
+        # İşlenen band: satırlar ve sütunlar görüntü boyutunun oranı olarak. Varsayılan
+        # sütunlar, şerit tespitindeki yol yamuğuna göre şerit çizgilerinin içinde kalır.
+        self.band_rows = (0.7, 0.95)
+        self.band_columns = (0.25, 0.75)
+
+        # Beyaz boya için gri ton eşiği (şerit çizgisi HSV aralığının parlaklık alt sınırı)
+        self.threshold = 180
+
+        # Satır izdüşümü: işaret satırında beyaz piksel oranı ve en az işaret yüksekliği (band oranı)
+        self.min_row_fill = 0.25
+        self.min_mark_height = 0.05
+
+        # Sütun izdüşümü: dur çizgisinin beyaz oranı, yaya geçidinin en az şerit sayısı,
+        # şerit aralıklarının ortancadan en fazla sapması ve en dar şerit (band genişliği oranı)
+        self.solid_fill = 0.8
+        self.min_stripes = 4
+        self.period_tolerance = 0.25
+        self.min_stripe_width = 0.02
+
+        # Aşama süre ölçümü (profiling.StageProfiler). None ise ölçüm yapılmaz.
+        self.profiler = None
+
+        # Ara sonuçlar için önceden ayrılmış tamponlar
+        self._buffers = {}
+
+    def set_band(self, band_rows, band_columns=(0.25, 0.75)):
+        """
+        İşlenen bandı ayarlar
+
+        Args:
+            band_rows (tuple): Bandın üst ve alt satırı (görüntü yüksekliğinin oranı)
+            band_columns (tuple): Bandın sol ve sağ sütunu (görüntü genişliğinin oranı)
+        """
+        for start, end in (band_rows, band_columns):
+            if not 0 <= start < end <= 1:
+                raise ValueError(f"Band sınırları 0 ile 1 arasında ve artan olmalı: {(start, end)}")
+        self.band_rows = tuple(band_rows)
+        self.band_columns = tuple(band_columns)
+
+    def set_threshold(self, threshold):
+        """
+        Beyaz boya için gri ton eşiğini ayarlar
+
+        Args:
+            threshold (int): Eşik (0-255 arası)
+        """
+        self.threshold = threshold
+
+    def set_profiler(self, profiler):
+        """
+        Aşama süre ölçümünü ayarlar
+
+        Args:
+            profiler (profiling.StageProfiler): Ölçüm nesnesi (None: kapalı)
+        """
+        self.profiler = profiler
+
+    def _get_buffer(self, name, shape, dtype=np.uint8):
+        """Verilen isim ve boyutta yeniden kullanılan bir tampon döndürür"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            self._buffers[name] = buffer
+        return buffer
+
+    def get_band(self, frame_shape):
+        """
+        Bandın görüntü koordinatlarını döndürür
+
+        Args:
+            frame_shape (tuple): Görüntü boyutu
+
+        Returns:
+            tuple: (x1, y1, x2, y2)
+        """
+        height, width = frame_shape[:2]
+        return (int(self.band_columns[0] * width), int(self.band_rows[0] * height),
+                int(self.band_columns[1] * width), int(self.band_rows[1] * height))
+
+    def threshold_band(self, frame):
+        """
+        Bandı gri tona çevirip eşikler
+
+        Args:
+            frame (np.array): BGR görüntü
+
+        Returns:
+            np.array: Bandın ikili görüntüsü (0 veya 1)
+        """
+        x1, y1, x2, y2 = self.get_band(frame.shape)
+        shape = (y2 - y1, x2 - x1)
+        gray = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY, dst=self._get_buffer("gray", shape))
+        _, binary = cv2.threshold(gray, self.threshold - 1, 1, cv2.THRESH_BINARY,
+                                  dst=self._get_buffer("binary", shape))
+        return binary
+
+    def classify_columns(self, profile, width):
+        """
+        İşaret satırlarının sütun izdüşümünden işaretin türünü bulur
+
+        Args:
+            profile (np.array): Sütunların beyaz olup olmadığı (boolean)
+            width (int): Band genişliği
+
+        Returns:
+            str: "crosswalk", "stop_line" veya None
+            int: Şerit sayısı
+            float: Şerit periyodu (piksel, yaya geçidi değilse 0)
+        """
+        starts, ends = find_runs(profile)
+        wide = (ends - starts) >= max(1, self.min_stripe_width * width)
+        starts, ends = starts[wide], ends[wide]
+        if len(starts) == 0:
+            return None, 0, 0.0
+
+        if (ends - starts).sum() >= self.solid_fill * width:
+            return "stop_line", len(starts), 0.0
+
+        # Şerit başlangıçları arasındaki aralıkların çoğu ortancaya yakınsa desen periyodiktir.
+        # Bandın kenarındaki yarım şeritler veya şerit çizgileri tek tük sapma yaratabilir.
+        if len(starts) < self.min_stripes:
+            return None, len(starts), 0.0
+        periods = np.diff(starts)
+        period = float(np.median(periods))
+        regular = np.abs(periods - period) <= self.period_tolerance * period
+        if regular.sum() < self.min_stripes - 1:
+            return None, len(starts), 0.0
+        return "crosswalk", len(starts), period
+
+    def detect_crossing(self, frame, timestamp=None, sequence=None):
+        """
+        Aracın önündeki bantta yaya geçidi veya dur çizgisi arar
+
+        Args:
+            frame (np.array): BGR görüntü
+            timestamp (float, optional): Görüntünün yakalanma zamanı (time.monotonic)
+            sequence (int, optional): Görüntü sıra numarası
+
+        Returns:
+            bool: İşaret bulunduysa True
+            dict: kind ("crosswalk", "stop_line" veya None), distance (işaretin araca
+                  yakın kenarı; 0: bandın alt kenarı, 1: üst kenarı), rows (işaretin
+                  görüntüdeki satır aralığı), stripes (şerit sayısı) ve period (piksel)
+        """
+        profiler = self.profiler
+        if profiler:
+            profiler.mark()
+
+        info = {"kind": None, "distance": None, "rows": None, "stripes": 0, "period": 0.0,
+                "frame_sequence": sequence, "capture_timestamp": timestamp}
+
+        binary = self.threshold_band(frame)
+        height, width = binary.shape
+        x1, y1, _, _ = self.get_band(frame.shape)
+
+        # Satır izdüşümü: yeterince beyaz satırların bölümleri, araca en yakın olan seçilir
+        row_sums = cv2.reduce(binary, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+        starts, ends = find_runs(row_sums >= self.min_row_fill * width)
+        tall = (ends - starts) >= max(1, self.min_mark_height * height)
+        starts, ends = starts[tall], ends[tall]
+        if len(starts) == 0:
+            if profiler:
+                profiler.lap("crossing")
+            return False, info
+        top, bottom = int(starts[-1]), int(ends[-1])
+
+        # Sütun izdüşümü: işaret satırlarının yarısından fazlasında beyaz olan sütunlar
+        column_sums = cv2.reduce(binary[top:bottom], 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+        kind, stripes, period = self.classify_columns(column_sums * 2 > bottom - top, width)
+        if profiler:
+            profiler.lap("crossing")
+        if kind is None:
+            return False, info
+
+        info.update({"kind": kind, "distance": (height - bottom) / height, "rows": (y1 + top, y1 + bottom),
+                     "stripes": stripes, "period": period})
+        return True, info
@@ -0,0 +1,258 @@
+import collections
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import cv2
+import numpy as np
+
+BOUNDARY = "debugframe"
+
+INDEX_PAGE = b"""<html><head><title>Otonom Arac Debug</title></head>
+<body style="margin:0;background:#000"><img src="/stream" style="width:100%"></body></html>"""
+
+
+class DebugStreamer:
+    def __init__(self, host="127.0.0.1", port=8080, max_fps=10, queue_size=2, jpeg_quality=70, max_width=640):
+        """
+        Debug görselleştirmesini algılama döngüsünün dışında hazırlayıp yerel bir
+        HTTP sunucusundan MJPEG yayını olarak sunan sınıf. Algılama döngüsü yalnızca
+        submit() çağırır; çizim, JPEG sıkıştırma ve gönderim ayrı iş parçacıklarında
+        yapılır. Kuyruk sınırlıdır ve dolduğunda en eski görüntü atılır, böylece
+        yavaş bir istemci döngüyü hiçbir zaman bekletmez.
+
+        Args:
+            host (str): Sunucunun dinleyeceği adres (varsayılan yalnızca bu cihaz;
+                        "0.0.0.0" tüm ağ arayüzlerinde yayınlar)
+            port (int): Sunucu portu (0: boş bir port seçilir)
+            max_fps (float): Yayının en yüksek kare hızı
+            queue_size (int): Bekleyen en fazla görüntü sayısı
+            jpeg_quality (int): JPEG kalitesi (0-100)
+            max_width (int): Yayınlanan görüntünün en büyük genişliği (daha genişse küçültülür)
+        """
+        self.host = host
+        self.port = port
+        self.max_fps = max_fps
+        self.jpeg_quality = jpeg_quality
+        self.max_width = max_width
+
+        self.running = False
+        self.server = None
+        self.server_thread = None
+        self.render_thread = None
+
+        # Çizilmeyi bekleyen görüntüler (dolunca en eskisi atılır)
+        self.queue = collections.deque(maxlen=queue_size)
+        self.queue_condition = threading.Condition()
+        self._next_submit_time = 0.0
+
+        # En son hazırlanan JPEG görüntü
+        self.jpeg = None
+        self.sequence = -1
+        self.jpeg_condition = threading.Condition()
+
+        # Sayaçlar
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_rendered = 0
+
+    def start(self):
+        """HTTP sunucusunu ve çizim iş parçacığını başlatır"""
+        if self.running:
+            return
+        self.running = True
+
+        self.server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.server_thread = threading.Thread(target=self.server.serve_forever, name="DebugStreamServer",
+                                              daemon=True)
+        self.server_thread.start()
+
+        self.render_thread = threading.Thread(target=self._render_loop, name="DebugStreamRender", daemon=True)
+        self.render_thread.start()
+
+    def stop(self):
+        """Sunucuyu ve çizim iş parçacığını durdurur"""
+        if not self.running:
+            return
+        self.running = False
+        with self.queue_condition:
+            self.queue_condition.notify_all()
+        with self.jpeg_condition:
+            self.jpeg_condition.notify_all()
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join(timeout=1.0)
+        self.render_thread.join(timeout=1.0)
+        self.server = self.server_thread = self.render_thread = None
+
+    def submit(self, frame, mask, overlay):
+        """
+        Bir görüntüyü yayına gönderir. Beklemez; kare hızı sınırı aşılıyorsa
+        görüntüyü kopyalamadan hemen döner.
+
+        Args:
+            frame (np.array): BGR görüntü
+            mask (np.array): Arama bölgesinin yeşil maskesi (küçültülmüş olabilir)
+            overlay (dict): Çizim bilgileri (roi, search_window, is_green, green_ratio)
+
+        Returns:
+            bool: Görüntü kuyruğa eklendiyse True
+        """
+        if not self.running:
+            return False
+
+        now = time.monotonic()
+        if now < self._next_submit_time:
+            return False
+        self._next_submit_time = now + 1.0 / self.max_fps
+
+        # Büyük görüntüler burada küçültülür (kopyalamaktan ucuzdur); algılama
+        # tamponları sonraki karede yeniden kullanıldığı için maske kopyalanır
+        scale = 1.0
+        if frame.shape[1] > self.max_width:
+            scale = self.max_width / frame.shape[1]
+            frame = cv2.resize(frame, (self.max_width, max(1, int(frame.shape[0] * scale))),
+                               interpolation=cv2.INTER_NEAREST)
+        else:
+            frame = frame.copy()
+        item = (frame, mask.copy(), dict(overlay, scale=scale))
+        with self.queue_condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.frames_dropped += 1
+            self.queue.append(item)
+            self.frames_submitted += 1
+            self.queue_condition.notify()
+        return True
+
+    def get_latest_jpeg(self, last_sequence=-1, timeout=None):
+        """
+        Verilen sıra numarasından daha yeni bir JPEG görüntü gelene kadar bekler
+
+        Args:
+            last_sequence (int): En son alınan görüntünün sıra numarası
+            timeout (float, optional): Maksimum bekleme süresi (saniye)
+
+        Returns:
+            bytes: JPEG verisi (zaman aşımında None)
+            int: Görüntü sıra numarası
+        """
+        with self.jpeg_condition:
+            self.jpeg_condition.wait_for(lambda: self.sequence > last_sequence or not self.running,
+                                         timeout=timeout)
+            if self.sequence <= last_sequence:
+                return None, self.sequence
+            return self.jpeg, self.sequence
+
+    def _render_loop(self):
+        """Kuyruktaki görüntüleri çizer ve JPEG olarak sıkıştırır"""
+        encode_params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        while self.running:
+            with self.queue_condition:
+                self.queue_condition.wait_for(lambda: self.queue or not self.running)
+                if not self.running:
+                    break
+                frame, mask, overlay = self.queue.popleft()
+
+            ok, encoded = cv2.imencode(".jpg", render_debug_view(frame, mask, overlay), encode_params)
+            if not ok:
+                continue
+
+            with self.jpeg_condition:
+                self.jpeg = encoded.tobytes()
+                self.sequence += 1
+                self.frames_rendered += 1
+                self.jpeg_condition.notify_all()
+
+    def _make_handler(self):
+        """Bu yayına bağlı HTTP istek işleyici sınıfını oluşturur"""
+        streamer = self
+
+        class DebugStreamHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(INDEX_PAGE)))
+                    self.end_headers()
+                    self.wfile.write(INDEX_PAGE)
+                    return
+                if self.path != "/stream":
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.end_headers()
+
+                sequence = -1
+                try:
+                    while streamer.running:
+                        jpeg, new_sequence = streamer.get_latest_jpeg(sequence, timeout=1.0)
+                        if jpeg is None:
+                            continue
+                        sequence = new_sequence
+                        self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                         f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b"\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                # Her istek için konsola yazılmasın
+                pass
+
+        return DebugStreamHandler
+
+
+def render_debug_view(frame, mask, overlay):
+    """
+    Debug görüntüsünü oluşturur: üstte ROI ve sonuç yazısı çizilmiş görüntü,
+    altta ROI ve yeşil maske yan yana
+
+    Args:
+        frame (np.array): BGR görüntü
+        mask (np.array): Arama bölgesinin yeşil maskesi
+        overlay (dict): Çizim bilgileri (roi, search_window, is_green, green_ratio ve
+                        görüntü küçültüldüyse koordinat ölçeği scale)
+
+    Returns:
+        np.array: Birleştirilmiş BGR görüntü
+    """
+    scale = overlay.get("scale", 1.0)
+    roi_x1, roi_y1, roi_x2, roi_y2 = [int(v * scale) for v in overlay["roi"]]
+    region_x1, region_y1, region_x2, region_y2 = [
+        int(v * scale) for v in overlay.get("search_window", overlay["roi"])]
+    is_green_light = overlay["is_green"]
+
+    # Arama bölgesi ve maskesi (maske küçültülmüş olabilir)
+    region = frame[region_y1:region_y2, region_x1:region_x2].copy()
+    mask_colored = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
+    if region.size and mask_colored.shape[:2] != region.shape[:2]:
+        mask_colored = cv2.resize(mask_colored, (region.shape[1], region.shape[0]),
+                                  interpolation=cv2.INTER_NEAREST)
+
+    # ROI'yi ve takip penceresini çiz
+    view = frame.copy()
+    cv2.rectangle(view, (roi_x1, roi_y1), (roi_x2, roi_y2), (0, 255, 0), 2)
+    if (region_x1, region_y1, region_x2, region_y2) != (roi_x1, roi_y1, roi_x2, roi_y2):
+        cv2.rectangle(view, (region_x1, region_y1), (region_x2, region_y2), (0, 255, 255), 2)
+
+    # Sonuç metni
+    text = "YESIL ISIK TESPIT EDILDI" if is_green_light else "YESIL ISIK YOK"
+    color = (0, 255, 0) if is_green_light else (0, 0, 255)
+    cv2.putText(view, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+    cv2.putText(view, f"Yesil Oran: {overlay['green_ratio']:.4f}", (10, 60),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+    if not region.size:
+        return view
+
+    # Alt şerit: ROI ve maske yan yana, görüntü genişliğine ölçeklenmiş
+    strip = np.hstack([region, mask_colored])
+    strip_height = max(1, int(strip.shape[0] * view.shape[1] / strip.shape[1]))
+    strip = cv2.resize(strip, (view.shape[1], strip_height), interpolation=cv2.INTER_AREA)
+    return np.vstack([view, strip])
@@ -0,0 +1,393 @@
+import cv2
+import numpy as np
+from camera_geometry import BirdseyeRemap
+
+
+class LaneDetector:
+    def __init__(self, warp_size=(320, 240)):
+        """
+        Şerit tespit edici sınıf. Görüntünün yol bölgesi kuş bakışı görünüme
+        çevrilir, şerit çizgileri renkle eşiklenir; çizgilerin başlangıç noktaları
+        sütun histogramlarıyla bulunur ve her çizgi kayan pencere aramasıyla (veya
+        önceki karedeki eğrinin çevresinde) toplanan piksellere ikinci derece
+        polinom olarak oturtulur. Tüm piksel işlemleri NumPy ile vektörleştirilmiştir.
+
+        Args:
+            warp_size (tuple): Kuş bakışı görüntü boyutu (genişlik, yükseklik)
+        """
+        self.warp_width, self.warp_height = warp_size
+
+        # Perspektif: görüntüdeki yol yamuğu (sol üst, sağ üst, sağ alt, sol alt; görüntü
+        # boyutunun oranı olarak) kuş bakışı görüntüde şeridin ortadaki yarısına eşlenir
+        self.src_points = np.float32([[0.35, 0.6], [0.65, 0.6], [1.0, 1.0], [0.0, 1.0]])
+        self.lane_fraction = 0.5  # Şerit genişliğinin kuş bakışı görüntü genişliğine oranı
+        self._warp_cache = None  # (görüntü boyutu, dönüşüm matrisi, remap haritası)
+
+        # Lens kalibrasyonu (camera_geometry.load_camera_calibration) ve remap haritası önbelleği.
+        # Distorsiyon giderme ve perspektif dönüşümü tek bir remap geçişinde yapılır.
+        self.calibration = None
+        self.map_cache_dir = None
+
+        # Gerçek ölçüler: şerit genişliği ve kuş bakışı görüntünün kapsadığı yol uzunluğu (metre)
+        self.lane_width = 0.5
+        self.view_length = 1.0
+
+        # Şerit çizgisi için HSV aralığı (beyaz: düşük doygunluk, yüksek parlaklık)
+        self.lower_lane = np.array([0, 0, 180])
+        self.upper_lane = np.array([179, 60, 255])
+
+        # Kayan pencere araması parametreleri
+        self.n_windows = 9
+        self.window_margin = 0.08  # Pencere yarı genişliği (görüntü genişliğinin oranı)
+        self.recenter_pixels = 20  # Pencereyi yeniden ortalamak için gereken piksel sayısı
+        self.min_lane_pixels = 100  # Çizgiye eğri oturtmak için gereken piksel sayısı
+        self.fit_margin = 0.08  # Önceki eğri çevresinde arama yarı genişliği (oran)
+
+        # Önceki karedeki eğriler (kuş bakışı piksel koordinatlarında x = a*y^2 + b*y + c)
+        self.left_fit = None
+        self.right_fit = None
+
+        # Aşama süre ölçümü (profiling.StageProfiler). None ise ölçüm yapılmaz.
+        self.profiler = None
+
+        # Ara sonuçlar için önceden ayrılmış tamponlar
+        self._buffers = {}
+
+    def set_perspective(self, src_points, lane_fraction=0.5):
+        """
+        Perspektif dönüşümünü ayarlar
+
+        Args:
+            src_points (list): Görüntüdeki yol yamuğunun köşeleri (sol üst, sağ üst, sağ alt,
+                               sol alt) görüntü boyutunun oranı olarak
+            lane_fraction (float): Yamuğun kuş bakışı görüntü genişliğindeki oranı (0-1 arası)
+        """
+        if not 0 < lane_fraction <= 1:
+            raise ValueError(f"Şerit oranı 0 ile 1 arasında olmalı: {lane_fraction}")
+        self.src_points = np.float32(src_points)
+        self.lane_fraction = lane_fraction
+        self._warp_cache = None
+        self.reset()
+
+    def set_camera_geometry(self, calibration, cache_dir=None):
+        """
+        Lens kalibrasyonunu ve remap haritası önbelleğini ayarlar. Yamuk köşeleri
+        (src_points) distorsiyonu giderilmiş görüntüye göre verilir.
+
+        Args:
+            calibration (dict): camera_geometry.load_camera_calibration sonucu (None: distorsiyon yok)
+            cache_dir (str, optional): Haritaların .npy olarak saklanacağı klasör (None: önbellek yok)
+        """
+        self.calibration = calibration
+        self.map_cache_dir = cache_dir
+        self._warp_cache = None
+
+    def set_lane_dimensions(self, lane_width, view_length):
+        """
+        Şeridin gerçek ölçülerini ayarlar (kayma ve eğrilik metre cinsinden hesaplanır)
+
+        Args:
+            lane_width (float): Şerit genişliği (metre)
+            view_length (float): Kuş bakışı görüntünün kapsadığı yol uzunluğu (metre)
+        """
+        self.lane_width = lane_width
+        self.view_length = view_length
+
+    def set_hsv_range(self, lower_lane, upper_lane):
+        """
+        Şerit çizgisi için HSV aralığını ayarlar
+
+        Args:
+            lower_lane (np.array): Alt HSV değerleri [H, S, V]
+            upper_lane (np.array): Üst HSV değerleri [H, S, V]
+        """
+        self.lower_lane = np.array(lower_lane)
+        self.upper_lane = np.array(upper_lane)
+
+    def set_profiler(self, profiler):
+        """
+        Aşama süre ölçümünü ayarlar
+
+        Args:
+            profiler (profiling.StageProfiler): Ölçüm nesnesi (None: kapalı)
+        """
+        self.profiler = profiler
+
+    def reset(self):
+        """Önceki eğrileri bırakır, sonraki karede kayan pencere araması yapılır"""
+        self.left_fit = None
+        self.right_fit = None
+
+    def _get_buffer(self, name, shape, dtype=np.uint8):
+        """Verilen isim ve boyutta yeniden kullanılan bir tampon döndürür"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            self._buffers[name] = buffer
+        return buffer
+
+    def get_warp_matrix(self, frame_shape):
+        """
+        Görüntüden kuş bakışına perspektif dönüşüm matrisini döndürür (görüntü boyutu
+        değişene kadar önbellekte tutulur)
+
+        Args:
+            frame_shape (tuple): Görüntü boyutu
+
+        Returns:
+            np.array: 3x3 dönüşüm matrisi
+        """
+        if self._warp_cache is not None and self._warp_cache[0] == frame_shape[:2]:
+            return self._warp_cache[1]
+
+        height, width = frame_shape[:2]
+        src = self.src_points * np.float32([width, height])
+        left = self.warp_width * (1 - self.lane_fraction) / 2
+        right = self.warp_width - left
+        dst = np.float32([[left, 0], [right, 0], [right, self.warp_height], [left, self.warp_height]])
+        matrix = cv2.getPerspectiveTransform(src, dst)
+        self._warp_cache = (frame_shape[:2], matrix, None)
+        return matrix
+
+    def get_remap(self, frame_shape):
+        """
+        Görüntü boyutu için birleşik distorsiyon giderme + perspektif haritasını
+        döndürür (ilk çağrıda hesaplanır veya disk önbelleğinden yüklenir)
+
+        Args:
+            frame_shape (tuple): Görüntü boyutu
+
+        Returns:
+            camera_geometry.BirdseyeRemap: Remap haritası
+        """
+        matrix = self.get_warp_matrix(frame_shape)
+        if self._warp_cache[2] is None:
+            remap = BirdseyeRemap((frame_shape[1], frame_shape[0]), (self.warp_width, self.warp_height),
+                                  matrix, self.calibration, self.map_cache_dir)
+            self._warp_cache = (self._warp_cache[0], matrix, remap)
+        return self._warp_cache[2]
+
+    def warp(self, frame):
+        """
+        Görüntüyü kuş bakışı görünüme çevirir. Distorsiyon giderme ve perspektif
+        dönüşümü sabit noktalı haritalarla tek bir cv2.remap çağrısıdır ve yalnızca
+        kuş bakışı görüntünün pikselleri hesaplanır.
+
+        Args:
+            frame (np.array): BGR görüntü
+
+        Returns:
+            np.array: Kuş bakışı BGR görüntü (warp_height, warp_width, 3)
+        """
+        return self.get_remap(frame.shape).remap(
+            frame, out=self._get_buffer("warped", (self.warp_height, self.warp_width, 3)))
+
+    def threshold(self, warped):
+        """
+        Kuş bakışı görüntüde şerit çizgisi maskesini oluşturur
+
+        Args:
+            warped (np.array): Kuş bakışı BGR görüntü
+
+        Returns:
+            np.array: Maske (0 veya 255)
+        """
+        hsv = cv2.cvtColor(warped, cv2.COLOR_BGR2HSV, dst=self._get_buffer("hsv", warped.shape))
+        return cv2.inRange(hsv, self.lower_lane, self.upper_lane,
+                           dst=self._get_buffer("mask", warped.shape[:2]))
+
+    def find_lane_bases(self, mask):
+        """
+        Maskenin alt yarısının sütun histogramından sol ve sağ çizgilerin başlangıç
+        x konumlarını bulur
+
+        Args:
+            mask (np.array): Şerit maskesi
+
+        Returns:
+            int: Sol çizginin x konumu (bulunamazsa None)
+            int: Sağ çizginin x konumu (bulunamazsa None)
+        """
+        height, width = mask.shape
+        histogram = cv2.reduce(mask[height // 2:], 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+        midpoint = width // 2
+
+        # Bir sütunda en az birkaç çizgi pikseli olmalı (maske değerleri 255)
+        min_column = 255 * max(1, self.recenter_pixels // 4)
+        left = int(np.argmax(histogram[:midpoint]))
+        right = midpoint + int(np.argmax(histogram[midpoint:]))
+        return (left if histogram[left] >= min_column else None,
+                right if histogram[right] >= min_column else None)
+
+    def _sliding_window(self, ys, xs, bases):
+        """
+        Kayan pencere aramasıyla her çizginin piksellerini toplar. Pikseller satıra
+        göre sıralı olduğundan her pencerenin pikselleri ikili aramayla dilimlenir;
+        pencere başına tüm piksellerin taranması gerekmez.
+
+        Args:
+            ys (np.array): Maske piksellerinin satırları (artan sırada)
+            xs (np.array): Maske piksellerinin sütunları
+            bases (tuple): Sol ve sağ çizginin başlangıç x konumları (None: aranmaz)
+
+        Returns:
+            list: Her çizgi için piksel indeksleri (aranmadıysa None)
+        """
+        window_height = self.warp_height // self.n_windows
+        margin = int(self.window_margin * self.warp_width)
+
+        # Alttan yukarı pencere sınırları ve her pencerenin piksel dilimi
+        edges = self.warp_height - np.arange(self.n_windows + 1) * window_height
+        bounds = np.searchsorted(ys, edges)
+
+        indices = []
+        for base in bases:
+            if base is None:
+                indices.append(None)
+                continue
+            center = base
+            parts = []
+            for window in range(self.n_windows):
+                start, end = bounds[window + 1], bounds[window]
+                window_x = xs[start:end]
+                selected = np.flatnonzero(np.abs(window_x - center) < margin)
+                if len(selected):
+                    parts.append(selected + start)
+                if len(selected) > self.recenter_pixels:
+                    center = int(window_x[selected].mean())
+            indices.append(np.concatenate(parts) if parts else np.empty(0, np.intp))
+        return indices
+
+    def _search_around_fits(self, ys, xs, fits):
+        """
+        Önceki karedeki eğrilerin çevresindeki pikselleri tek vektör işlemiyle toplar
+
+        Args:
+            ys (np.array): Maske piksellerinin satırları
+            xs (np.array): Maske piksellerinin sütunları
+            fits (tuple): Sol ve sağ eğri katsayıları
+
+        Returns:
+            list: Her çizgi için piksel indeksleri
+        """
+        margin = self.fit_margin * self.warp_width
+        return [np.flatnonzero(np.abs(xs - np.polyval(fit, ys)) < margin) for fit in fits]
+
+    def detect_lane(self, frame, timestamp=None, sequence=None):
+        """
+        Görüntüde şeridi tespit eder
+
+        Args:
+            frame (np.array): BGR görüntü
+            timestamp (float, optional): Görüntünün yakalanma zamanı (time.monotonic)
+            sequence (int, optional): Görüntü sıra numarası
+
+        Returns:
+            bool: Şerit bulunduysa True
+            dict: center_offset (metre, araç şerit ortasının sağındaysa pozitif),
+                  curvature (1/metre, şerit sola dönüyorsa pozitif), lines ("both",
+                  "left", "right" veya "none"), search ("window" veya "previous"),
+                  eğri katsayıları ve piksel sayıları
+        """
+        profiler = self.profiler
+        if profiler:
+            profiler.mark()
+
+        warped = self.warp(frame)
+        if profiler:
+            profiler.lap("lane_warp")
+        mask = self.threshold(warped)
+        if profiler:
+            profiler.lap("lane_threshold")
+
+        # Çizgi pikselleri (satıra göre sıralı)
+        ys, xs = np.nonzero(mask)
+
+        # Önceki eğriler varsa çevrelerinde ara; yeterli piksel yoksa kayan pencereye dön
+        search = "previous"
+        indices = None
+        if self.left_fit is not None and self.right_fit is not None:
+            indices = self._search_around_fits(ys, xs, (self.left_fit, self.right_fit))
+            if min(len(index) for index in indices) < self.min_lane_pixels:
+                indices = None
+        if indices is None:
+            search = "window"
+            indices = self._sliding_window(ys, xs, self.find_lane_bases(mask))
+        if profiler:
+            profiler.lap("lane_search")
+
+        fits = []
+        counts = []
+        for index in indices:
+            count = 0 if index is None else len(index)
+            counts.append(count)
+            fits.append(np.polyfit(ys[index], xs[index], 2) if count >= self.min_lane_pixels else None)
+        left_fit, right_fit = fits
+
+        # Eğriler arasındaki genişlik beklenenden çok farklıysa az pikselli çizgiyi bırak
+        lane_pixels = self.lane_fraction * self.warp_width
+        bottom = self.warp_height - 1
+        if left_fit is not None and right_fit is not None:
+            width = np.polyval(right_fit, bottom) - np.polyval(left_fit, bottom)
+            if not 0.5 * lane_pixels < width < 1.5 * lane_pixels:
+                if counts[0] >= counts[1]:
+                    right_fit = None
+                else:
+                    left_fit = None
+
+        # Tek çizgi görünüyorsa diğeri şerit genişliği kadar kaydırılarak tahmin edilir
+        if left_fit is not None and right_fit is not None:
+            lines = "both"
+        elif left_fit is not None:
+            lines = "left"
+            right_fit = left_fit + np.array([0, 0, lane_pixels])
+        elif right_fit is not None:
+            lines = "right"
+            left_fit = right_fit - np.array([0, 0, lane_pixels])
+        else:
+            lines = "none"
+
+        info = {
+            "lines": lines,
+            "search": search,
+            "left_pixel_count": counts[0],
+            "right_pixel_count": counts[1],
+            "frame_sequence": sequence,
+            "capture_timestamp": timestamp
+        }
+
+        if lines == "none":
+            self.reset()
+            info.update(center_offset=None, curvature=None, left_fit=None, right_fit=None)
+            if profiler:
+                profiler.lap("lane_fit")
+            return False, info
+
+        # Yalnızca iki çizgi de görüldüyse sonraki karede önceki eğriler kullanılır
+        if lines == "both":
+            self.left_fit, self.right_fit = left_fit, right_fit
+        else:
+            self.reset()
+
+        # Metre/piksel ölçekleri
+        meters_x = self.lane_width / lane_pixels
+        meters_y = self.view_length / self.warp_height
+
+        # Şerit ortası eğrisi ve aracın (görüntü ortası) şerit ortasına göre kayması
+        center_fit = (left_fit + right_fit) / 2
+        lane_center = np.polyval(center_fit, bottom)
+        center_offset = (self.warp_width / 2 - lane_center) * meters_x
+
+        # Metre cinsinden eğrilik: x = A*y^2 + B*y + C, k = 2A / (1 + (2A*y + B)^2)^1.5.
+        # Görüntüde y araca doğru arttığından sola dönen şeridin A katsayısı negatiftir;
+        # işaret sola dönüş pozitif olacak şekilde çevrilir.
+        a = center_fit[0] * meters_x / meters_y ** 2
+        b = center_fit[1] * meters_x / meters_y
+        y_eval = bottom * meters_y
+        curvature = -2 * a / (1 + (2 * a * y_eval + b) ** 2) ** 1.5
+
+        info.update(center_offset=float(center_offset), curvature=float(curvature),
+                    left_fit=left_fit, right_fit=right_fit)
+        if profiler:
+            profiler.lap("lane_fit")
+        return True, info
@@ -0,0 +1,106 @@
+import collections
+import time
+from profiling import StageHistogram
+
+# Bir motor yazımına neden olan görüntünün izi: sıra numarası, yakalanma zamanı
+# ve karar zamanı (time.monotonic)
+TraceContext = collections.namedtuple("TraceContext", ["sequence", "capture_time", "decision_time"])
+
+
+def make_trace_context(info):
+    """
+    Tespit bilgilerinden (detect_green_light info sözlüğü) şimdiki karar zamanıyla iz oluşturur
+
+    Args:
+        info (dict): frame_sequence ve capture_timestamp anahtarlarını içeren tespit bilgileri
+
+    Returns:
+        TraceContext: Görüntü izi
+    """
+    return TraceContext(info.get("frame_sequence"), info.get("capture_timestamp"), time.monotonic())
+
+
+class LatencyTracer:
+    def __init__(self, log_size=10000):
+        """
+        Görüntü yakalamadan motor yazımına kadar geçen süreyi izleyen sınıf.
+        Her motor yazımı, ona neden olan görüntünün sıra numarasıyla kaydedilir;
+        yakalama -> karar -> sürüş gecikmeleri sabit boyutlu histogramlarda tutulur.
+
+        Args:
+            log_size (int): Saklanacak en fazla motor yazımı kaydı
+        """
+        self.log = collections.deque(maxlen=log_size)
+        self.capture_to_decision = StageHistogram()
+        self.decision_to_actuation = StageHistogram()
+        self.capture_to_actuation = StageHistogram()
+        self.untraced_writes = 0  # Görüntüye bağlanamayan motor yazımları
+
+    def record_actuation(self, side, speed, cause, timestamp=None):
+        """
+        Bir motor yazımını kaydeder (MotorController tarafından çağrılır)
+
+        Args:
+            side (str): "left" veya "right"
+            speed (float): Yazılan hız
+            cause (TraceContext): Yazıma neden olan görüntünün izi (None: bilinmiyor)
+            timestamp (float, optional): Yazım zamanı (varsayılan: şimdi)
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if cause is None or cause.capture_time is None:
+            self.untraced_writes += 1
+            self.log.append((None, side, speed, None, None, timestamp))
+            return
+
+        self.log.append((cause.sequence, side, speed, cause.capture_time, cause.decision_time, timestamp))
+        self.capture_to_actuation.add(timestamp - cause.capture_time)
+        if cause.decision_time is not None:
+            self.capture_to_decision.add(cause.decision_time - cause.capture_time)
+            self.decision_to_actuation.add(timestamp - cause.decision_time)
+
+    def get_writes(self):
+        """
+        Motor yazımı kayıtlarını döndürür
+
+        Returns:
+            list: (görüntü sıra no, taraf, hız, yakalama zamanı, karar zamanı, yazım zamanı) kayıtları
+        """
+        return list(self.log)
+
+    def get_stats(self):
+        """
+        Gecikme dağılımlarını döndürür
+
+        Returns:
+            dict: Aralık adı -> {count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}
+        """
+        stats = {}
+        for name, histogram in (("capture_to_decision", self.capture_to_decision),
+                                ("decision_to_actuation", self.decision_to_actuation),
+                                ("capture_to_actuation", self.capture_to_actuation)):
+            if histogram.count == 0:
+                continue
+            stats[name] = {
+                "count": histogram.count,
+                "mean_ms": histogram.total / histogram.count * 1000,
+                "p50_ms": histogram.percentile(50) * 1000,
+                "p90_ms": histogram.percentile(90) * 1000,
+                "p99_ms": histogram.percentile(99) * 1000,
+                "max_ms": histogram.maximum * 1000
+            }
+        return stats
+
+    def report(self):
+        """
+        Gecikme dağılımlarının okunabilir özetini döndürür
+
+        Returns:
+            str: Özet tablo
+        """
+        lines = [f"{'Aralık':<24} {'Sayı':>6} {'Ort (ms)':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'Maks':>8}"]
+        for name, s in self.get_stats().items():
+            lines.append(f"{name:<24} {s['count']:>6} {s['mean_ms']:>9.3f} {s['p50_ms']:>8.3f} "
+                         f"{s['p90_ms']:>8.3f} {s['p99_ms']:>8.3f} {s['max_ms']:>8.3f}")
+        lines.append(f"Motor yazımı: {len(self.log)}, görüntüye bağlanamayan: {self.untraced_writes}")
+        return "\n".join(lines)
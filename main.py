@@ -1,20 +1,111 @@
 import time
-import cv2
+import asyncio
 import numpy as np
 import argparse
 import os
-import sys
 from traffic_light_detection import TrafficLightDetector
-from motor_control import MotorController
+from motor_control import MotorController, MotorService, create_mock_motor_controller
+from profiling import StageProfiler
+from perception_pipeline import PerceptionPipeline, traffic_light_worker
+from async_runtime import LatestValueChannel, PeriodicTask, format_task_stats
+from latency_trace import LatencyTracer, TraceContext, make_trace_context
+from replay import ReplayCamera, ReplayRecorder
+from color_segmentation import ColorSegmenter, DEFAULT_COLOR_CLASSES
+from lane_detection import LaneDetector
+from camera_geometry import load_camera_calibration
+from crossing_detection import CrossingDetector
+
+# Asyncio çalışma zamanındaki görevlerin periyot ve son tarihleri (saniye)
+ASYNC_TASK_TIMING = {
+    "capture": (1 / 30, 0.05),
+    "perception": (0.01, 0.05),
+    "decision": (0.02, 0.005),
+    "actuation": (0.02, 0.005)
+}
+
+# Bu süreden eski algılama sonucuyla hareket edilmez, araç durdurulur (saniye)
+MAX_RESULT_AGE = 0.3
+
+# Şerit takibi: sürüş hızı ve direksiyon kazançları (kayma metre, eğrilik 1/metre başına)
+LANE_SPEED = 0.5
+LANE_OFFSET_GAIN = 2.0
+LANE_CURVATURE_GAIN = 0.2
+
+# Yaya geçidi ve hemzemin geçit: durma uzaklığı (bandın oranı, 0: alt kenar) ve kare sayıları.
+# Süreler kare sayısıdır, böylece kayıttan oynatma tekrarlanabilir kalır (30 kare/s'de 90 kare 3 s).
+CROSSING_STOP_DISTANCE = 0.5
+CROSSING_CONFIRM_FRAMES = 2  # Durmak için gereken ardışık yakın tespit
+CROSSING_STOP_FRAMES = 90  # Geçitte bekleme
+CROSSING_CLEAR_FRAMES = 10  # Beklemeden sonra işaret bu kadar kare görünmezse geçit geçilmiş sayılır
 
 def parse_arguments():
     """Komut satırı argümanlarını ayrıştırır"""
     parser = argparse.ArgumentParser(description="Otonom Araç Kontrol Programı")
     parser.add_argument("--camera", type=int, default=0, help="Kamera indeksi")
-    parser.add_argument("--debug", action="store_true", help="Hata ayıklama modunu etkinleştirir")
+    parser.add_argument("--debug", action="store_true",
+                        help="Hata ayıklama görüntüsünü yerel HTTP sunucusundan MJPEG olarak yayınlar")
+    parser.add_argument("--debug-port", type=int, default=8080, help="Debug yayını portu")
+    parser.add_argument("--debug-host", default="127.0.0.1",
+                        help="Debug yayınının dinleyeceği adres (0.0.0.0: araç dışından, tüm ağ arayüzlerinden erişim)")
+    parser.add_argument("--debug-fps", type=float, default=10, help="Debug yayınının en yüksek kare hızı")
     parser.add_argument("--test-mode", choices=["traffic_light", "motor", "all"], 
                         default="all", help="Test modu seçimi")
-    return parser.parse_args()
+    parser.add_argument("--threaded-capture", action="store_true",
+                        help="Görüntüleri arka plan iş parçacığında yakalar")
+    parser.add_argument("--color-classifier", choices=["hsv", "lut"], default="hsv",
+                        help="Renk sınıflandırma yöntemi")
+    parser.add_argument("--track-light", action="store_true",
+                        help="Lamba bulunduktan sonra yalnızca çevresindeki küçük pencereyi işler")
+    parser.add_argument("--skip-static-frames", action="store_true",
+                        help="Sahne değişmediğinde tam algılamayı atlar ve önceki sonucu kullanır")
+    parser.add_argument("--detection-scale", type=float, default=1.0,
+                        help="Renk sınıflandırmanın yapılacağı ölçek (0-1 arası)")
+    parser.add_argument("--denoise", choices=["reference", "downsampled", "components"],
+                        default="reference", help="Maske gürültü azaltma yöntemi")
+    parser.add_argument("--shared-segmentation", action="store_true",
+                        help="Her görüntüyü bir kez tüm renk sınıflarına bölütler; algılayıcılar sonucu sorgular")
+    parser.add_argument("--lane-following", action="store_true",
+                        help="Yeşil ışıktan sonra şerit tespitiyle direksiyon kontrolü yapar")
+    parser.add_argument("--crossing-stop", action="store_true",
+                        help="Yaya geçidi ve hemzemin geçit dur çizgisinde durup bekledikten sonra devam eder")
+    parser.add_argument("--camera-calibration", metavar="DOSYA",
+                        help="Lens kalibrasyonu (JSON veya .npz); şerit görüntüsünün distorsiyonu giderilir")
+    parser.add_argument("--geometry-cache", metavar="KLASÖR",
+                        help="Kuş bakışı remap haritalarının saklandığı klasör (sonraki açılışlarda hemen yüklenir)")
+    parser.add_argument("--green-confirm-frames", type=int, default=1,
+                        help="Harekete geçmek için gereken ardışık yeşil kare sayısı")
+    parser.add_argument("--multiprocess", action="store_true",
+                        help="Yakalama ve algılamayı paylaşılan bellekli ayrı işlemlerde çalıştırır")
+    parser.add_argument("--async-runtime", action="store_true",
+                        help="Yakalama, algılama, karar ve sürüşü ayrı asyncio görevlerinde çalıştırır")
+    parser.add_argument("--profile", action="store_true",
+                        help="Döngü aşamalarının sürelerini ölçer ve çıkışta özetini yazdırır")
+    parser.add_argument("--motor-service", action="store_true",
+                        help="Motorları sabit hızlı arka plan iş parçacığında ivme sınırıyla sürer")
+    parser.add_argument("--motor-rate", type=float, default=100, help="Motor servisi güncelleme hızı (Hz)")
+    parser.add_argument("--max-acceleration", type=float, default=2.0,
+                        help="Motor servisinde saniyedeki en fazla hız değişimi")
+    parser.add_argument("--watchdog-timeout", type=float, default=0.5,
+                        help="Motor servisinin yeni komut gelmezse durmadan önce beklediği süre (saniye)")
+    parser.add_argument("--trace-latency", action="store_true",
+                        help="Görüntü yakalamadan motor yazımına kadar geçen süreyi izler ve çıkışta raporlar")
+    parser.add_argument("--replay", metavar="YOL",
+                        help="Otonom döngüyü kamera yerine kayıtlı videodan veya görüntü klasöründen, "
+                             "sahte GPIO pinleriyle çalıştırır")
+    parser.add_argument("--replay-rate", type=float, default=0,
+                        help="Oynatma hızı (kare/saniye, 0: işlemcinin yetişebildiği hızda)")
+    parser.add_argument("--replay-output", metavar="DOSYA",
+                        help="Oynatmadaki motor yazımlarını kare sırasıyla JSON satırları olarak kaydeder")
+    args = parser.parse_args()
+    
+    # Kayıttan oynatma kareye bağlı ve tekrarlanabilir olmalı: zamana bağlı modlarla birlikte kullanılmaz
+    if args.replay:
+        for flag, enabled in (("--multiprocess", args.multiprocess), ("--async-runtime", args.async_runtime),
+                              ("--motor-service", args.motor_service),
+                              ("--threaded-capture", args.threaded_capture)):
+            if enabled:
+                parser.error(f"--replay ile {flag} birlikte kullanılamaz")
+    return args
 
 def main():
     """Ana program"""
@@ -23,49 +114,148 @@ def main():
     print("Otonom Araç Kontrol Programı başlatılıyor...")
     
     # Trafik ışığı detektörünü başlat
-    detector = TrafficLightDetector(camera_index=args.camera, debug=args.debug)
+    detector = TrafficLightDetector(camera_index=args.camera, debug=args.debug,
+                                    threaded_capture=args.threaded_capture)
+    detector.set_color_classifier(args.color_classifier)
+    detector.set_tracking(args.track_light)
+    detector.set_change_gating(args.skip_static_frames)
+    detector.set_detection_scale(args.detection_scale)
+    detector.set_denoise_method(args.denoise)
+    detector.set_debug_stream(args.debug_port, args.debug_fps, args.debug_host)
+    
+    # Aşama süre ölçümü (kapalıyken None)
+    profiler = StageProfiler() if args.profile else None
+    detector.set_profiler(profiler)
+    
+    # Motor kontrolcüsünü başlat (kayıttan oynatmada sahte pinlerle)
+    if args.replay:
+        motor = create_mock_motor_controller()
+    else:
+        motor = MotorController(
+            left_motor_pins=(16, 18),
+            right_motor_pins=(36, 38),
+            left_pwm_pin=12,
+            right_pwm_pin=32
+        )
+    
+    # Yakalama -> karar -> sürüş gecikme izleme (kapalıyken None)
+    tracer = LatencyTracer() if args.trace_latency else None
+    motor.set_tracer(tracer)
+    
+    # Kayıttan oynatma: kareler kayıttan okunur, motor komutları ve yazımları kare sırasıyla kaydedilir
+    recorder = None
+    if args.replay:
+        detector.camera = ReplayCamera(args.replay, rate=args.replay_rate)
+        if not detector.camera.isOpened():
+            print(f"Kayıt açılamadı: {args.replay}")
+            return
+        recorder = ReplayRecorder(detector.camera, motor, tracer)
     
-    # Motor kontrolcüsünü başlat
-    motor = MotorController(
-        left_motor_pins=(16, 18),
-        right_motor_pins=(36, 38),
-        left_pwm_pin=12,
-        right_pwm_pin=32
-    )
+    # Motor servisi: durum makinesi hedef hızları bırakır, servis kendi hızında uygular
+    drive = motor
+    service = None
+    if args.motor_service:
+        service = MotorService(motor, rate=args.motor_rate, max_acceleration=args.max_acceleration,
+                               watchdog_timeout=args.watchdog_timeout)
+        service.start()
+        drive = service
+    
+    # Paylaşılan renk bölütleme: lamba sınıfları detektörün aralıklarıyla kurulur
+    segmenter = None
+    if args.shared_segmentation:
+        classes = [("green_lamp", [(detector.lower_green, detector.upper_green)]),
+                   ("red_lamp", detector.red_ranges)] + DEFAULT_COLOR_CLASSES[2:]
+        segmenter = ColorSegmenter(classes, classifier=args.color_classifier, scale=args.detection_scale)
+    
+    # Şerit takibi (kapalıyken None)
+    lane_detector = None
+    if args.lane_following:
+        lane_detector = LaneDetector()
+        lane_detector.set_profiler(profiler)
+        if args.camera_calibration or args.geometry_cache:
+            calibration = load_camera_calibration(args.camera_calibration) if args.camera_calibration else None
+            lane_detector.set_camera_geometry(calibration, args.geometry_cache)
+    
+    # Geçit tespiti (kapalıyken None)
+    crossing_detector = None
+    if args.crossing_stop:
+        crossing_detector = CrossingDetector()
+        crossing_detector.set_profiler(profiler)
+    
+    # Çok işlemli algılama hattı: algılama işlemleri detektörü aynı ayarlarla kurar
+    pipeline = None
+    if args.multiprocess:
+        pipeline = PerceptionPipeline(source=args.camera)
+        pipeline.add_worker("traffic_light", traffic_light_worker, {
+            "color_classifier": args.color_classifier,
+            "detection_scale": args.detection_scale,
+            "denoise": args.denoise,
+            "tracking": args.track_light,
+            "change_gating": args.skip_static_frames
+        })
     
     try:
         if args.test_mode == "traffic_light":
             test_traffic_light(detector)
         elif args.test_mode == "motor":
             test_motor(motor)
+        elif args.replay:
+            replay_start = time.monotonic()
+            run_autonomous_mode(detector, recorder, profiler, args.green_confirm_frames, segmenter, lane_detector,
+                                crossing_detector)
+            replay_time = time.monotonic() - replay_start
+            frames = detector.camera.frame_index + 1
+            print(f"Oynatılan kare: {frames}, süre: {replay_time:.2f} s "
+                  f"({frames / replay_time if replay_time > 0 else 0:.1f} kare/s)")
+        elif pipeline is not None:
+            run_pipeline_mode(pipeline, drive, profiler)
+        elif args.async_runtime:
+            run_async_mode(detector, drive)
         else:
-            run_autonomous_mode(detector, motor)
+            run_autonomous_mode(detector, drive, profiler, args.green_confirm_frames, segmenter, lane_detector,
+                                crossing_detector)
             
     except KeyboardInterrupt:
         print("Program kullanıcı tarafından durduruldu")
     finally:
+        if pipeline is not None:
+            pipeline.stop()
+        if service is not None:
+            service.shutdown()
+            print(f"Motor servisi: {service.get_stats()}")
         motor.cleanup()
         detector.stop_camera()
-        cv2.destroyAllWindows()
+        if args.skip_static_frames:
+            stats = detector.get_processing_stats()
+            print(f"İşlenen kare: {stats['frames_processed']}, atlanan kare: {stats['frames_skipped']}")
+        if profiler is not None:
+            print(profiler.summary())
+        if tracer is not None:
+            print(tracer.report())
+        if recorder is not None:
+            for frame_index, side, speed in recorder.get_writes():
+                print(f"Kare {frame_index}: {side} = {speed:+.2f}")
+            print(f"Kaydedilen motor komutu: {len(recorder.get_commands())}")
+            if args.replay_output:
+                recorder.save(args.replay_output)
         print("Program sonlandırıldı")
 
 def test_traffic_light(detector):
     """Trafik ışığı tanıma testini çalıştırır"""
     print("Trafik ışığı testi başlatılıyor...")
     print("Yeşil ışık için bekleniyor...")
-    print("Çıkmak için 'q' tuşuna basın")
+    print("Çıkmak için Ctrl+C tuşlarına basın")
     
     detector.start_camera()
     
     while True:
         is_green, info = detector.detect_green_light()
+        if "error" in info:
+            print(info["error"])
+            break
         
         if is_green:
             print("YEŞİL IŞIK TESPİT EDİLDİ!")
-        
-        # 'q' tuşuna basılırsa çık
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
 
 def test_motor(motor):
     """Motor kontrol testini çalıştırır"""
@@ -116,43 +306,319 @@ def test_motor(motor):
     # Dur
     motor.stop()
 
-def run_autonomous_mode(detector, motor):
-    """Otonom sürüş modunu çalıştırır"""
+def lane_steering(lane_info, speed=LANE_SPEED):
+    """
+    Şerit tespit sonucundan sol ve sağ motor hızlarını hesaplar. Araç şerit
+    ortasının sağındaysa veya şerit sola dönüyorsa sola dönülür.
+    
+    Args:
+        lane_info (dict): LaneDetector.detect_lane bilgileri (center_offset, curvature)
+        speed (float): Düz gidişteki motor hızı
+        
+    Returns:
+        float: Sol motor hızı
+        float: Sağ motor hızı
+    """
+    steer = LANE_OFFSET_GAIN * lane_info["center_offset"] + LANE_CURVATURE_GAIN * lane_info["curvature"]
+    steer = max(-1.0, min(1.0, steer))
+    return speed * (1 - steer), speed * (1 + steer)
+
+def run_autonomous_mode(detector, motor, profiler=None, confirm_frames=1, segmenter=None, lane_detector=None,
+                        crossing_detector=None):
+    """
+    Otonom sürüş modunu çalıştırır
+    
+    Args:
+        detector (TrafficLightDetector): Trafik ışığı detektörü
+        motor (MotorController veya MotorService): Motor kontrolcüsü
+        profiler (profiling.StageProfiler, optional): Aşama süre ölçümü (None: kapalı)
+        confirm_frames (int): Harekete geçmek için gereken ardışık yeşil kare sayısı
+        segmenter (color_segmentation.ColorSegmenter, optional): Paylaşılan renk bölütleme;
+            yeşil ışık beklenirken trafik ışığı ROI'sini bölütler (None: her algılayıcı kendi
+            renk sınıflandırmasını yapar)
+        lane_detector (LaneDetector, optional): Hareket halinde şerit takibi (None: düz git)
+        crossing_detector (CrossingDetector, optional): Yaya geçidi ve dur çizgisinde durma (None: durma)
+    """
     print("Otonom sürüş modu başlatılıyor...")
     print("Yeşil ışık için bekleniyor...")
-    print("Çıkmak için 'q' tuşuna basın")
+    print("Çıkmak için Ctrl+C tuşlarına basın")
     
-    detector.start_camera()
+    # Kamera önceden verilmişse (ör. kayıttan oynatma) onu kullan
+    if detector.camera is None:
+        detector.start_camera()
+    
+    # Sürüş komutuna neden olan görüntünün izi (komut her karede yenilenirken de kullanılır)
+    drive = {"cause": None}
+    
+    # Yeşil kararın verildiği karede, algılamanın geri kalanını beklemeden hareket et
+    def on_green(timestamp, info):
+        drive["cause"] = make_trace_context(info)
+        motor.forward(LANE_SPEED, cause=drive["cause"])  # %50 hızla ileri git
+        if profiler:
+            profiler.lap("motor_command")
+        print(f"YEŞİL IŞIK TESPİT EDİLDİ! Araç hareket ediyor... "
+              f"(görüntüden komuta {(time.monotonic() - timestamp) * 1000:.1f} ms)")
+    
+    start_signal = detector.subscribe_green(on_green, confirm_frames=confirm_frames)
     
     # Durum makinesi değişkenleri
     state = "WAITING_FOR_GREEN"
-    green_light_detected = False
+    crossing_frames = 0  # Ardışık yakın geçit tespiti
+    stop_frames = 0  # Geçitte beklenen kare
+    passing_crossing = False  # Beklemeden sonra geçidin üzerinden geçiliyor
     
     while True:
+        if profiler:
+            profiler.begin_iteration()
+        
         # Kameradan görüntü al
-        ret, frame = detector.camera.read()
+        ret, frame = detector.read_frame()
         if not ret:
             print("Kameradan görüntü alınamadı!")
             break
+        if profiler:
+            profiler.lap("capture")
         
-        # Durum makinesine göre işlem yap
+        # Durum makinesine göre işlem yap. Komutlar her karede yenilenir (motor servisinin
+        # watchdog'u için); değişmeyen komutlar GPIO'ya yazılmaz.
         if state == "WAITING_FOR_GREEN":
-            is_green, info = detector.detect_green_light(frame)
+            motor.stop()
             
-            if is_green and not green_light_detected:
+            # Bölütleme yalnızca sonucu okuyan trafik ışığı algılayıcısının ROI'si için yapılır
+            segmentation = None
+            if segmenter is not None:
+                segmentation = segmenter.segment(frame, detector.get_roi_box(frame.shape))
+                if profiler:
+                    profiler.lap("segmentation")
+            detector.detect_green_light(frame, segmentation=segmentation)
+            
+            if start_signal.event.is_set():
+                state = "MOVING"
+        
+        elif state == "MOVING":
+            # Burada engel tespiti vb. işlemler eklenecek
+            if crossing_detector is not None:
+                crossing_found, crossing = crossing_detector.detect_crossing(frame, detector.frame_timestamp,
+                                                                             detector.frame_sequence)
+                if passing_crossing:
+                    # Beklenen geçit, işaret görünmez olana kadar yeniden durmaya yol açmaz
+                    clear_frames = 0 if crossing_found else clear_frames + 1
+                    passing_crossing = clear_frames < CROSSING_CLEAR_FRAMES
+                elif crossing_found and crossing["distance"] <= CROSSING_STOP_DISTANCE:
+                    crossing_frames += 1
+                    if crossing_frames >= CROSSING_CONFIRM_FRAMES:
+                        motor.stop(cause=make_trace_context(crossing))
+                        print(f"GEÇİT TESPİT EDİLDİ ({crossing['kind']})! Araç bekliyor...")
+                        state = "STOPPED_AT_CROSSING"
+                        stop_frames = 0
+                else:
+                    crossing_frames = 0
+            
+            if state == "MOVING":
+                lane_found = False
+                if lane_detector is not None:
+                    lane_found, lane = lane_detector.detect_lane(frame, detector.frame_timestamp,
+                                                                 detector.frame_sequence)
+                if lane_found:
+                    left_speed, right_speed = lane_steering(lane)
+                    motor.set_motors(left_speed, right_speed, cause=make_trace_context(lane))
+                else:
+                    motor.forward(LANE_SPEED, cause=drive["cause"])
+            if profiler:
+                profiler.lap("motor_command")
+        
+        elif state == "STOPPED_AT_CROSSING":
+            motor.stop()
+            stop_frames += 1
+            if stop_frames >= CROSSING_STOP_FRAMES:
+                print("Bekleme tamamlandı, araç geçitten geçiyor...")
+                state = "MOVING"
+                passing_crossing = True
+                clear_frames = 0
+                crossing_frames = 0
+        
+        if profiler:
+            profiler.end_iteration()
+
+
+def run_pipeline_mode(pipeline, motor, profiler=None):
+    """
+    Otonom sürüş modunu çok işlemli algılama hattıyla çalıştırır. Kontrol döngüsü
+    yalnızca algılama işlemlerinin en son sonuç kayıtlarını okur.
+    
+    Args:
+        pipeline (PerceptionPipeline): Algılama hattı (henüz başlatılmamış)
+        motor (MotorController veya MotorService): Motor kontrolcüsü
+        profiler (profiling.StageProfiler, optional): Aşama süre ölçümü (None: kapalı)
+    """
+    print("Otonom sürüş modu (çok işlemli) başlatılıyor...")
+    print("Yeşil ışık için bekleniyor...")
+    print("Çıkmak için Ctrl+C tuşlarına basın")
+    
+    pipeline.start()
+    
+    # Durum makinesi değişkenleri
+    state = "WAITING_FOR_GREEN"
+    last_sequence = -1
+    cause = None
+    
+    while pipeline.is_running():
+        if profiler:
+            profiler.begin_iteration()
+        
+        result = pipeline.get_latest_result("traffic_light")
+        if profiler:
+            profiler.lap("collect_results")
+        
+        if result is None or result["sequence"] == last_sequence:
+            # Yeni sonuç yok
+            time.sleep(0.002)
+            continue
+        last_sequence = result["sequence"]
+        
+        # Durum makinesine göre işlem yap. Komutlar her sonuçta yenilenir (motor servisinin
+        # watchdog'u için); değişmeyen komutlar GPIO'ya yazılmaz.
+        if state == "WAITING_FOR_GREEN":
+            if not result["is_green"]:
+                motor.stop()
+            else:
                 print("YEŞİL IŞIK TESPİT EDİLDİ! Araç hareket ediyor...")
-                green_light_detected = True
                 state = "MOVING"
-                motor.forward(0.5)  # %50 hızla ileri git
+                cause = TraceContext(result["sequence"], result["timestamp"], time.monotonic())
+                motor.forward(0.5, cause=cause)  # %50 hızla ileri git
+                if profiler:
+                    profiler.lap("motor_command")
         
         elif state == "MOVING":
-            # Burada şerit takibi, engel tespiti vb. işlemler eklenecek
-            pass
+            # Burada şerit takibi, engel tespiti vb. işlemlerin sonuçları kullanılacak
+            motor.forward(0.5, cause=cause)
         
-        # 'q' tuşuna basılırsa çık
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
+        if profiler:
+            profiler.end_iteration()
+    
+    if pipeline.error:
+        print(pipeline.error)
+
+
+def run_async_mode(detector, motor, duration=None, timing=None, max_result_age=MAX_RESULT_AGE):
+    """
+    Otonom sürüş modunu asyncio görevleriyle çalıştırır. Yakalama, algılama,
+    karar (durum makinesi) ve sürüş ayrı görevlerdir ve en son değer kanallarıyla
+    haberleşir. Her görevin periyodu ve son tarihi vardır; son tarih aşımları
+    sayılır ve çıkışta yazdırılır. Algılama sonucu eskidiyse araç durdurulur.
+    
+    Args:
+        detector (TrafficLightDetector): Trafik ışığı detektörü
+        motor (MotorController veya MotorService): Motor kontrolcüsü
+        duration (float, optional): Çalışma süresi (saniye). None ise Ctrl+C'ye kadar çalışır.
+        timing (dict, optional): Görev adı -> (periyot, son tarih). Varsayılan: ASYNC_TASK_TIMING
+        max_result_age (float): Algılama sonucunun kullanılabileceği en büyük yaş (saniye)
+    
+    Returns:
+        dict: Görev adı -> görev istatistikleri, ayrıca "stale_stops" (eski sonuç nedeniyle durma sayısı)
+    """
+    print("Otonom sürüş modu (asyncio) başlatılıyor...")
+    print("Yeşil ışık için bekleniyor...")
+    print("Çıkmak için Ctrl+C tuşlarına basın")
+    
+    timing = dict(ASYNC_TASK_TIMING, **(timing or {}))
+    stale_stops = [0]
+    tasks = []
+    
+    async def run():
+        frames = LatestValueChannel("frames")
+        perception = LatestValueChannel("perception")
+        commands = LatestValueChannel("commands")
+        
+        state = {"name": "WAITING_FOR_GREEN", "frame_version": 0, "stale": False}
+        
+        async def capture():
+            # Kamera okuması bloklayıcıdır, olay döngüsünü durdurmaması için iş parçacığında yapılır
+            ret, frame = await asyncio.to_thread(detector.read_frame, 0.5)
+            if ret:
+                frames.publish((frame, detector.frame_sequence), detector.frame_timestamp)
+        
+        async def perceive():
+            value, version, timestamp = frames.get()
+            if version == state["frame_version"]:
+                return
+            state["frame_version"] = version
+            frame, sequence = value
+            is_green, info = await asyncio.to_thread(detector.detect_green_light, frame, timestamp, sequence)
+            # Sonucun zamanı görüntünün yakalanma zamanıdır
+            perception.publish({"is_green": is_green, "green_ratio": info.get("green_ratio", 0.0),
+                                "sequence": sequence}, timestamp)
+        
+        async def decide():
+            result, _, timestamp = perception.get()
+            if perception.age() > max_result_age:
+                # Eski veriyle hareket edilmez
+                if not state["stale"] and result is not None:
+                    print("Algılama sonucu eskidi, araç durduruluyor!")
+                    stale_stops[0] += 1
+                state["stale"] = True
+                commands.publish(("stop", 0.0, None))
+                return
+            state["stale"] = False
+            
+            if state["name"] == "WAITING_FOR_GREEN" and result["is_green"]:
+                print("YEŞİL IŞIK TESPİT EDİLDİ! Araç hareket ediyor...")
+                state["name"] = "MOVING"
+            
+            # Komut, ona neden olan görüntünün iziyle birlikte yayınlanır
+            cause = TraceContext(result["sequence"], timestamp, time.monotonic())
+            if state["name"] == "MOVING":
+                # Burada şerit takibi, engel tespiti vb. sonuçlar kullanılacak
+                commands.publish(("forward", 0.5, cause))  # %50 hızla ileri git
+            else:
+                commands.publish(("stop", 0.0, cause))
+        
+        async def actuate():
+            command, _, _ = commands.get()
+            if command is None or commands.age() > max_result_age:
+                # Karar görevi takıldıysa da araç durdurulur
+                command = ("stop", 0.0, None)
+            # Komut her periyotta uygulanır (motor servisinin watchdog'u için);
+            # değişmeyen komutlar GPIO'ya yazılmaz
+            action, speed, cause = command
+            if action == "forward":
+                motor.forward(speed, cause=cause)
+            else:
+                motor.stop(cause=cause)
+        
+        for name, step in (("capture", capture), ("perception", perceive),
+                           ("decision", decide), ("actuation", actuate)):
+            period, deadline = timing[name]
+            tasks.append(PeriodicTask(name, step, period, deadline))
+        
+        runners = [asyncio.create_task(task.run()) for task in tasks]
+        try:
+            await asyncio.wait(runners, timeout=duration, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for runner in runners:
+                runner.cancel()
+            await asyncio.gather(*runners, return_exceptions=True)
+            motor.stop()
+        
+        # Görevlerden biri hata verdiyse hatayı yükselt
+        for runner in runners:
+            if not runner.cancelled() and runner.exception() is not None:
+                raise runner.exception()
+    
+    try:
+        if detector.camera is None:
+            detector.start_camera()
+        asyncio.run(run())
+    finally:
+        if tasks:
+            print(format_task_stats(tasks))
+            print(f"Eski sonuç nedeniyle durma: {stale_stops[0]}")
+    
+    stats = {task.name: task.get_stats() for task in tasks}
+    stats["stale_stops"] = stale_stops[0]
+    return stats
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
+ 
\ No newline at end of file
@@ -1,13 +1,97 @@
 from gpiozero import DigitalOutputDevice, PWMOutputDevice
+import threading
 import time
 
-class MotorController:
+
+class MotorCommands:
+    """
+    Hareket komutları. Alt sınıflar set_motors(left_speed, right_speed, cause) yöntemini sağlar.
+    """
+    
+    def forward(self, speed=1.0, cause=None):
+        """
+        Aracı ileri hareket ettirir
+        
+        Args:
+            speed (float): Hız (0.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        speed = max(0.0, min(1.0, speed))
+        self.set_motors(speed, speed, cause)
+    
+    def backward(self, speed=1.0, cause=None):
+        """
+        Aracı geri hareket ettirir
+        
+        Args:
+            speed (float): Hız (0.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        speed = max(0.0, min(1.0, speed))
+        self.set_motors(-speed, -speed, cause)
+    
+    def turn_left(self, speed=0.5, cause=None):
+        """
+        Aracı sola döndürür
+        
+        Args:
+            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        speed = max(0.0, min(1.0, speed))
+        self.set_motors(0, speed, cause)
+    
+    def turn_right(self, speed=0.5, cause=None):
+        """
+        Aracı sağa döndürür
+        
+        Args:
+            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        speed = max(0.0, min(1.0, speed))
+        self.set_motors(speed, 0, cause)
+    
+    def rotate_left(self, speed=0.5, cause=None):
+        """
+        Aracı yerinde sola döndürür
+        
+        Args:
+            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        speed = max(0.0, min(1.0, speed))
+        self.set_motors(-speed, speed, cause)
+    
+    def rotate_right(self, speed=0.5, cause=None):
+        """
+        Aracı yerinde sağa döndürür
+        
+        Args:
+            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        speed = max(0.0, min(1.0, speed))
+        self.set_motors(speed, -speed, cause)
+    
+    def stop(self, cause=None):
+        """
+        Aracı durdurur
+        
+        Args:
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        self.set_motors(0, 0, cause)
+
+
+class MotorController(MotorCommands):
     def __init__(self, 
                  left_motor_pins=(16, 18),    # Sol motor için (IN1, IN2) pin numaraları
                  right_motor_pins=(36, 38),   # Sağ motor için (IN1, IN2) pin numaraları
                  left_pwm_pin=12,             # Sol motor için PWM enable pini
                  right_pwm_pin=32,            # Sağ motor için PWM enable pini
-                 frequency=100):              # PWM frekansı
+                 frequency=100,               # PWM frekansı
+                 pin_factory=None):           # gpiozero pin fabrikası (None: varsayılan)
         """
         Motor kontrol sınıfı
         
@@ -17,150 +101,325 @@ class MotorController:
             left_pwm_pin (int): Sol motor için PWM enable pini
             right_pwm_pin (int): Sağ motor için PWM enable pini
             frequency (int): PWM frekansı (Hz)
+            pin_factory (gpiozero.Factory, optional): Pin fabrikası (ör. test için MockFactory)
         """
         # Sol motor kontrol pinleri
-        self.left_forward = DigitalOutputDevice(left_motor_pins[0])
-        self.left_backward = DigitalOutputDevice(left_motor_pins[1])
-        self.left_pwm = PWMOutputDevice(left_pwm_pin, frequency=frequency)
+        self.left_forward = DigitalOutputDevice(left_motor_pins[0], pin_factory=pin_factory)
+        self.left_backward = DigitalOutputDevice(left_motor_pins[1], pin_factory=pin_factory)
+        self.left_pwm = PWMOutputDevice(left_pwm_pin, frequency=frequency, pin_factory=pin_factory)
         
         # Sağ motor kontrol pinleri
-        self.right_forward = DigitalOutputDevice(right_motor_pins[0])
-        self.right_backward = DigitalOutputDevice(right_motor_pins[1])
-        self.right_pwm = PWMOutputDevice(right_pwm_pin, frequency=frequency)
+        self.right_forward = DigitalOutputDevice(right_motor_pins[0], pin_factory=pin_factory)
+        self.right_backward = DigitalOutputDevice(right_motor_pins[1], pin_factory=pin_factory)
+        self.right_pwm = PWMOutputDevice(right_pwm_pin, frequency=frequency, pin_factory=pin_factory)
+        
+        # Her iki tarafın (ileri pini, geri pini, PWM) aygıtları
+        self._sides = {
+            "left": (self.left_forward, self.left_backward, self.left_pwm),
+            "right": (self.right_forward, self.right_backward, self.right_pwm)
+        }
+        
+        # Pinlere en son yazılan değerlerin gölgesi. Değeri değiştirmeyecek yazımlar
+        # atlanır. Boşken (başlangıçta) ilk komut tüm pinlere yazılır.
+        self._shadow = {}
+        self.writes_issued = 0
+        self.writes_elided = 0
+        
+        # Gecikme izleme (latency_trace.LatencyTracer). None ise motor yazımları kaydedilmez.
+        self.tracer = None
         
         # Başlangıçta motorları durdur
         self.stop()
-        
-    def set_left_motor(self, speed):
+    
+    def set_tracer(self, tracer):
         """
-        Sol motor hızını ve yönünü ayarlar
+        Motor yazımlarının kaydedileceği gecikme izleyicisini ayarlar
         
         Args:
-            speed (float): Motor hızı ve yönü (-1.0 ile 1.0 arasında)
-                          Pozitif değerler ileri, negatif değerler geri
+            tracer (latency_trace.LatencyTracer): İzleyici (None: kayıt kapalı)
+        """
+        self.tracer = tracer
+    
+    def get_write_stats(self):
         """
-        speed = max(-1.0, min(1.0, speed))  # Hızı -1 ile 1 arasında sınırla
+        GPIO yazım sayaçlarını döndürür
         
-        if speed > 0:  # İleri
-            self.left_forward.on()
-            self.left_backward.off()
-            self.left_pwm.value = speed
-        elif speed < 0:  # Geri
-            self.left_forward.off()
-            self.left_backward.on()
-            self.left_pwm.value = -speed
-        else:  # Dur
-            self.left_forward.off()
-            self.left_backward.off()
-            self.left_pwm.value = 0
+        Returns:
+            dict: writes_issued (yapılan yazımlar), writes_elided (değer değişmediği için atlananlar)
+        """
+        return {"writes_issued": self.writes_issued, "writes_elided": self.writes_elided}
     
-    def set_right_motor(self, speed):
+    def _write(self, device, value):
         """
-        Sağ motor hızını ve yönünü ayarlar
+        Pine yalnızca değer değişecekse yazar
         
         Args:
-            speed (float): Motor hızı ve yönü (-1.0 ile 1.0 arasında)
-                          Pozitif değerler ileri, negatif değerler geri
+            device: gpiozero çıkış aygıtı
+            value: Yazılacak değer (yön pinleri için bool, PWM için 0-1 arası float)
+            
+        Returns:
+            bool: Yazım yapıldıysa True
         """
-        speed = max(-1.0, min(1.0, speed))  # Hızı -1 ile 1 arasında sınırla
+        if self._shadow.get(device) == value:
+            self.writes_elided += 1
+            return False
         
-        if speed > 0:  # İleri
-            self.right_forward.on()
-            self.right_backward.off()
-            self.right_pwm.value = speed
-        elif speed < 0:  # Geri
-            self.right_forward.off()
-            self.right_backward.on()
-            self.right_pwm.value = -speed
-        else:  # Dur
-            self.right_forward.off()
-            self.right_backward.off()
-            self.right_pwm.value = 0
+        if value is True:
+            device.on()
+        elif value is False:
+            device.off()
+        else:
+            device.value = value
+        self._shadow[device] = value
+        self.writes_issued += 1
+        return True
     
-    def set_motors(self, left_speed, right_speed):
+    def _apply(self, commands, cause):
         """
-        Her iki motorun hızını ve yönünü ayarlar
+        Motor komutlarını tek bir sıralı toplu işlem olarak uygular: önce kapanacak
+        yön pinleri, sonra açılacak yön pinleri, en son PWM değerleri yazılır.
+        Böylece yön değişiminde bir köprü kolunun iki pini aynı anda açık kalmaz.
         
         Args:
-            left_speed (float): Sol motor hızı ve yönü (-1.0 ile 1.0 arasında)
-            right_speed (float): Sağ motor hızı ve yönü (-1.0 ile 1.0 arasında)
+            commands (list): (taraf, hız) çiftleri
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
         """
-        self.set_left_motor(left_speed)
-        self.set_right_motor(right_speed)
+        plans = []
+        for side, speed in commands:
+            speed = max(-1.0, min(1.0, speed))  # Hızı -1 ile 1 arasında sınırla
+            forward, backward, pwm = self._sides[side]
+            plans.append((side, speed, ((forward, speed > 0), (backward, speed < 0)), pwm))
+        
+        changed = set()
+        for turn_on in (False, True):
+            for side, _, pins, _ in plans:
+                for device, state in pins:
+                    if state == turn_on and self._write(device, state):
+                        changed.add(side)
+        for side, speed, _, pwm in plans:
+            if self._write(pwm, abs(speed)):
+                changed.add(side)
+        
+        if self.tracer is not None:
+            for side, speed, _, _ in plans:
+                if side in changed:
+                    self.tracer.record_actuation(side, speed, cause)
     
-    def forward(self, speed=1.0):
+    def set_left_motor(self, speed, cause=None):
         """
-        Aracı ileri hareket ettirir
+        Sol motor hızını ve yönünü ayarlar
         
         Args:
-            speed (float): Hız (0.0 ile 1.0 arasında)
+            speed (float): Motor hızı ve yönü (-1.0 ile 1.0 arasında)
+                          Pozitif değerler ileri, negatif değerler geri
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
         """
-        speed = max(0.0, min(1.0, speed))
-        self.set_motors(speed, speed)
+        self._apply([("left", speed)], cause)
     
-    def backward(self, speed=1.0):
+    def set_right_motor(self, speed, cause=None):
         """
-        Aracı geri hareket ettirir
+        Sağ motor hızını ve yönünü ayarlar
         
         Args:
-            speed (float): Hız (0.0 ile 1.0 arasında)
+            speed (float): Motor hızı ve yönü (-1.0 ile 1.0 arasında)
+                          Pozitif değerler ileri, negatif değerler geri
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
         """
-        speed = max(0.0, min(1.0, speed))
-        self.set_motors(-speed, -speed)
+        self._apply([("right", speed)], cause)
     
-    def turn_left(self, speed=0.5):
+    def set_motors(self, left_speed, right_speed, cause=None):
         """
-        Aracı sola döndürür
+        Her iki motorun hızını ve yönünü tek bir sıralı toplu işlemle ayarlar
         
         Args:
-            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            left_speed (float): Sol motor hızı ve yönü (-1.0 ile 1.0 arasında)
+            right_speed (float): Sağ motor hızı ve yönü (-1.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
         """
-        speed = max(0.0, min(1.0, speed))
-        self.set_motors(0, speed)
+        self._apply([("left", left_speed), ("right", right_speed)], cause)
     
-    def turn_right(self, speed=0.5):
+    def cleanup(self):
+        """GPIO pinlerini temizler"""
+        self.stop()
+        self.left_pwm.close()
+        self.right_pwm.close()
+        self.left_forward.close()
+        self.left_backward.close()
+        self.right_forward.close()
+        self.right_backward.close()
+
+
+class MotorService(MotorCommands):
+    def __init__(self, motor, rate=100, max_acceleration=2.0, watchdog_timeout=0.5, clock=time.monotonic):
         """
-        Aracı sağa döndürür
+        Motorları görüntü işleme zamanlamasından bağımsız, sabit hızda süren servis.
+        Kontrol döngüsü hedef hızı (setpoint) posta kutusuna bırakır; arka plan iş
+        parçacığı her adımda en son hedefi okur, hız değişimini ivme sınırıyla
+        yumuşatarak motorlara uygular. Belirli süre yeni hedef gelmezse (watchdog)
+        motorlar hemen durdurulur. Durma hedefi (iki motor da 0) ivme sınırı
+        beklenmeden hemen uygulanır.
+        
+        Posta kutusu kilitsizdir: hedef tek bir demet olarak atanır, okuyucu her
+        zaman tutarlı bir (sol, sağ, iz, zaman) demeti görür.
         
         Args:
-            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            motor (MotorController): Sürülecek motor kontrolcüsü
+            rate (float): Güncelleme hızı (Hz)
+            max_acceleration (float): Saniyede en fazla hız değişimi (hız birimi/s; None: sınırsız)
+            watchdog_timeout (float): Yeni hedef gelmezse durdurmadan önceki süre (saniye)
+            clock (callable): Zaman kaynağı (saniye, testlerde değiştirilebilir)
         """
-        speed = max(0.0, min(1.0, speed))
-        self.set_motors(speed, 0)
+        self.motor = motor
+        self.clock = clock
+        self.period = 1.0 / rate
+        self.max_acceleration = max_acceleration
+        self.watchdog_timeout = watchdog_timeout
+        
+        self.running = False
+        self.thread = None
+        
+        # Posta kutusu: (sol hız, sağ hız, iz, gönderim zamanı)
+        self._setpoint = (0.0, 0.0, None, clock())
+        self._applied_setpoint = None  # En son adımda okunan posta kutusu demeti
+        self._pending_cause = None  # Yeni hedefin, henüz motorlara yazılmamış izi
+        self._last_update = None
+        
+        # Motorlara uygulanan (yumuşatılmış) hızlar
+        self.left_speed = 0.0
+        self.right_speed = 0.0
+        
+        # İstatistikler
+        self.updates = 0
+        self.overruns = 0  # Periyodu aşan adımlar
+        self.watchdog_trips = 0
+        self.watchdog_active = False
+    
+    def start(self):
+        """Servis iş parçacığını başlatır"""
+        if self.running:
+            return
+        self.running = True
+        self._setpoint = (0.0, 0.0, None, self.clock())
+        self._last_update = None
+        self.thread = threading.Thread(target=self._run, name="MotorService", daemon=True)
+        self.thread.start()
     
-    def rotate_left(self, speed=0.5):
+    def shutdown(self):
+        """Servis iş parçacığını durdurur ve motorları durdurur"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.left_speed = self.right_speed = 0.0
+        self.motor.stop()
+    
+    def set_motors(self, left_speed, right_speed, cause=None):
         """
-        Aracı yerinde sola döndürür
+        Hedef hızları posta kutusuna bırakır (beklemez). Hızlar servis iş
+        parçacığında ivme sınırıyla uygulanır.
         
         Args:
-            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            left_speed (float): Sol motor hedef hızı (-1.0 ile 1.0 arasında)
+            right_speed (float): Sağ motor hedef hızı (-1.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
         """
-        speed = max(0.0, min(1.0, speed))
-        self.set_motors(-speed, speed)
+        left_speed = max(-1.0, min(1.0, left_speed))
+        right_speed = max(-1.0, min(1.0, right_speed))
+        self._setpoint = (left_speed, right_speed, cause, self.clock())
     
-    def rotate_right(self, speed=0.5):
+    def get_stats(self):
         """
-        Aracı yerinde sağa döndürür
+        Servis istatistiklerini döndürür
+        
+        Returns:
+            dict: updates, overruns, watchdog_trips ve motor yazım sayaçları
+        """
+        stats = {"updates": self.updates, "overruns": self.overruns, "watchdog_trips": self.watchdog_trips}
+        stats.update(self.motor.get_write_stats())
+        return stats
+    
+    def _step_towards(self, current, target, max_step):
+        """Hızı hedefe en fazla max_step kadar yaklaştırır"""
+        if max_step is None or abs(target - current) <= max_step:
+            return target
+        return current + max_step if target > current else current - max_step
+    
+    def _update(self, now):
+        """
+        Tek bir servis adımı: en son hedefi okur ve motorlara uygular
         
         Args:
-            speed (float): Dönüş hızı (0.0 ile 1.0 arasında)
+            now (float): Adım zamanı (clock ile aynı zaman kaynağından)
         """
-        speed = max(0.0, min(1.0, speed))
-        self.set_motors(speed, -speed)
+        dt = 0.0 if self._last_update is None else now - self._last_update
+        self._last_update = now
+        
+        setpoint = self._setpoint
+        left_target, right_target, cause, sent_time = setpoint
+        if setpoint is not self._applied_setpoint:
+            self._applied_setpoint = setpoint
+            self._pending_cause = cause
+        
+        if now - sent_time > self.watchdog_timeout:
+            # Kontrol döngüsü sustu: yumuşatmadan hemen dur
+            if not self.watchdog_active:
+                self.watchdog_active = True
+                self.watchdog_trips += 1
+            self.left_speed = self.right_speed = 0.0
+            self.motor.stop()
+        else:
+            self.watchdog_active = False
+            if left_target == 0 and right_target == 0:
+                # Durma komutu (ör. geçitte): yumuşatmadan hemen dur
+                left_speed = right_speed = 0.0
+            else:
+                max_step = self.max_acceleration * dt if self.max_acceleration is not None else None
+                left_speed = self._step_towards(self.left_speed, left_target, max_step)
+                right_speed = self._step_towards(self.right_speed, right_target, max_step)
+            
+            # İz yalnızca hedefin ilk yazımına verilir; rampanın ara adımları o karenin
+            # gecikmesine sayılmaz
+            cause = None
+            if (left_speed, right_speed) != (self.left_speed, self.right_speed):
+                cause, self._pending_cause = self._pending_cause, None
+            self.left_speed, self.right_speed = left_speed, right_speed
+            self.motor.set_motors(left_speed, right_speed, cause)
+        self.updates += 1
     
-    def stop(self):
-        """Aracı durdurur"""
-        self.set_motors(0, 0)
+    def _run(self):
+        """Sabit hızda hedefleri motorlara uygular"""
+        next_time = self.clock()
+        while self.running:
+            self._update(self.clock())
+            
+            next_time += self.period
+            delay = next_time - self.clock()
+            if delay < 0:
+                # Geride kalındı: kaçırılan adımlar telafi edilmez
+                self.overruns += 1
+                next_time = self.clock()
+            else:
+                time.sleep(delay)
+
+
+def create_mock_motor_controller():
+    """
+    gpiozero'nun sahte pin fabrikasıyla bir motor kontrolcüsü oluşturur.
+    GPIO donanımı gerektirmez; testlerde ve performans ölçümlerinde kullanılır.
+    README'deki pin bağlantıları fiziksel (BOARD) numaralardır.
     
-    def cleanup(self):
-        """GPIO pinlerini temizler"""
-        self.stop()
-        self.left_pwm.close()
-        self.right_pwm.close()
-        self.left_forward.close()
-        self.left_backward.close()
-        self.right_forward.close()
-        self.right_backward.close()
+    Returns:
+        MotorController: Sahte pinlere bağlı motor kontrolcüsü
+    """
+    from gpiozero.pins.mock import MockFactory, MockPWMPin
+    
+    return MotorController(
+        left_motor_pins=("BOARD16", "BOARD18"),
+        right_motor_pins=("BOARD36", "BOARD38"),
+        left_pwm_pin="BOARD12",
+        right_pwm_pin="BOARD32",
+        pin_factory=MockFactory(pin_class=MockPWMPin)
+    )
 
 
 def main():
@@ -0,0 +1,375 @@
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from traffic_light_detection import create_detector
+
+# Paylaşılan bellek bölümlerinin hizalaması (önbellek satırı)
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SharedFrameRing:
+    def __init__(self, shape, slots=4, name=None, create=False, lock=None):
+        """
+        Görüntüleri işlemler arasında kopyalamadan paylaşmak için paylaşılan
+        bellekte halka tampon. Tek bir yazıcı (yakalama işlemi) görüntüleri sırayla
+        yuvalara yazar; okuyucular en son görüntünün yuvasına doğrudan bakar.
+
+        Bellek düzeni: [son sıra no, yuva sıra no'ları] (int64), [yakalama zamanları]
+        (float64), ardından yuvalar. Yazma sırasında yuvanın sıra numarası -1
+        yapılır; okuyucu işlemden sonra sıra numarasını tekrar kontrol ederek
+        görüntünün bu sırada üzerine yazılıp yazılmadığını anlar.
+
+        Sıra numaraları ve zamanlar kilit altında yazılıp okunur. Paylaşılan
+        belleğe yapılan sıradan yazımların başka işlemlere program sırasıyla
+        görünmesi zayıf sıralı işlemcilerde (ör. Raspberry Pi 5, ARM) garanti
+        değildir; kilit bir bellek bariyeri olduğundan yuvanın -1 yapılması
+        görüntü yazımından önce, görüntü yazımı da yayınlamadan önce görünür.
+        Kilit görüntü başına iki kez alınır; görüntü kopyasının yanında maliyeti ihmal edilir.
+
+        Args:
+            shape (tuple): Görüntü boyutu (yükseklik, genişlik, kanal)
+            slots (int): Yuva sayısı
+            name (str, optional): Bağlanılacak paylaşılan bellek adı
+            create (bool): True ise yeni paylaşılan bellek oluşturulur
+            lock (multiprocessing.Lock, optional): Yazıcı ve okuyucuların paylaştığı kilit.
+                Halkaya bağlanan tüm işlemlere aynı kilit verilmelidir (None: yeni kilit).
+        """
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+
+        header_size = _align(8 * (1 + slots))
+        timestamps_size = _align(8 * slots)
+        frame_size = _align(int(np.prod(self.shape)))
+        total_size = header_size + timestamps_size + frame_size * slots
+
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=total_size if create else 0)
+        self.name = self.shm.name
+        self.owner = create
+
+        buffer = self.shm.buf
+        header = np.ndarray((1 + slots,), np.int64, buffer, 0)
+        self.latest = header[:1]
+        self.slot_sequences = header[1:]
+        self.timestamps = np.ndarray((slots,), np.float64, buffer, header_size)
+        self.frames = [np.ndarray(self.shape, np.uint8, buffer, header_size + timestamps_size + i * frame_size)
+                       for i in range(slots)]
+
+        if create:
+            self.latest[0] = -1
+            self.slot_sequences[:] = -1
+
+    def begin_write(self):
+        """
+        Sonraki görüntünün yazılacağı yuvayı hazırlar
+
+        Returns:
+            int: Görüntü sıra numarası
+            np.array: Görüntünün yazılacağı yuva (paylaşılan belleğe görünüm)
+        """
+        with self.lock:
+            sequence = int(self.latest[0]) + 1
+            slot = sequence % self.slots
+            self.slot_sequences[slot] = -1
+        return sequence, self.frames[slot]
+
+    def end_write(self, sequence, timestamp):
+        """
+        Yazılan görüntüyü okuyuculara yayınlar
+
+        Args:
+            sequence (int): begin_write ile alınan sıra numarası
+            timestamp (float): Yakalama zamanı (time.monotonic)
+        """
+        slot = sequence % self.slots
+        with self.lock:
+            self.timestamps[slot] = timestamp
+            self.slot_sequences[slot] = sequence
+            self.latest[0] = sequence
+
+    def latest_sequence(self):
+        """
+        En son yayınlanan görüntünün sıra numarasını döndürür (-1: henüz yok).
+        Kilitsiz okunur; yalnızca yeni görüntü olup olmadığına bakmak içindir,
+        görüntünün geçerliliği get_frame ile kontrol edilir.
+        """
+        return int(self.latest[0])
+
+    def get_frame(self, sequence):
+        """
+        Verilen sıra numaralı görüntüyü kopyalamadan döndürür
+
+        Args:
+            sequence (int): Görüntü sıra numarası
+
+        Returns:
+            np.array: Görüntü (paylaşılan belleğe görünüm; üzerine yazılmışsa None)
+            float: Yakalama zamanı
+        """
+        slot = sequence % self.slots
+        with self.lock:
+            timestamp = float(self.timestamps[slot])
+            valid = self.slot_sequences[slot] == sequence
+        if not valid:
+            return None, timestamp
+        return self.frames[slot], timestamp
+
+    def is_valid(self, sequence):
+        """Görüntünün okunduktan sonra üzerine yazılmadığını kontrol eder"""
+        with self.lock:
+            return self.slot_sequences[sequence % self.slots] == sequence
+
+    def close(self):
+        """Paylaşılan belleği kapatır (oluşturan taraf ayrıca siler)"""
+        # Görünümler bırakılmadan paylaşılan bellek kapatılamaz
+        self.latest = self.slot_sequences = self.timestamps = None
+        self.frames = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _open_source(source):
+    """Görüntü kaynağını açar (kamera indeksi, dosya yolu veya read() yöntemi olan nesne üreten fonksiyon)"""
+    if callable(source):
+        return source()
+    return cv2.VideoCapture(source)
+
+
+def _capture_process(source, ring_name, shape, slots, lock, new_frame, stop_event, results):
+    """Kaynaktan görüntü okuyup halka tampona yazan işlem"""
+    # Kuyruk boşaltılmasa da işlem kapanırken beklemesin
+    results.cancel_join_thread()
+    ring = SharedFrameRing(shape, slots, name=ring_name, lock=lock)
+    camera = _open_source(source)
+    height, width = shape[:2]
+    if isinstance(camera, cv2.VideoCapture):
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    try:
+        while not stop_event.is_set():
+            ret, frame = camera.read()
+            timestamp = time.monotonic()
+            if not ret:
+                results.put({"worker": "capture", "error": "Kameradan görüntü alınamadı"})
+                break
+
+            sequence, slot = ring.begin_write()
+            if frame.shape == slot.shape:
+                np.copyto(slot, frame)
+            else:
+                cv2.resize(frame, (width, height), dst=slot)
+            ring.end_write(sequence, timestamp)
+            slot = None
+
+            with new_frame:
+                new_frame.notify_all()
+    finally:
+        if hasattr(camera, "release"):
+            camera.release()
+        ring.close()
+
+
+def _worker_process(name, factory, args, ring_name, shape, slots, lock, new_frame, stop_event, results):
+    """Halka tampondaki en son görüntüyü işleyip sonucu yayınlayan işlem"""
+    results.cancel_join_thread()
+    ring = SharedFrameRing(shape, slots, name=ring_name, lock=lock)
+    process = factory(*args)
+    last_sequence = -1
+    frames_dropped = 0  # İşlenemeden üzerine yazılan görüntü sayısı
+    frame = None
+
+    try:
+        while not stop_event.is_set():
+            with new_frame:
+                new_frame.wait_for(lambda: ring.latest_sequence() > last_sequence or stop_event.is_set(),
+                                   timeout=0.5)
+            sequence = ring.latest_sequence()
+            if sequence <= last_sequence:
+                continue
+
+            frame, timestamp = ring.get_frame(sequence)
+            if frame is None:
+                continue
+            record = process(frame)
+            frame = None
+
+            # Aradaki işlenmemiş görüntüler atlanmıştır
+            if last_sequence >= 0:
+                frames_dropped += sequence - last_sequence - 1
+            last_sequence = sequence
+
+            # İşlem sırasında görüntünün üzerine yazıldıysa sonuç güvenilir değildir
+            if not ring.is_valid(sequence):
+                frames_dropped += 1
+                continue
+            record.update({
+                "worker": name,
+                "sequence": sequence,
+                "timestamp": timestamp,
+                "completed": time.monotonic(),
+                "frames_dropped": frames_dropped
+            })
+            try:
+                results.put_nowait(record)
+            except queue.Full:
+                pass
+    finally:
+        frame = None
+        ring.close()
+
+
+def traffic_light_worker(config):
+    """
+    Trafik ışığı algılama işlemi için işleyici oluşturur
+
+    Args:
+        config (dict): Detektör ayarları (bkz. traffic_light_detection.create_detector)
+
+    Returns:
+        callable: Görüntüden küçük bir sonuç kaydı üreten fonksiyon
+    """
+    detector = create_detector(config)
+
+    def process(frame):
+        is_green, info = detector.detect_green_light(frame)
+        return {
+            "is_green": bool(is_green),
+            "green_ratio": float(info["green_ratio"]),
+            "green_pixel_count": int(info["green_pixel_count"])
+        }
+
+    return process
+
+
+class PerceptionPipeline:
+    def __init__(self, source=0, frame_size=(640, 480), slots=4):
+        """
+        Çok işlemli algılama hattı. Bir yakalama işlemi görüntüleri paylaşılan
+        bellekteki halka tampona yazar; her algılama işlemi en son görüntüyü
+        kopyalamadan okuyup küçük sonuç kayıtları yayınlar. Kontrol döngüsü her
+        işlemin en son sonucunu görüntü verisi kopyalamadan alır.
+
+        Args:
+            source: Kamera indeksi, video dosyası yolu veya read() yöntemi olan
+                    nesne döndüren fonksiyon
+            frame_size (tuple): Görüntü boyutu (genişlik, yükseklik); farklı boyuttaki
+                                görüntüler yeniden boyutlandırılır
+            slots (int): Halka tampondaki yuva sayısı
+        """
+        self.source = source
+        self.shape = (frame_size[1], frame_size[0], 3)
+        self.slots = slots
+
+        self.workers = []  # (ad, fabrika fonksiyonu, argümanlar)
+        self.processes = []
+        self.ring = None
+        self.latest_results = {}
+        self.error = None
+
+        context = multiprocessing.get_context()
+        self._context = context
+        self.new_frame = context.Condition()
+        self.stop_event = context.Event()
+        self.results = context.Queue(maxsize=256)
+
+    def add_worker(self, name, factory, *args):
+        """
+        Algılama işlemi ekler. Fabrika fonksiyonu işlemin içinde çağrılır ve
+        görüntüyü alıp sözlük döndüren bir fonksiyon döndürmelidir.
+
+        Args:
+            name (str): İşlem adı (sonuçlar bu adla alınır)
+            factory (callable): Modül düzeyinde tanımlı fabrika fonksiyonu
+            *args: Fabrika fonksiyonunun argümanları
+        """
+        if self.processes:
+            raise RuntimeError("Hat çalışırken işlem eklenemez")
+        if name == "capture" or any(worker[0] == name for worker in self.workers):
+            raise ValueError(f"Geçersiz veya tekrarlanan işlem adı: {name}")
+        self.workers.append((name, factory, args))
+
+    def start(self):
+        """Paylaşılan belleği oluşturur ve işlemleri başlatır"""
+        if self.processes:
+            return
+        self.ring = SharedFrameRing(self.shape, self.slots, create=True, lock=self._context.Lock())
+        self.stop_event.clear()
+
+        common = (self.ring.name, self.shape, self.slots, self.ring.lock, self.new_frame, self.stop_event,
+                  self.results)
+        for name, factory, args in self.workers:
+            self.processes.append(self._context.Process(
+                target=_worker_process, args=(name, factory, args) + common, name=name, daemon=True))
+        # Yakalama işlemi en son başlatılır, böylece ilk görüntüler kaçırılmaz
+        self.processes.append(self._context.Process(
+            target=_capture_process, args=(self.source,) + common, name="capture", daemon=True))
+
+        for process in self.processes:
+            process.start()
+
+    def stop(self):
+        """İşlemleri durdurur ve paylaşılan belleği siler"""
+        if not self.processes:
+            return
+        self.stop_event.set()
+        with self.new_frame:
+            self.new_frame.notify_all()
+
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.processes = []
+
+        self.poll_results()
+        self.ring.close()
+        self.ring = None
+
+    def poll_results(self):
+        """
+        Bekleyen sonuç kayıtlarını alır ve her işlemin en son sonucunu günceller.
+        Beklemez.
+
+        Returns:
+            dict: İşlem adı -> en son sonuç kaydı
+        """
+        while True:
+            try:
+                record = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if "error" in record:
+                self.error = record["error"]
+                continue
+            previous = self.latest_results.get(record["worker"])
+            if previous is None or record["sequence"] > previous["sequence"]:
+                self.latest_results[record["worker"]] = record
+        return self.latest_results
+
+    def get_latest_result(self, name):
+        """
+        Bir işlemin en son sonucunu döndürür
+
+        Args:
+            name (str): İşlem adı
+
+        Returns:
+            dict: En son sonuç kaydı (henüz sonuç yoksa None)
+        """
+        return self.poll_results().get(name)
+
+    def is_running(self):
+        """Yakalama işlemi çalışıyorsa ve hata yoksa True döndürür"""
+        self.poll_results()
+        return bool(self.processes) and self.error is None and self.processes[-1].is_alive()
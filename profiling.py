@@ -0,0 +1,159 @@
+import bisect
+import time
+
+# Histogram kutu sınırları: 1 µs ile 10 s arası, her onluk için 10 logaritmik kutu
+HISTOGRAM_EDGES = [1e-6 * 10 ** (i / 10) for i in range(71)]
+
+
+class StageHistogram:
+    def __init__(self):
+        """
+        Sabit boyutlu süre histogramı. Bellek kullanımı ölçüm sayısından bağımsızdır.
+        """
+        self.counts = [0] * (len(HISTOGRAM_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, duration):
+        """
+        Bir süre ölçümü ekler
+
+        Args:
+            duration (float): Süre (saniye)
+        """
+        self.counts[bisect.bisect_right(HISTOGRAM_EDGES, duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+    def percentile(self, percent):
+        """
+        Yüzdelik değeri histogramdan tahmin eder (ilgili kutunun üst sınırı)
+
+        Args:
+            percent (float): Yüzdelik (0-100 arası)
+
+        Returns:
+            float: Süre (saniye), ölçüm yoksa 0
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = self.count * percent / 100
+        cumulative = 0
+        for index, bin_count in enumerate(self.counts):
+            cumulative += bin_count
+            if cumulative >= target and bin_count > 0:
+                if index >= len(HISTOGRAM_EDGES):
+                    return self.maximum
+                return min(HISTOGRAM_EDGES[index], self.maximum)
+        return self.maximum
+
+
+class StageProfiler:
+    def __init__(self, clock=time.perf_counter):
+        """
+        Döngü aşamaları için düşük maliyetli süre ölçümü. Her aşama bir önceki
+        işaretten bu yana geçen süreyi kendi histogramına kaydeder.
+
+        Kullanım:
+            profiler.begin_iteration()
+            ... profiler.lap("capture") ...
+            ... profiler.lap("motor") ...
+            profiler.end_iteration()
+
+        Ölçüm kapalıyken kod profiler yerine None tutar; böylece her aşamadaki
+        maliyet tek bir koşul kontrolüdür.
+
+        Args:
+            clock (callable): Zaman kaynağı (saniye, testlerde değiştirilebilir)
+        """
+        self.clock = clock
+        self.stages = {}
+        self.loop = StageHistogram()
+        self._last_mark = clock()
+        self._iteration_start = None
+        self._first_iteration_start = None
+        self._last_iteration_end = None
+
+    def mark(self):
+        """Aşama ölçümünün başlangıç zamanını şimdiye ayarlar (süre kaydetmez)"""
+        self._last_mark = self.clock()
+
+    def lap(self, stage):
+        """
+        Bir önceki işaretten bu yana geçen süreyi aşamaya kaydeder
+
+        Args:
+            stage (str): Aşama adı
+        """
+        now = self.clock()
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = StageHistogram()
+        histogram.add(now - self._last_mark)
+        self._last_mark = now
+
+    def begin_iteration(self):
+        """Döngü adımının başladığını işaretler"""
+        now = self.clock()
+        self._iteration_start = now
+        self._last_mark = now
+        if self._first_iteration_start is None:
+            self._first_iteration_start = now
+
+    def end_iteration(self):
+        """Döngü adımının bittiğini işaretler ve toplam adım süresini kaydeder"""
+        now = self.clock()
+        if self._iteration_start is not None:
+            self.loop.add(now - self._iteration_start)
+        self._last_iteration_end = now
+
+    def get_loop_rate(self):
+        """
+        Ortalama döngü hızını döndürür
+
+        Returns:
+            float: Saniyedeki döngü adımı sayısı (Hz)
+        """
+        if self.loop.count == 0 or self._last_iteration_end is None:
+            return 0.0
+        elapsed = self._last_iteration_end - self._first_iteration_start
+        return self.loop.count / elapsed if elapsed > 0 else 0.0
+
+    def get_stats(self):
+        """
+        Aşama istatistiklerini döndürür (çalışma sırasında sorgulanabilir)
+
+        Returns:
+            dict: Aşama adı -> {count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}
+        """
+        stats = {}
+        for stage, histogram in list(self.stages.items()) + [("loop", self.loop)]:
+            if histogram.count == 0:
+                continue
+            stats[stage] = {
+                "count": histogram.count,
+                "mean_ms": histogram.total / histogram.count * 1000,
+                "p50_ms": histogram.percentile(50) * 1000,
+                "p90_ms": histogram.percentile(90) * 1000,
+                "p99_ms": histogram.percentile(99) * 1000,
+                "max_ms": histogram.maximum * 1000
+            }
+        return stats
+
+    def summary(self):
+        """
+        Aşama istatistiklerinin okunabilir özetini döndürür
+
+        Returns:
+            str: Özet tablo
+        """
+        lines = [f"{'Aşama':<18} {'Sayı':>8} {'Ort (ms)':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'Maks':>8}"]
+        for stage, s in self.get_stats().items():
+            lines.append(f"{stage:<18} {s['count']:>8} {s['mean_ms']:>9.3f} {s['p50_ms']:>8.3f} "
+                         f"{s['p90_ms']:>8.3f} {s['p99_ms']:>8.3f} {s['max_ms']:>8.3f}")
+        lines.append(f"Döngü hızı: {self.get_loop_rate():.1f} Hz")
+        return "\n".join(lines)
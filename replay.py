@@ -0,0 +1,153 @@
+import json
+import os
+import time
+import cv2
+from motor_control import MotorCommands
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov", ".h264")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class ReplayCamera:
+    def __init__(self, path, rate=None):
+        """
+        Kayıtlı video dosyasından veya görüntü klasöründen kare veren sahte kamera.
+        cv2.VideoCapture ile aynı arayüzü sağlar; detector.camera yerine kullanılır.
+        Kareler atlanmadan sırayla verilir, böylece her oynatma aynı sonucu üretir.
+
+        Args:
+            path (str): Video dosyası veya görüntü dosyaları içeren klasör
+            rate (float, optional): Oynatma hızı (kare/saniye). None veya 0: bekleme yapılmaz,
+                                    kareler işlemcinin yetişebildiği hızda verilir.
+        """
+        self.path = path
+        self.period = 1.0 / rate if rate else None
+        self.frame_index = -1  # En son verilen karenin sırası (henüz yoksa -1)
+        self._next_time = None
+
+        if os.path.isdir(path):
+            self.capture = None
+            self.files = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                          if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS]
+        else:
+            self.capture = cv2.VideoCapture(path)
+            self.files = None
+
+    def isOpened(self):
+        if self.files is not None:
+            return len(self.files) > 0
+        return self.capture.isOpened()
+
+    def set(self, prop, value):
+        # Kayıttan okurken kamera ayarlarının etkisi yoktur
+        return False
+
+    def read(self):
+        """
+        Sıradaki kareyi döndürür. Sabit hızda oynatılıyorsa karenin zamanı gelene kadar bekler.
+
+        Returns:
+            bool: Kare okunduysa True (kayıt bittiyse False)
+            np.array: BGR görüntü
+        """
+        if self.files is not None:
+            frame = None
+            while frame is None and self.frame_index + 1 < len(self.files):
+                self.frame_index += 1
+                frame = cv2.imread(self.files[self.frame_index])
+            if frame is None:
+                return False, None
+        else:
+            ret, frame = self.capture.read()
+            if not ret:
+                return False, None
+            self.frame_index += 1
+
+        if self.period is not None:
+            now = time.monotonic()
+            if self._next_time is None:
+                self._next_time = now
+            elif self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time += self.period
+        return True, frame
+
+    def release(self):
+        if self.capture is not None:
+            self.capture.release()
+
+
+class ReplayRecorder(MotorCommands):
+    def __init__(self, camera, motor, tracer=None):
+        """
+        Oynatma sırasında motor komutlarını, onlara yol açan karenin sırasıyla kaydeder.
+        Kontrol döngüsüne motor yerine verilir: her set_motors komutu (değişmeyip
+        pinlere yazılmayanlar dahil) kaydedilip motora iletilir. Ayrıca motorun
+        izleyicisi olarak bağlanır ve pinlere gerçekten yapılan yazımları da kaydeder.
+
+        Args:
+            camera (ReplayCamera): Kare sırasının okunacağı oynatma kamerası
+            motor (MotorController): Komutların iletileceği motor kontrolcüsü
+            tracer (latency_trace.LatencyTracer, optional): Yazımların ayrıca iletileceği gecikme izleyicisi
+        """
+        self.camera = camera
+        self.motor = motor
+        self.tracer = tracer
+        self.commands = []
+        self.writes = []
+        motor.set_tracer(self)
+
+    def set_motors(self, left_speed, right_speed, cause=None):
+        """
+        Komutu kaydeder ve motora iletir
+
+        Args:
+            left_speed (float): Sol motor hızı ve yönü (-1.0 ile 1.0 arasında)
+            right_speed (float): Sağ motor hızı ve yönü (-1.0 ile 1.0 arasında)
+            cause (latency_trace.TraceContext, optional): Komuta neden olan görüntünün izi
+        """
+        self.commands.append((self.camera.frame_index, left_speed, right_speed))
+        self.motor.set_motors(left_speed, right_speed, cause)
+
+    def record_actuation(self, side, speed, cause, timestamp=None):
+        """
+        Bir motor yazımını kaydeder (MotorController tarafından çağrılır)
+
+        Args:
+            side (str): "left" veya "right"
+            speed (float): Yazılan hız
+            cause (latency_trace.TraceContext): Yazıma neden olan görüntünün izi
+            timestamp (float, optional): Yazım zamanı
+        """
+        self.writes.append((self.camera.frame_index, side, speed))
+        if self.tracer is not None:
+            self.tracer.record_actuation(side, speed, cause, timestamp)
+
+    def get_commands(self):
+        """
+        Kaydedilen motor komutlarını döndürür
+
+        Returns:
+            list: (kare sırası, sol hız, sağ hız) kayıtları. Kare okunmadan önceki komutlarda kare sırası -1'dir.
+        """
+        return list(self.commands)
+
+    def get_writes(self):
+        """
+        Pinlere yapılan motor yazımlarını döndürür (değişmeyen komutlar yazılmaz)
+
+        Returns:
+            list: (kare sırası, taraf, hız) kayıtları
+        """
+        return list(self.writes)
+
+    def save(self, path):
+        """
+        Komutları her satırda bir JSON nesnesi olacak şekilde dosyaya yazar
+
+        Args:
+            path (str): Çıktı dosyası
+        """
+        with open(path, "w") as f:
+            for frame_index, left_speed, right_speed in self.commands:
+                f.write(json.dumps({"frame": frame_index, "left": left_speed, "right": right_speed}) + "\n")
@@ -0,0 +1,85 @@
+import tracemalloc
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+WARMUP_FRAMES = 5
+MEASURED_FRAMES = 300
+
+# Geçici Python nesneleri (sonuç sözlüğü vb.) için izin verilen üst sınır.
+# Tek bir ROI tamponu (320x144 maske = 46 KB) bu sınırın üzerindedir; karelerde
+# biriken küçük ayırmalar da 300 kare boyunca bu sınırı aşar.
+MAX_PEAK_BYTES = 16384
+
+
+def measure_peak_allocation(detector, frames):
+    """
+    Isınmadan sonra kare işleme sırasında ayrılan en yüksek bellek miktarını ölçer
+
+    Args:
+        detector (TrafficLightDetector): Test edilecek detektör
+        frames (list): İşlenecek görüntüler
+
+    Returns:
+        int: Ölçüm başlangıcına göre en yüksek ek bellek (bayt)
+    """
+    for i in range(WARMUP_FRAMES):
+        detector.detect_green_light(frames[i % len(frames)])
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for i in range(MEASURED_FRAMES):
+            detector.detect_green_light(frames[i % len(frames)])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak - baseline
+
+
+def make_frames():
+    """Yeşil ve kırmızı lambalı test görüntüleri oluşturur"""
+    return [make_synthetic_frame(640, 480, green=True, seed=1),
+            make_synthetic_frame(640, 480, green=False, seed=2)]
+
+
+def test_hsv_pipeline_does_not_allocate():
+    detector = TrafficLightDetector()
+    assert measure_peak_allocation(detector, make_frames()) < MAX_PEAK_BYTES
+
+
+def test_lut_pipeline_does_not_allocate():
+    detector = TrafficLightDetector()
+    detector.set_color_classifier("lut")
+    assert measure_peak_allocation(detector, make_frames()) < MAX_PEAK_BYTES
+
+
+def test_buffer_reuse_matches_reference():
+    frames = make_frames()
+    reference = TrafficLightDetector()
+    reference.set_buffer_reuse(False)
+    detector = TrafficLightDetector()
+
+    for frame in frames * 3:
+        assert detector.detect_green_light(frame) == reference.detect_green_light(frame)
+
+
+def main():
+    """Kare başına bellek ayırma ölçümünü yazdırır"""
+    frames = make_frames()
+    for reuse in (False, True):
+        detector = TrafficLightDetector()
+        detector.set_buffer_reuse(reuse)
+        peak = measure_peak_allocation(detector, frames)
+        print(f"Tampon yeniden kullanımı={reuse}: en yüksek ek bellek {peak} bayt")
+
+
+if __name__ == "__main__":
+    main()
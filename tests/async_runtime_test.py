@@ -0,0 +1,91 @@
+import asyncio
+import time
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from async_runtime import LatestValueChannel, PeriodicTask
+from main import run_async_mode
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+
+class StallingCamera:
+    """Belirli sayıda yeşil ışıklı görüntüden sonra görüntü vermeyen sahte kamera"""
+
+    def __init__(self, frame_count):
+        self.frame = make_synthetic_frame(640, 480, green=True)
+        self.remaining = frame_count
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.remaining <= 0:
+            time.sleep(0.05)
+            return False, None
+        self.remaining -= 1
+        time.sleep(0.01)
+        return True, self.frame
+
+    def release(self):
+        pass
+
+
+class RecordingMotor:
+    """Motor komutlarını kaydeden sahte motor kontrolcüsü"""
+
+    def __init__(self):
+        self.commands = []
+
+    def forward(self, speed=1.0, cause=None):
+        self.commands.append(("forward", speed))
+
+    def stop(self, cause=None):
+        self.commands.append(("stop", 0.0))
+
+
+def test_periodic_task_counts_deadline_misses():
+    async def slow_step():
+        await asyncio.sleep(0.015)
+
+    async def run():
+        task = PeriodicTask("slow", slow_step, period=0.01, deadline=0.005)
+        runner = asyncio.create_task(task.run())
+        await asyncio.sleep(0.2)
+        runner.cancel()
+        return task
+
+    task = asyncio.run(run())
+    stats = task.get_stats()
+    assert stats["runs"] > 0
+    assert stats["deadline_misses"] == stats["runs"]
+    assert stats["skipped_periods"] > 0
+
+
+def test_channel_keeps_only_latest_value():
+    async def run():
+        channel = LatestValueChannel("test")
+        channel.publish(1)
+        channel.publish(2)
+        return await asyncio.wait_for(channel.wait_newer(0), timeout=1)
+
+    value, version, _ = asyncio.run(run())
+    assert value == 2 and version == 2
+
+
+def test_stale_perception_stops_the_car():
+    detector = TrafficLightDetector()
+    detector.camera = StallingCamera(frame_count=20)
+    motor = RecordingMotor()
+
+    stats = run_async_mode(detector, motor, duration=1.5, max_result_age=0.3)
+
+    # Yeşil ışıkta hareket edilir, kamera durunca araç durdurulur
+    assert ("forward", 0.5) in motor.commands
+    first_forward = motor.commands.index(("forward", 0.5))
+    assert ("stop", 0.0) in motor.commands[first_forward:]
+    assert stats["stale_stops"] == 1
+    assert stats["perception"]["runs"] > 0
@@ -0,0 +1,78 @@
+import tempfile
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_labelled_frames
+
+
+def make_stack():
+    """ROI kenarlarına dokunan yeşil bölgeler de içeren görüntü yığını oluşturur"""
+    stack = np.stack([frame for frame, _ in make_labelled_frames(640, 480, 40, seed=4)])
+
+    # ROI'nin alt ve üst kenarlarında yeşil şeritler (dolgu satırlarının etkisini sınar)
+    stack[1, 138:150, :] = (0, 255, 0)
+    stack[2, 0:3, :] = (0, 255, 0)
+    return stack
+
+
+def assert_matches_single_frame_api(detector, stack, chunk_size):
+    batch = detector.detect_green_light_batch(stack, chunk_size=chunk_size)
+    for index, frame in enumerate(stack):
+        is_green, info = detector.detect_green_light(frame)
+        assert batch["green_pixel_count"][index] == info["green_pixel_count"]
+        assert batch["green_ratio"][index] == info["green_ratio"]
+        assert batch["is_green"][index] == is_green
+
+
+def test_batch_matches_single_frame_api():
+    stack = make_stack()
+    for chunk_size in (1, 7, 16):
+        assert_matches_single_frame_api(TrafficLightDetector(), stack, chunk_size)
+
+
+def test_batch_matches_with_lut_classifier():
+    detector = TrafficLightDetector()
+    detector.set_color_classifier("lut")
+    assert_matches_single_frame_api(detector, make_stack(), 8)
+
+
+def test_batch_falls_back_for_scaled_detection():
+    detector = TrafficLightDetector()
+    detector.set_detection_scale(0.5)
+    assert_matches_single_frame_api(detector, make_stack(), 8)
+
+
+def test_batch_fallback_keeps_live_detection_state():
+    stack = make_stack()
+    detector = TrafficLightDetector()
+    detector.set_detection_scale(0.5)
+    detector.set_tracking(True, max_misses=3)
+    detector.track_window = (200, 10, 300, 110)
+    detector.track_misses = 2
+    detector.frames_processed = 5
+
+    # Tek tek işlenen yolda canlı takip ve sayaçlar değişmez
+    detector.detect_green_light_batch(stack, chunk_size=8)
+    assert detector.track_window == (200, 10, 300, 110)
+    assert detector.track_misses == 2
+    assert detector.get_processing_stats()["frames_processed"] == 5
+
+
+def test_batch_accepts_memory_mapped_stack():
+    stack = make_stack()
+    detector = TrafficLightDetector()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "frames.npy")
+        np.save(path, stack)
+        mapped = np.load(path, mmap_mode="r")
+        batch = detector.detect_green_light_batch(mapped)
+        del mapped
+
+    expected = detector.detect_green_light_batch(stack)
+    assert np.array_equal(batch["green_pixel_count"], expected["green_pixel_count"])
@@ -0,0 +1,118 @@
+import cv2
+import numpy as np
+import argparse
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from crossing_detection import CrossingDetector
+from lane_detection import LaneDetector
+from tests.benchmark_traffic_light import FRAME_SIZES, time_function
+from tests.evaluate_traffic_light import read_frames
+
+
+def make_synthetic_crossing_frame(width, height, kind="crosswalk", position=0.3, seed=0):
+    """
+    Test için şeritli yolda yaya geçidi veya dur çizgisi içeren sentetik bir görüntü
+    oluşturur: işaretler kuş bakışı görünümde çizilir ve şerit tespitinin
+    perspektifiyle kamera görünümüne geri çevrilir.
+
+    Args:
+        width (int): Görüntü genişliği
+        height (int): Görüntü yüksekliği
+        kind (str): "crosswalk", "stop_line" veya None (yalnızca şerit çizgileri)
+        position (float): İşaretin araca yakın kenarının kuş bakışı görüntüdeki
+                          yüksekliği (0: alt kenar, 1: üst kenar)
+        seed (int): Gürültü için rastgele sayı tohumu
+
+    Returns:
+        np.array: BGR görüntü
+    """
+    lane = LaneDetector()
+    warp_width, warp_height = lane.warp_width, lane.warp_height
+    lane_pixels = int(lane.lane_fraction * warp_width)
+    left = (warp_width - lane_pixels) // 2
+    right = left + lane_pixels
+    meters_y = lane.view_length / warp_height
+
+    bird = np.zeros((warp_height, warp_width), np.uint8)
+    thickness = max(2, warp_width // 60)
+    for x in (left, right):
+        cv2.line(bird, (x, 0), (x, warp_height - 1), 255, thickness)
+
+    near = int(round((1 - position) * (warp_height - 1)))
+    if kind == "crosswalk":
+        # Yol yönünde 0.3 m uzunluğunda, şerit genişliğinin onda biri aralıklı şeritler
+        far = near - int(0.3 / meters_y)
+        period = lane_pixels // 10
+        for x in range(left + period // 4, right - period // 2, period):
+            cv2.rectangle(bird, (x, far), (x + period // 2 - 1, near), 255, -1)
+    elif kind == "stop_line":
+        # Şerit boyunca 0.05 m kalınlığında çizgi
+        cv2.rectangle(bird, (left, near - int(0.05 / meters_y)), (right, near), 255, -1)
+
+    # Kuş bakışından kamera görünümüne
+    inverse = np.linalg.inv(lane.get_warp_matrix((height, width)))
+    marks = cv2.warpPerspective(bird, inverse, (width, height), flags=cv2.INTER_LINEAR)
+
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(20, 70, (height, width, 3), dtype=np.uint8)
+    frame[marks > 127] = (235, 235, 235)
+    return frame
+
+
+def benchmark_crossing_detection(iterations, frames_by_size):
+    """Band eşikleme ve izdüşümlerinin kare başına süresini ölçer"""
+    print(f"{'Çözünürlük':>12} {'Band':>10} {'Süre (ms)':>10} {'Kare/s':>8} {'Bulunan':>8}")
+    for (width, height), frames in frames_by_size.items():
+        detector = CrossingDetector()
+        x1, y1, x2, y2 = detector.get_band((height, width))
+        frame_index = [0]
+        found = [0, 0]
+
+        def detect():
+            is_found, _ = detector.detect_crossing(frames[frame_index[0] % len(frames)])
+            frame_index[0] += 1
+            found[0] += is_found
+            found[1] += 1
+
+        elapsed_ms = time_function(detect, iterations)
+        print(f"{width:>5}x{height:<6} {f'{x2 - x1}x{y2 - y1}':>10} {elapsed_ms:>10.3f} "
+              f"{1000 / elapsed_ms:>8.1f} {found[0] / found[1]:>8.3f}")
+
+
+def main():
+    """
+    Yaya geçidi ve dur çizgisi tespiti için performans ölçüm aracı. Kayıtlı pist
+    görüntüleriyle (video dosyası veya görüntü klasörü) veya sentetik görüntülerle çalışır.
+    """
+    parser = argparse.ArgumentParser(description="Geçit Tespiti Performans Testi")
+    parser.add_argument("--iterations", type=int, default=500, help="Her ölçüm için tekrar sayısı")
+    parser.add_argument("--video", help="Kayıtlı pist görüntüleri (video dosyası veya görüntü klasörü)")
+    args = parser.parse_args()
+
+    if args.video:
+        frames = list(read_frames(args.video))
+        if not frames:
+            print(f"Görüntü okunamadı: {args.video}")
+            return
+        height, width = frames[0].shape[:2]
+        frames_by_size = {(width, height): frames}
+    else:
+        # Yaklaşan yaya geçidi ve dur çizgisi, arada işaretsiz yol
+        frames_by_size = {}
+        for width, height in FRAME_SIZES:
+            frames_by_size[(width, height)] = [
+                make_synthetic_crossing_frame(width, height, kind, position, seed=i)
+                for i, (kind, position) in enumerate(
+                    [("crosswalk", p) for p in np.linspace(0.6, 0.0, 10)] + [(None, 0.0)] * 10 +
+                    [("stop_line", p) for p in np.linspace(0.6, 0.0, 10)])
+            ]
+
+    benchmark_crossing_detection(args.iterations, frames_by_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import time
+import cv2
+import numpy as np
+import argparse
+import sys
+import os
+import tempfile
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lane_detection import LaneDetector
+from camera_geometry import BirdseyeRemap
+from tests.benchmark_traffic_light import FRAME_SIZES, time_function
+from tests.evaluate_traffic_light import read_frames
+
+
+def make_synthetic_lane_frame(width, height, center_offset=0.0, curvature=0.0, seed=0, detector=None):
+    """
+    Test için sentetik bir yol görüntüsü oluşturur: çizgiler kuş bakışı görünümde
+    çizilir ve detektörün perspektifiyle kamera görünümüne geri çevrilir.
+
+    Args:
+        width (int): Görüntü genişliği
+        height (int): Görüntü yüksekliği
+        center_offset (float): Aracın şerit ortasına göre kayması (metre, sağa pozitif)
+        curvature (float): Şerit eğriliği (1/metre, sola pozitif)
+        seed (int): Gürültü için rastgele sayı tohumu
+        detector (LaneDetector, optional): Perspektifi ve ölçüleri kullanılacak detektör
+
+    Returns:
+        np.array: BGR görüntü
+    """
+    detector = detector or LaneDetector()
+    warp_width, warp_height = detector.warp_width, detector.warp_height
+    lane_pixels = detector.lane_fraction * warp_width
+    meters_x = detector.lane_width / lane_pixels
+    meters_y = detector.view_length / warp_height
+
+    # Şerit ortası: alt kenarda araca göre kaydırılmış, yukarı doğru eğrilikle bükülen parabol
+    y = np.arange(warp_height, dtype=np.float64)
+    distance = (warp_height - 1 - y) * meters_y
+    center = warp_width / 2 - center_offset / meters_x - curvature / 2 * distance ** 2 / meters_x
+
+    bird = np.zeros((warp_height, warp_width), np.uint8)
+    thickness = max(2, warp_width // 60)
+    for side in (-0.5, 0.5):
+        points = np.stack([center + side * lane_pixels, y], axis=1).astype(np.int32)
+        cv2.polylines(bird, [points], False, 255, thickness)
+
+    # Kuş bakışından kamera görünümüne
+    inverse = np.linalg.inv(detector.get_warp_matrix((height, width)))
+    lines = cv2.warpPerspective(bird, inverse, (width, height), flags=cv2.INTER_LINEAR)
+
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(20, 70, (height, width, 3), dtype=np.uint8)
+    frame[lines > 127] = (235, 235, 235)
+    return frame
+
+
+def example_calibration(width, height):
+    """Ölçüm için geniş açılı bir kameraya benzeyen (fıçı distorsiyonlu) örnek kalibrasyon"""
+    focal = 0.8 * width
+    return {
+        "camera_matrix": np.array([[focal, 0, width / 2], [0, focal, height / 2], [0, 0, 1]]),
+        "dist_coeffs": np.array([-0.3, 0.1, 0.0, 0.0, 0.0]),
+        "image_size": (width, height)
+    }
+
+
+def benchmark_geometry(iterations, frames_by_size):
+    """Ayrı undistort + warpPerspective ile birleşik remap haritasının süresini ölçer"""
+    print(f"{'Çözünürlük':>12} {'Ayrı (ms)':>10} {'Remap (ms)':>11} {'Kur (ms)':>9} {'Yükle (ms)':>11}")
+    for (width, height), frames in frames_by_size.items():
+        detector = LaneDetector()
+        calibration = example_calibration(width, height)
+        matrix = detector.get_warp_matrix((height, width))
+        output_size = (detector.warp_width, detector.warp_height)
+        frame = frames[0]
+
+        def separate():
+            undistorted = cv2.undistort(frame, calibration["camera_matrix"], calibration["dist_coeffs"])
+            cv2.warpPerspective(undistorted, matrix, output_size, flags=cv2.INTER_LINEAR)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            start_time = time.perf_counter()
+            remap = BirdseyeRemap((width, height), output_size, matrix, calibration, cache_dir)
+            build_ms = (time.perf_counter() - start_time) * 1000
+            start_time = time.perf_counter()
+            remap = BirdseyeRemap((width, height), output_size, matrix, calibration, cache_dir)
+            load_ms = (time.perf_counter() - start_time) * 1000
+
+            separate_ms = time_function(separate, iterations)
+            remap_ms = time_function(lambda: remap.remap(frame), iterations)
+        print(f"{width:>5}x{height:<6} {separate_ms:>10.3f} {remap_ms:>11.3f} {build_ms:>9.1f} {load_ms:>11.2f}")
+
+
+def benchmark_lane_detection(iterations, frames_by_size):
+    """Kayan pencere ve önceki eğri aramasının kare başına süresini ölçer"""
+    print(f"{'Çözünürlük':>12} {'Arama':>8} {'Süre (ms)':>10} {'Kare/s':>8} {'Bulunan':>8}")
+    for (width, height), frames in frames_by_size.items():
+        for search in ("window", "previous"):
+            detector = LaneDetector()
+            frame_index = [0]
+            found = [0, 0]
+
+            def detect():
+                if search == "window":
+                    detector.reset()
+                is_found, _ = detector.detect_lane(frames[frame_index[0] % len(frames)])
+                frame_index[0] += 1
+                found[0] += is_found
+                found[1] += 1
+
+            elapsed_ms = time_function(detect, iterations)
+            print(f"{width:>5}x{height:<6} {search:>8} {elapsed_ms:>10.3f} {1000 / elapsed_ms:>8.1f} "
+                  f"{found[0] / found[1]:>8.3f}")
+
+
+def main():
+    """
+    Şerit tespiti için performans ölçüm aracı. Kayıtlı pist görüntüleriyle (video
+    dosyası veya görüntü klasörü) veya sentetik görüntülerle çalışır.
+    """
+    parser = argparse.ArgumentParser(description="Şerit Tespiti Performans Testi")
+    parser.add_argument("--iterations", type=int, default=200, help="Her ölçüm için tekrar sayısı")
+    parser.add_argument("--video", help="Kayıtlı pist görüntüleri (video dosyası veya görüntü klasörü)")
+    args = parser.parse_args()
+
+    if args.video:
+        frames = list(read_frames(args.video))
+        if not frames:
+            print(f"Görüntü okunamadı: {args.video}")
+            return
+        height, width = frames[0].shape[:2]
+        frames_by_size = {(width, height): frames}
+    else:
+        # Eğrilikleri ve kaymaları değişen sentetik bir tur
+        frames_by_size = {}
+        for width, height in FRAME_SIZES:
+            frames_by_size[(width, height)] = [
+                make_synthetic_lane_frame(width, height, center_offset=0.05 * np.sin(i / 5),
+                                          curvature=0.3 * np.sin(i / 9), seed=i)
+                for i in range(30)
+            ]
+
+    print("Kuş bakışı dönüşüm (distorsiyon giderme + perspektif):")
+    benchmark_geometry(args.iterations, frames_by_size)
+    print()
+    print("Şerit tespiti:")
+    benchmark_lane_detection(args.iterations, frames_by_size)
+
+
+if __name__ == "__main__":
+    main()
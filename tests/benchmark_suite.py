@@ -0,0 +1,229 @@
+import time
+import json
+import platform
+import cv2
+import numpy as np
+import argparse
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from motor_control import create_mock_motor_controller
+from profiling import StageProfiler
+from color_segmentation import ColorSegmenter, DEFAULT_COLOR_CLASSES
+from tests.benchmark_traffic_light import FRAME_SIZES, make_synthetic_frame
+
+# ROI boyutları: (x, y, genişlik, yükseklik)
+ROI_SIZES = {
+    "small": (0.375, 0.0, 0.25, 0.15),
+    "default": (0.25, 0.0, 0.5, 0.3),
+    "large": (0.0, 0.0, 1.0, 0.5)
+}
+
+
+def measure(function, iterations):
+    """
+    Bir fonksiyonu tekrar tekrar çalıştırıp süre dağılımını ölçer
+
+    Args:
+        function (callable): Ölçülecek fonksiyon
+        iterations (int): Tekrar sayısı
+
+    Returns:
+        dict: Ortalama, medyan ve 90. yüzdelik süre (milisaniye)
+    """
+    function()  # Isınma
+    durations = np.empty(iterations)
+    for i in range(iterations):
+        start_time = time.perf_counter()
+        function()
+        durations[i] = time.perf_counter() - start_time
+    durations *= 1000
+    return {
+        "mean_ms": float(durations.mean()),
+        "p50_ms": float(np.percentile(durations, 50)),
+        "p90_ms": float(np.percentile(durations, 90))
+    }
+
+
+def benchmark_detection(iterations, results):
+    """detect_green_light süresini çözünürlük, ROI boyutu ve debug moduna göre ölçer"""
+    for width, height in FRAME_SIZES:
+        frame = make_synthetic_frame(width, height)
+        for roi_name, roi in ROI_SIZES.items():
+            for debug in (False, True):
+                detector = TrafficLightDetector(debug=debug)
+                detector.set_roi(*roi)
+                detector.set_debug_stream(port=0)  # Boş bir port seçilir
+                name = f"detect/{width}x{height}/roi_{roi_name}/debug_{'on' if debug else 'off'}"
+                results[name] = measure(lambda: detector.detect_green_light(frame), iterations)
+                detector.stop_camera()
+
+    # Aşama süre ölçümünün ek maliyeti (varsayılan ROI)
+    for width, height in FRAME_SIZES:
+        frame = make_synthetic_frame(width, height)
+        detector = TrafficLightDetector()
+        detector.set_profiler(StageProfiler())
+        results[f"detect/{width}x{height}/roi_default/profiler_on"] = measure(
+            lambda: detector.detect_green_light(frame), iterations)
+
+
+def benchmark_stages(iterations, results):
+    """İşlem zincirinin her aşamasını ayrı ayrı ölçer (varsayılan ROI)"""
+    detector = TrafficLightDetector()
+    kernel = np.ones((5, 5), np.uint8)
+
+    for width, height in FRAME_SIZES:
+        frame = make_synthetic_frame(width, height)
+        roi_x1, roi_y1, roi_x2, roi_y2 = detector._get_roi_geometry(frame.shape)
+        roi = frame[roi_y1:roi_y2, roi_x1:roi_x2]
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, detector.lower_green, detector.upper_green)
+        eroded = cv2.erode(mask, kernel, iterations=1)
+        dilated = cv2.dilate(eroded, kernel, iterations=2)
+
+        prefix = f"stage/{width}x{height}"
+        results[f"{prefix}/roi_geometry"] = measure(lambda: detector._get_roi_geometry(frame.shape), iterations)
+        results[f"{prefix}/roi_slice"] = measure(lambda: frame[roi_y1:roi_y2, roi_x1:roi_x2], iterations)
+        results[f"{prefix}/cvt_color"] = measure(lambda: cv2.cvtColor(roi, cv2.COLOR_BGR2HSV), iterations)
+        results[f"{prefix}/in_range"] = measure(
+            lambda: cv2.inRange(hsv, detector.lower_green, detector.upper_green), iterations)
+        results[f"{prefix}/erode"] = measure(lambda: cv2.erode(mask, kernel, iterations=1), iterations)
+        results[f"{prefix}/dilate"] = measure(lambda: cv2.dilate(eroded, kernel, iterations=2), iterations)
+        results[f"{prefix}/count_nonzero"] = measure(lambda: cv2.countNonZero(dilated), iterations)
+
+
+def benchmark_segmentation(iterations, results):
+    """Tüm renk sınıflarının ayrı geçişlerle ve paylaşılan tek bölütlemeyle maliyetini ölçer"""
+    for width, height in FRAME_SIZES:
+        frame = make_synthetic_frame(width, height)
+
+        # Her algılayıcının kendi cvtColor + inRange geçişi
+        def separate_passes():
+            for _, ranges in DEFAULT_COLOR_CLASSES:
+                hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+                for lower, upper in ranges:
+                    cv2.inRange(hsv, np.array(lower), np.array(upper))
+
+        prefix = f"segment/{width}x{height}"
+        results[f"{prefix}/separate_passes"] = measure(separate_passes, iterations)
+        for classifier in ("hsv", "lut"):
+            segmenter = ColorSegmenter(classifier=classifier)
+            results[f"{prefix}/shared_{classifier}"] = measure(lambda: segmenter.segment(frame), iterations)
+
+        # Yalnızca trafik ışığı ROI'si (yeşil ışık beklenirken main.py böyle bölütler)
+        roi_box = TrafficLightDetector().get_roi_box(frame.shape)
+        segmenter = ColorSegmenter(classifier="lut")
+        results[f"{prefix}/shared_lut_roi"] = measure(lambda: segmenter.segment(frame, roi_box), iterations)
+
+
+def benchmark_motor(iterations, results):
+    """MotorController.set_motors çağrı süresini sahte pinlerle ölçer"""
+    motor = create_mock_motor_controller()
+    try:
+        speeds = [(0.5, 0.5), (0.3, 0.6), (-0.4, 0.4), (0.0, 0.0)]
+        index = [0]
+
+        def changing():
+            motor.set_motors(*speeds[index[0] % len(speeds)])
+            index[0] += 1
+
+        results["motor/set_motors/changing"] = measure(changing, iterations)
+        results["motor/set_motors/repeated"] = measure(lambda: motor.set_motors(0.5, 0.5), iterations)
+
+        # Ulaşılabilecek en yüksek komut hızı
+        for name in ("motor/set_motors/changing", "motor/set_motors/repeated"):
+            results[name]["calls_per_second"] = 1000 / results[name]["mean_ms"]
+    finally:
+        motor.cleanup()
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Sonuçları temel ölçümle karşılaştırır ve gerilemeleri yazdırır
+
+    Args:
+        results (dict): Güncel ölçümler
+        baseline (dict): Temel ölçümler
+        tolerance (float): İzin verilen göreli yavaşlama (0.2: %20)
+
+    Returns:
+        list: Gerileyen ölçüm adları
+    """
+    regressions = []
+    print(f"\n{'Ölçüm':<50} {'Temel (ms)':>11} {'Güncel (ms)':>12} {'Oran':>7}")
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        base_ms = baseline[name]["p50_ms"]
+        current_ms = current["p50_ms"]
+        ratio = current_ms / base_ms if base_ms > 0 else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  <-- GERİLEME"
+        print(f"{name:<50} {base_ms:>11.4f} {current_ms:>12.4f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    """
+    Algılama ve motor kontrolü sıcak yolları için tekrarlanabilir performans ölçüm takımı.
+    Kamera ve GPIO gerektirmez: sentetik görüntüler ve gpiozero'nun sahte pinleri kullanılır.
+    Sonuçlar JSON olarak kaydedilir ve önceki bir ölçümle karşılaştırılabilir.
+    """
+    parser = argparse.ArgumentParser(description="Performans Ölçüm Takımı")
+    parser.add_argument("--iterations", type=int, default=200, help="Her ölçüm için tekrar sayısı")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası (JSON)")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Gerileme sayılmadan önce izin verilen göreli yavaşlama")
+    parser.add_argument("--section", choices=["detect", "stages", "segment", "motor", "all"], default="all",
+                        help="Çalıştırılacak ölçüm bölümü")
+    args = parser.parse_args()
+
+    results = {}
+    if args.section in ("detect", "all"):
+        benchmark_detection(args.iterations, results)
+    if args.section in ("stages", "all"):
+        benchmark_stages(args.iterations, results)
+    if args.section in ("segment", "all"):
+        benchmark_segmentation(args.iterations, results)
+    if args.section in ("motor", "all"):
+        benchmark_motor(args.iterations, results)
+
+    for name, result in results.items():
+        print(f"{name:<50} ort={result['mean_ms']:.4f} ms  p50={result['p50_ms']:.4f} ms  "
+              f"p90={result['p90_ms']:.4f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "metadata": {
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "platform": platform.platform(),
+                    "machine": platform.machine(),
+                    "python": platform.python_version(),
+                    "opencv": cv2.__version__,
+                    "numpy": np.__version__,
+                    "iterations": args.iterations
+                },
+                "results": results
+            }, f, indent=2)
+        print(f"\nSonuçlar kaydedildi: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} ölçümde gerileme var!")
+            sys.exit(1)
+        print("\nGerileme yok.")
+
+
+if __name__ == "__main__":
+    main()
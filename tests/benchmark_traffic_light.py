@@ -0,0 +1,166 @@
+import time
+import cv2
+import numpy as np
+import argparse
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from color_lut import ColorLookupTable
+
+# Raspberry Pi Camera 3 ile kullanılan tipik çözünürlükler
+FRAME_SIZES = [(640, 480), (1280, 720), (1920, 1080)]
+
+
+def make_synthetic_frame(width, height, green=True, seed=0):
+    """
+    Test için sentetik bir görüntü oluşturur: gürültülü arka plan ve
+    ROI içinde yuvarlak bir trafik lambası.
+
+    Args:
+        width (int): Görüntü genişliği
+        height (int): Görüntü yüksekliği
+        green (bool): True ise yeşil, False ise kırmızı lamba çizilir
+        seed (int): Gürültü için rastgele sayı tohumu
+
+    Returns:
+        np.array: BGR görüntü
+    """
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 80, (height, width, 3), dtype=np.uint8)
+
+    center = (width // 2, int(height * 0.15))
+    radius = max(4, height // 12)
+    color = (40, 220, 40) if green else (40, 40, 220)
+    cv2.circle(frame, center, radius, color, -1)
+    return frame
+
+
+def make_labelled_frames(width, height, count, seed=0):
+    """
+    Farklı lamba boyutu, konumu ve durumuna sahip etiketli sentetik görüntüler oluşturur
+
+    Args:
+        width (int): Görüntü genişliği
+        height (int): Görüntü yüksekliği
+        count (int): Görüntü sayısı
+        seed (int): Rastgele sayı tohumu
+
+    Returns:
+        list: (görüntü, yeşil_mi) çiftleri
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(0, 80, (height, width, 3), dtype=np.uint8)
+        state = ("green", "red", "off")[i % 3]
+        radius = int(height * rng.uniform(0.03, 0.1))
+        center = (int(width * rng.uniform(0.35, 0.65)), int(height * rng.uniform(0.08, 0.22)))
+        color = {"green": (40, 220, 40), "red": (40, 40, 220), "off": (30, 30, 30)}[state]
+        cv2.circle(frame, center, radius, color, -1)
+        frames.append((frame, state == "green"))
+    return frames
+
+
+def time_function(function, iterations):
+    """
+    Bir fonksiyonun ortalama çalışma süresini ölçer
+
+    Args:
+        function (callable): Ölçülecek fonksiyon
+        iterations (int): Tekrar sayısı
+
+    Returns:
+        float: Ortalama süre (milisaniye)
+    """
+    function()  # Isınma
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start_time) / iterations * 1000
+
+
+def benchmark_color_classifier(iterations):
+    """cvtColor + inRange yolunu arama tablosu yoluyla karşılaştırır"""
+    detector = TrafficLightDetector()
+
+    start_time = time.perf_counter()
+    lut = ColorLookupTable(detector.lower_green, detector.upper_green)
+    build_ms = (time.perf_counter() - start_time) * 1000
+    print(f"Arama tablosu oluşturma süresi: {build_ms:.1f} ms")
+
+    print(f"{'Çözünürlük':>12} {'ROI':>10} {'HSV (ms)':>10} {'LUT (ms)':>10} {'Hızlanma':>9} {'Uyum':>8}")
+    for width, height in FRAME_SIZES:
+        frame = make_synthetic_frame(width, height)
+        roi = frame[0:int(height * 0.3), int(width * 0.25):int(width * 0.75)]
+
+        def hsv_path():
+            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+            return cv2.inRange(hsv, detector.lower_green, detector.upper_green)
+
+        def lut_path():
+            return lut.classify(roi)
+
+        hsv_ms = time_function(hsv_path, iterations)
+        lut_ms = time_function(lut_path, iterations)
+        agreement = np.mean(hsv_path() == lut_path())
+
+        print(f"{width:>5}x{height:<6} {roi.shape[1]:>4}x{roi.shape[0]:<5} "
+              f"{hsv_ms:>10.3f} {lut_ms:>10.3f} {hsv_ms / lut_ms:>8.2f}x {agreement:>8.4f}")
+
+
+def benchmark_detection_scale(iterations, scales=(1.0, 0.5, 0.25)):
+    """Farklı algılama ölçeklerinde gecikme ve doğruluğu ölçer"""
+    print(f"{'Çözünürlük':>12} {'Ölçek':>6} {'İyileştirme':>11} {'Süre (ms)':>10} "
+          f"{'Tam çöz. uyumu':>15} {'Etiket uyumu':>13}")
+    for width, height in FRAME_SIZES:
+        frames = make_labelled_frames(width, height, 60)
+
+        reference = TrafficLightDetector()
+        reference_decisions = [reference.detect_green_light(frame)[0] for frame, _ in frames]
+
+        for scale in scales:
+            for refine in ((False, True) if scale < 1.0 else (False,)):
+                detector = TrafficLightDetector()
+                detector.set_detection_scale(scale, refine=refine)
+
+                decisions = [detector.detect_green_light(frame)[0] for frame, _ in frames]
+                reference_agreement = np.mean([a == b for a, b in zip(decisions, reference_decisions)])
+                label_agreement = np.mean([a == label for a, (_, label) in zip(decisions, frames)])
+
+                frame_index = [0]
+
+                def detect():
+                    detector.detect_green_light(frames[frame_index[0] % len(frames)][0])
+                    frame_index[0] += 1
+
+                elapsed_ms = time_function(detect, iterations)
+                print(f"{width:>5}x{height:<6} {scale:>6.2f} {'evet' if refine else 'hayır':>11} "
+                      f"{elapsed_ms:>10.3f} {reference_agreement:>15.3f} {label_agreement:>13.3f}")
+
+
+def main():
+    """
+    Trafik ışığı algılama için performans ölçüm aracı.
+    Kamera gerektirmez, sentetik görüntüler kullanır.
+    """
+    parser = argparse.ArgumentParser(description="Trafik Işığı Algılama Performans Testi")
+    parser.add_argument("--iterations", type=int, default=200, help="Her ölçüm için tekrar sayısı")
+    parser.add_argument("--section", choices=["color", "scale", "all"], default="all",
+                        help="Çalıştırılacak ölçüm bölümü")
+    args = parser.parse_args()
+
+    if args.section in ("color", "all"):
+        print("Renk sınıflandırıcı karşılaştırması (cvtColor+inRange / arama tablosu)")
+        benchmark_color_classifier(args.iterations)
+
+    if args.section in ("scale", "all"):
+        print("\nAlgılama ölçeği karşılaştırması")
+        benchmark_detection_scale(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import time
+import json
 import cv2
 import numpy as np
 import argparse
@@ -7,10 +9,230 @@ import os
 # Ana dizini import path'e ekle
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from tests.evaluate_traffic_light import find_sequences, read_frames
+
+# Otomatik kalibrasyondaki HSV histogram kutu sayıları (H, S, V) ve değer aralıkları.
+# Görüntü başına kümülatif tablo (61 x 33 x 33) int32, yaklaşık 260 KB'dir.
+HISTOGRAM_BINS = (60, 32, 32)
+HSV_LIMITS = (180, 256, 256)
+
+# Ayrım puanının paydasına eklenen yeşil oran (ROI'nin %1'i)
+SCORE_SMOOTHING = 0.01
+
+# Varsayılan ROI (x, y, genişlik, yükseklik; görüntü boyutunun oranı olarak)
+DEFAULT_ROI = (0.25, 0.0, 0.5, 0.3)
+
 def nothing(x):
     """Trackbar callback fonksiyonu"""
     pass
 
+
+class HsvBoxCounter:
+    def __init__(self, bins=HISTOGRAM_BINS):
+        """
+        Etiketli ROI görüntülerinin 3B HSV histogramlarını kümülatif toplamlarla tutar.
+        Histogramlar bir kez oluşturulur; herhangi bir [H, S, V] kutusundaki piksel
+        sayısı her görüntü için 8 tablo okumasıyla (sabit sürede) bulunur, böylece
+        cvtColor ve inRange yeniden çalıştırılmadan binlerce aralık denenebilir.
+        
+        Args:
+            bins (tuple): H, S, V kutu sayıları (değer aralıklarını tam bölmeli)
+        """
+        self.bins = tuple(bins)
+        self.bin_width = tuple(limit // count for limit, count in zip(HSV_LIMITS, self.bins))
+        self.tables = []  # Görüntü başına (H+1, S+1, V+1) kümülatif tablo
+        self.pixels = []  # Görüntü başına ROI piksel sayısı
+        self.labels = []  # Görüntü başına yeşil ışık etiketi
+        self._cumulative = None
+    
+    def add_frame(self, roi, positive):
+        """
+        Bir ROI görüntüsünü ekler
+        
+        Args:
+            roi (np.array): BGR ROI görüntüsü
+            positive (bool): Yeşil ışık yanıyorsa True
+        """
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        histogram = cv2.calcHist([hsv], [0, 1, 2], None, list(self.bins), [0, 180, 0, 256, 0, 256])
+        
+        # Başa sıfır eklenmiş kümülatif toplam: table[h, s, v] = [0, h) x [0, s) x [0, v) kutularının toplamı
+        table = np.zeros([count + 1 for count in self.bins], np.int32)
+        table[1:, 1:, 1:] = histogram.astype(np.int32).cumsum(0).cumsum(1).cumsum(2)
+        self.tables.append(table)
+        self.pixels.append(roi.shape[0] * roi.shape[1])
+        self.labels.append(bool(positive))
+        self._cumulative = None
+    
+    def to_bins(self, lower_hsv, upper_hsv):
+        """HSV değer aralığını (sınırlar dahil) kapsayan kutu aralığına çevirir"""
+        lower = np.array(lower_hsv) // self.bin_width
+        upper = np.array(upper_hsv) // self.bin_width
+        return np.concatenate([lower, upper])
+    
+    def to_hsv(self, box):
+        """
+        Kutu aralığını HSV değer aralığına çevirir
+        
+        Args:
+            box (np.array): [h1, s1, v1, h2, s2, v2] kutu indeksleri (sınırlar dahil)
+            
+        Returns:
+            list: Alt HSV değerleri
+            list: Üst HSV değerleri
+        """
+        width = np.array(self.bin_width)
+        lower = np.array(box[:3]) * width
+        upper = (np.array(box[3:]) + 1) * width - 1
+        return lower.tolist(), upper.tolist()
+    
+    def counts(self, boxes):
+        """
+        Kutulardaki piksel sayılarını tüm görüntüler için sabit sürede hesaplar
+        
+        Args:
+            boxes (np.array): (K, 6) [h1, s1, v1, h2, s2, v2] kutu indeksleri (sınırlar dahil)
+            
+        Returns:
+            np.array: (görüntü sayısı, K) piksel sayıları
+        """
+        if self._cumulative is None:
+            self._cumulative = np.stack(self.tables)
+        table = self._cumulative
+        boxes = np.atleast_2d(boxes)
+        h1, s1, v1 = boxes[:, 0], boxes[:, 1], boxes[:, 2]
+        h2, s2, v2 = boxes[:, 3] + 1, boxes[:, 4] + 1, boxes[:, 5] + 1
+        
+        # İçerme-dışlama: kutunun 8 köşesindeki kümülatif değerler
+        return (table[:, h2, s2, v2] - table[:, h1, s2, v2] - table[:, h2, s1, v2] - table[:, h2, s2, v1]
+                + table[:, h1, s1, v2] + table[:, h1, s2, v1] + table[:, h2, s1, v1] - table[:, h1, s1, v1])
+    
+    def scores(self, boxes, quantile=0.05):
+        """
+        Kutuların sınıfları ne kadar iyi ayırdığını hesaplar. Yeşil görüntülerdeki
+        yeşil oranın alt yüzdeliği ile diğer görüntülerdeki oranın üst yüzdeliği
+        arasındaki fark, iki oranın toplamına bölünür (pozitifse sınıflar ayrılır).
+        Böylece arka plan gürültüsünü de kapsayan geniş kutular yerine diğer
+        görüntülerde boş kalan kutular seçilir; paydadaki SCORE_SMOOTHING terimi
+        boş kutular arasında lambayı daha çok kapsayanı öne çıkarır.
+        
+        Args:
+            boxes (np.array): (K, 6) kutu indeksleri
+            quantile (float): Aykırı görüntüleri dışarıda bırakan yüzdelik (0: en kötü görüntü)
+            
+        Returns:
+            np.array: (K,) puanlar (-1 ile 1 arasında)
+            np.array: (K,) önerilen yeşil oran eşikleri (iki yüzdeliğin ortası)
+        """
+        ratios = self.counts(boxes) / np.array(self.pixels, np.float64)[:, None]
+        labels = np.array(self.labels)
+        positive = np.quantile(ratios[labels], quantile, axis=0)
+        negative = np.quantile(ratios[~labels], 1 - quantile, axis=0)
+        scores = (positive - negative) / (positive + negative + SCORE_SMOOTHING)
+        return scores, (positive + negative) / 2
+    
+    def search(self, starts=None, quantile=0.05, max_rounds=20):
+        """
+        En iyi ayıran HSV kutusunu arar. Her başlangıç kutusundan koordinat artışıyla
+        ilerlenir: her turda kutunun altı sınırının her biri için tüm olası değerler
+        tek seferde değerlendirilir ve en iyisi seçilir.
+        
+        Args:
+            starts (list, optional): Başlangıç kutuları (varsayılan: ton ekseninde eşit aralıklı kutular)
+            quantile (float): scores() yüzdeliği
+            max_rounds (int): Başlangıç başına en fazla tur sayısı
+            
+        Returns:
+            np.array: En iyi kutu [h1, s1, v1, h2, s2, v2]
+            float: Puanı
+            float: Önerilen yeşil oran eşiği
+        """
+        if not any(self.labels) or all(self.labels):
+            raise ValueError("Kalibrasyon için hem yeşil hem diğer etiketli görüntüler gerekir")
+        
+        if starts is None:
+            h_bins, s_bins, v_bins = self.bins
+            step = max(1, h_bins // 12)
+            starts = [[max(0, h - step), s_bins // 5, v_bins // 5, min(h_bins - 1, h + step), s_bins - 1, v_bins - 1]
+                      for h in range(0, h_bins, step)]
+        
+        best_box, best_score, best_threshold = None, -np.inf, 0.0
+        for start in starts:
+            box = np.array(start, np.intp)
+            score = self.scores(box, quantile)[0][0]
+            for _ in range(max_rounds):
+                improved = False
+                for dim in range(6):
+                    # Sınırın alabileceği tüm değerler (alt sınır üst sınırı geçemez)
+                    axis = dim % 3
+                    if dim < 3:
+                        values = np.arange(0, box[dim + 3] + 1)
+                    else:
+                        values = np.arange(box[dim - 3], self.bins[axis])
+                    candidates = np.repeat(box[None, :], len(values), axis=0)
+                    candidates[:, dim] = values
+                    candidate_scores, _ = self.scores(candidates, quantile)
+                    index = int(np.argmax(candidate_scores))
+                    if candidate_scores[index] > score + 1e-12:
+                        box, score = candidates[index], candidate_scores[index]
+                        improved = True
+                if not improved:
+                    break
+            
+            if score > best_score:
+                best_box, best_score = box, score
+                best_threshold = self.scores(box, quantile)[1][0]
+        return best_box, float(best_score), float(best_threshold)
+
+
+def roi_box(frame_shape, roi):
+    """ROI oranlarını (x, y, genişlik, yükseklik) piksel koordinatlarına çevirir (detektörle aynı)"""
+    height, width = frame_shape[:2]
+    x1 = int(width * roi[0])
+    y1 = int(height * roi[1])
+    return x1, y1, int(x1 + width * roi[2]), int(y1 + height * roi[3])
+
+
+def auto_calibrate(dataset_dir, roi=DEFAULT_ROI, frame_step=1, quantile=0.05, bins=HISTOGRAM_BINS):
+    """
+    Etiketli kayıtlardan yeşil ışığı en iyi ayıran HSV aralığını ve yeşil oran eşiğini bulur.
+    Kayıt ve etiket biçimi değerlendirme aracıyla (evaluate_traffic_light.py) aynıdır.
+    Arama ham maskeyle yapılır; morfolojik gürültü azaltmanın etkisi için sonuç
+    değerlendirme aracıyla doğrulanmalıdır.
+    
+    Args:
+        dataset_dir (str): Etiketli videoları/görüntü klasörlerini içeren klasör
+        roi (tuple): ROI (x, y, genişlik, yükseklik; oran olarak)
+        frame_step (int): Her kaçıncı görüntünün kullanılacağı
+        quantile (float): Aykırı görüntüleri dışarıda bırakan yüzdelik
+        bins (tuple): H, S, V histogram kutu sayıları
+        
+    Returns:
+        dict: hsv_min, hsv_max, roi, green_threshold ve separation (ayrım puanı) anahtarlarını
+              içeren ayarlar (değerlendirme aracının --config dosyasıyla uyumlu)
+    """
+    counter = HsvBoxCounter(bins)
+    for path, label in find_sequences(dataset_dir):
+        green_start = label.get("green_start")
+        green_end = label.get("green_end")
+        for index, frame in enumerate(read_frames(path)):
+            if index % frame_step:
+                continue
+            x1, y1, x2, y2 = roi_box(frame.shape, roi)
+            positive = (green_start is not None and index >= green_start
+                        and (green_end is None or index < green_end))
+            counter.add_frame(frame[y1:y2, x1:x2], positive)
+    
+    box, score, threshold = counter.search(quantile=quantile)
+    lower, upper = counter.to_hsv(box)
+    return {
+        "hsv_min": lower,
+        "hsv_max": upper,
+        "roi": list(roi),
+        "green_threshold": threshold,
+        "separation": score
+    }
+
 def main():
     """
     Trafik ışığı tanıma için HSV değerlerini kalibre etme aracı.
@@ -18,8 +240,30 @@ def main():
     """
     parser = argparse.ArgumentParser(description="HSV Renk Kalibrasyonu")
     parser.add_argument("--camera", type=int, default=0, help="Kamera indeksi")
+    parser.add_argument("--auto", metavar="KLASÖR",
+                        help="Etiketli kayıtlardan HSV aralığını ve eşiği otomatik bulur (pencere açılmaz)")
+    parser.add_argument("--roi", type=float, nargs=4, default=DEFAULT_ROI, metavar=("X", "Y", "W", "H"),
+                        help="Otomatik kalibrasyonda ROI (görüntü boyutunun oranı olarak)")
+    parser.add_argument("--frame-step", type=int, default=1, help="Otomatik kalibrasyonda her kaçıncı görüntünün kullanılacağı")
+    parser.add_argument("--quantile", type=float, default=0.05,
+                        help="Otomatik kalibrasyonda aykırı görüntüleri dışarıda bırakan yüzdelik")
+    parser.add_argument("--output", help="Otomatik kalibrasyon sonucunun yazılacağı JSON dosyası")
     args = parser.parse_args()
     
+    if args.auto:
+        start_time = time.perf_counter()
+        config = auto_calibrate(args.auto, tuple(args.roi), args.frame_step, args.quantile)
+        print(f"Kalibrasyon {time.perf_counter() - start_time:.1f} saniyede tamamlandı")
+        print(f"HSV Min: {config['hsv_min']}, Max: {config['hsv_max']}")
+        print(f"Yeşil oran eşiği: {config['green_threshold']:.4f}, ayrım puanı: {config['separation']:.4f}")
+        if config["separation"] <= 0:
+            print("Uyarı: Bulunan aralık sınıfları tam ayırmıyor")
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(config, f, indent=2)
+            print(f"Ayarlar kaydedildi: {args.output}")
+        return
+    
     # Kamerayı başlat
     cap = cv2.VideoCapture(args.camera)
     if not cap.isOpened():
@@ -0,0 +1,55 @@
+import json
+import tempfile
+import cv2
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.calibrate_traffic_light import HsvBoxCounter, auto_calibrate, roi_box, DEFAULT_ROI
+from tests.benchmark_traffic_light import make_labelled_frames
+from traffic_light_detection import create_detector
+
+
+def test_box_counts_match_in_range():
+    rng = np.random.default_rng(3)
+    frames = [rng.integers(0, 256, (60, 80, 3), dtype=np.uint8) for _ in range(3)]
+    counter = HsvBoxCounter()
+    for frame in frames:
+        counter.add_frame(frame, positive=False)
+
+    for _ in range(20):
+        low = [rng.integers(0, count) for count in counter.bins]
+        box = np.array(low + [rng.integers(l, count) for l, count in zip(low, counter.bins)])
+        lower, upper = counter.to_hsv(box)
+        expected = [cv2.countNonZero(cv2.inRange(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV),
+                                                 np.array(lower), np.array(upper)))
+                    for frame in frames]
+        assert counter.counts(box)[:, 0].tolist() == expected
+
+
+def write_dataset(directory, frames):
+    """Görüntüleri her biri tek görüntülük etiketli diziler olarak kaydeder"""
+    for index, (frame, is_green) in enumerate(frames):
+        name = f"seq{index:03d}"
+        os.mkdir(os.path.join(directory, name))
+        cv2.imwrite(os.path.join(directory, name, "000.png"), frame)
+        with open(os.path.join(directory, name + ".json"), "w") as f:
+            json.dump({"green_start": 0 if is_green else None}, f)
+
+
+def test_auto_calibration_separates_classes():
+    with tempfile.TemporaryDirectory() as directory:
+        write_dataset(directory, make_labelled_frames(320, 240, 30, seed=1))
+        config = auto_calibrate(directory)
+
+    assert config["separation"] > 0
+    assert config["hsv_min"][0] <= 60 <= config["hsv_max"][0]  # Lamba rengi (40, 220, 40) ton değeri
+
+    # Bulunan ayarlar yeni görüntülerde de doğru karar verir
+    detector = create_detector(config)
+    frames = make_labelled_frames(320, 240, 30, seed=2)
+    correct = sum(detector.detect_green_light(frame)[0] == is_green for frame, is_green in frames)
+    assert correct >= 0.9 * len(frames)
@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from camera_capture import FrameGrabber
+
+
+class FakeCamera:
+    """Test tarafından beslenen sahte kamera: read() bir sonraki görüntü verilene kadar bekler"""
+
+    def __init__(self):
+        self.frames = queue.Queue()
+
+    def push(self, value):
+        """value: görüntü değeri veya okuma hatası için None"""
+        self.frames.put(value)
+
+    def read(self):
+        value = self.frames.get()
+        if value is None:
+            return False, None
+        return True, np.full((4, 4, 3), value, np.uint8)
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_newest_frame_wins():
+    camera = FakeCamera()
+    grabber = FrameGrabber(camera)
+    assert grabber.get_latest() == (None, -1, None)
+    grabber.start()
+    try:
+        for value in range(5):
+            camera.push(value)
+        assert wait_until(lambda: grabber.get_latest()[1] == 4)
+
+        # Tüketici yavaşsa aradaki görüntüler atlanır, yalnızca en sonuncusu döner
+        frame, sequence, timestamp = grabber.wait_for_frame(-1, timeout=1.0)
+        assert sequence == 4 and frame[0, 0, 0] == 4
+        assert timestamp is not None
+
+        camera.push(5)
+        frame, next_sequence, next_timestamp = grabber.wait_for_frame(sequence, timeout=1.0)
+        assert next_sequence == 5 and frame[0, 0, 0] == 5
+        assert next_timestamp >= timestamp
+    finally:
+        camera.push(None)
+        grabber.stop()
+
+
+def test_wait_for_frame_times_out_without_new_frame():
+    camera = FakeCamera()
+    grabber = FrameGrabber(camera)
+    grabber.start()
+    try:
+        camera.push(1)
+        frame, sequence, _ = grabber.wait_for_frame(-1, timeout=1.0)
+        assert sequence == 0 and frame is not None
+
+        start_time = time.monotonic()
+        frame, same_sequence, _ = grabber.wait_for_frame(sequence, timeout=0.05)
+        assert frame is None and same_sequence == sequence
+        assert time.monotonic() - start_time >= 0.04
+    finally:
+        camera.push(None)
+        grabber.stop()
+
+
+def test_read_failure_stops_thread_and_wakes_waiters():
+    camera = FakeCamera()
+    grabber = FrameGrabber(camera)
+    grabber.start()
+    camera.push(1)
+    assert wait_until(lambda: grabber.get_latest()[1] == 0)
+
+    camera.push(None)
+    # Bekleyen tüketici zaman aşımını beklemeden uyanır
+    frame, sequence, _ = grabber.wait_for_frame(0, timeout=2.0)
+    assert frame is None and sequence == 0
+    assert wait_until(lambda: not grabber.thread.is_alive())
+    assert not grabber.running and grabber.error is not None
+    grabber.stop()
+    assert grabber.thread is None
+
+
+def test_stop_ends_capture_loop():
+    camera = FakeCamera()
+    grabber = FrameGrabber(camera)
+    grabber.start()
+    camera.push(1)
+    assert wait_until(lambda: grabber.get_latest()[1] == 0)
+
+    # Döngü, stop() sırasında bekleyen read() dönünce çıkar; stop() iş parçacığını bekler
+    thread = grabber.thread
+    threading.Timer(0.05, camera.push, (2,)).start()
+    grabber.stop()
+    assert not thread.is_alive() and grabber.thread is None
+    assert grabber.error is None
+
+    # Durdurulmuş yakalayıcıda bekleyen tüketici hemen döner
+    assert grabber.wait_for_frame(grabber.get_latest()[1], timeout=2.0)[0] is None
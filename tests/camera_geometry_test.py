@@ -0,0 +1,113 @@
+import json
+import tempfile
+import cv2
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from camera_geometry import BirdseyeRemap, load_camera_calibration
+from lane_detection import LaneDetector
+from tests.benchmark_lane_detection import example_calibration, make_synthetic_lane_frame
+
+
+def smooth_frame(width, height):
+    """Çift interpolasyon farkı yaratmayacak kadar yumuşak renkli desen"""
+    y, x = np.mgrid[0:height, 0:width]
+    return np.dstack([127 + 100 * np.sin(x / 23.0), 127 + 100 * np.cos(y / 17.0),
+                      127 + 100 * np.sin((x + y) / 31.0)]).astype(np.uint8)
+
+
+def test_remap_matches_undistort_then_warp():
+    frame = smooth_frame(640, 480)
+    matrix = LaneDetector().get_warp_matrix(frame.shape)
+
+    # Kalibrasyon yoksa perspektif dönüşümüyle aynıdır
+    remap = BirdseyeRemap((640, 480), (320, 240), matrix)
+    reference = cv2.warpPerspective(frame, matrix, (320, 240), flags=cv2.INTER_LINEAR)
+    assert np.abs(remap.remap(frame).astype(int) - reference).max() <= 1
+
+    # Kalibrasyonla iki ayrı geçişle aynıdır. Ayrı geçişte düzeltilmiş görüntünün
+    # dışında kalan (siyah) pikseller karşılaştırılmaz.
+    calibration = example_calibration(640, 480)
+    camera_matrix, dist_coeffs = calibration["camera_matrix"], calibration["dist_coeffs"]
+    remap = BirdseyeRemap((640, 480), (320, 240), matrix, calibration)
+    reference = cv2.warpPerspective(cv2.undistort(frame, camera_matrix, dist_coeffs), matrix, (320, 240))
+    valid = cv2.warpPerspective(cv2.undistort(np.full((480, 640), 255, np.uint8), camera_matrix, dist_coeffs),
+                                matrix, (320, 240))
+    valid = cv2.erode(valid, np.ones((5, 5), np.uint8)) > 0
+    assert valid.mean() > 0.8
+    assert np.abs(remap.remap(frame).astype(int) - reference)[valid].max() <= 2
+
+
+def test_maps_are_cached_per_calibration_and_resolution():
+    frame = smooth_frame(640, 480)
+    matrix = LaneDetector().get_warp_matrix(frame.shape)
+    calibration = example_calibration(640, 480)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        built = BirdseyeRemap((640, 480), (320, 240), matrix, calibration, cache_dir)
+        assert not built.loaded_from_cache
+        assert len(os.listdir(cache_dir)) == 2
+
+        loaded = BirdseyeRemap((640, 480), (320, 240), matrix, calibration, cache_dir)
+        assert loaded.loaded_from_cache
+        assert isinstance(loaded.map_xy, np.memmap)
+        assert loaded.map_xy.dtype == np.int16 and loaded.map_xy.shape == (240, 320, 2)
+        assert np.array_equal(loaded.remap(frame), built.remap(frame))
+
+        # Farklı kalibrasyon veya çözünürlük yeni haritalar oluşturur
+        other = dict(calibration, dist_coeffs=np.array([-0.2, 0.05, 0.0, 0.0, 0.0]))
+        assert not BirdseyeRemap((640, 480), (320, 240), matrix, other, cache_dir).loaded_from_cache
+        assert not BirdseyeRemap((640, 480), (160, 120), matrix, calibration, cache_dir).loaded_from_cache
+        assert len(os.listdir(cache_dir)) == 6
+
+
+def test_calibration_is_scaled_to_frame_resolution():
+    calibration = example_calibration(640, 480)
+    frame = smooth_frame(1280, 960)
+    detector = LaneDetector()
+    matrix = detector.get_warp_matrix(frame.shape)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "camera.json")
+        with open(path, "w") as f:
+            json.dump({key: np.asarray(value).tolist() for key, value in calibration.items()}, f)
+        loaded = load_camera_calibration(path)
+    assert loaded["image_size"] == (640, 480)
+
+    # 640x480 kalibrasyonu 1280x960 görüntüde, ölçeklenmiş kamera matrisiyle kullanılır
+    scaled = example_calibration(1280, 960)
+    remap = BirdseyeRemap((1280, 960), (320, 240), matrix, loaded)
+    reference = BirdseyeRemap((1280, 960), (320, 240), matrix, scaled)
+    assert np.array_equal(remap.map_xy, reference.map_xy)
+
+
+def test_lane_detector_uses_camera_geometry():
+    calibration = example_calibration(640, 480)
+    camera_matrix, dist_coeffs = calibration["camera_matrix"], calibration["dist_coeffs"]
+
+    # Sentetik şerit görüntüsü lens distorsiyonuyla bükülür
+    frame = make_synthetic_lane_frame(640, 480, center_offset=0.05)
+    map_x, map_y = cv2.initInverseRectificationMap(camera_matrix, dist_coeffs, None, camera_matrix,
+                                                   (640, 480), cv2.CV_32FC1)
+    distorted = cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR)
+
+    def lane_mask(detector, image):
+        return detector.threshold(detector.warp(image)) > 0
+
+    def overlap(a, b):
+        return (a & b).sum() / (a | b).sum()
+
+    expected = lane_mask(LaneDetector(), frame)
+    detector = LaneDetector()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        detector.set_camera_geometry(calibration, cache_dir)
+        assert overlap(lane_mask(detector, distorted), expected) > 0.95
+        assert os.listdir(cache_dir)
+    assert overlap(lane_mask(LaneDetector(), distorted), expected) < 0.8
+
+    found, info = detector.detect_lane(distorted)
+    assert found and abs(info["center_offset"] - 0.05) < 0.01
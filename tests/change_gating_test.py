@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+
+def make_gated_detector(max_skipped=15):
+    detector = TrafficLightDetector()
+    detector.set_change_gating(True, threshold=2.0, max_skipped=max_skipped)
+    return detector
+
+
+def test_unchanged_frame_returns_cached_decision():
+    detector = make_gated_detector()
+    frame = make_synthetic_frame(640, 480, green=True)
+    is_green, info = detector.detect_green_light(frame, timestamp=1.0, sequence=1)
+    assert is_green
+
+    # Aynı sahne tekrar işlenmez; karar önceki kareden, kimlik bu kareden gelir
+    cached_green, cached_info = detector.detect_green_light(frame.copy(), timestamp=2.0, sequence=2)
+    assert cached_green == is_green
+    assert cached_info["green_pixel_count"] == info["green_pixel_count"]
+    assert cached_info["frame_sequence"] == 2 and cached_info["capture_timestamp"] == 2.0
+    stats = detector.get_processing_stats()
+    assert stats["frames_processed"] == 1 and stats["frames_skipped"] == 1
+    assert stats["skip_ratio"] == 0.5
+
+
+def test_change_above_threshold_reruns_detection():
+    detector = make_gated_detector()
+    frame = make_synthetic_frame(640, 480, green=False)
+    is_green, _ = detector.detect_green_light(frame)
+    assert not is_green
+
+    # Eşiğin altındaki parlaklık değişimi atlanır
+    detector.detect_green_light(cv2.add(frame, np.full(frame.shape, 1, np.uint8)))
+    assert detector.get_processing_stats()["frames_skipped"] == 1
+
+    # Eşiğin üstündeki değişim algılamayı yeniden çalıştırır
+    detector.detect_green_light(cv2.add(frame, np.full(frame.shape, 5, np.uint8)))
+    assert detector.get_processing_stats()["frames_processed"] == 2
+
+    # Lambanın yeşile dönmesi yeni bir karar üretir
+    is_green, _ = detector.detect_green_light(make_synthetic_frame(640, 480, green=True))
+    assert is_green
+    stats = detector.get_processing_stats()
+    assert stats["frames_processed"] == 3 and stats["frames_skipped"] == 1
+
+
+def test_max_skipped_forces_refresh():
+    detector = make_gated_detector(max_skipped=3)
+    frame = make_synthetic_frame(640, 480, green=True)
+
+    # İşle, 3 atla, işle, 3 atla, işle
+    processed = []
+    for _ in range(9):
+        before = detector.frames_processed
+        detector.detect_green_light(frame)
+        processed.append(detector.frames_processed > before)
+    assert processed == [True, False, False, False, True, False, False, False, True]
+    stats = detector.get_processing_stats()
+    assert stats["frames_processed"] == 3 and stats["frames_skipped"] == 6
@@ -0,0 +1,135 @@
+import cv2
+import numpy as np
+import pytest
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from color_segmentation import ColorSegmenter, DEFAULT_COLOR_CLASSES
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame, make_labelled_frames
+
+
+def make_scene():
+    """Yeşil lamba, turuncu engel ve kırmızı park alanı içeren sentetik görüntü"""
+    frame = make_synthetic_frame(640, 480, green=True)
+    cv2.rectangle(frame, (60, 300), (160, 380), (0, 140, 255), -1)  # Turuncu engel
+    cv2.rectangle(frame, (400, 380), (600, 470), (30, 30, 200), -1)  # Kırmızı park alanı
+    return frame
+
+
+def test_hsv_labels_match_per_class_in_range():
+    frame = make_scene()
+    result = ColorSegmenter(classifier="hsv").segment(frame)
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+
+    for name, ranges in DEFAULT_COLOR_CLASSES:
+        expected = np.zeros(frame.shape[:2], np.uint8)
+        for lower, upper in ranges:
+            expected |= cv2.inRange(hsv, np.array(lower), np.array(upper))
+        assert np.array_equal(result.mask(name), expected)
+
+
+def test_lut_labels_agree_with_hsv():
+    frame = make_scene()
+    hsv_result = ColorSegmenter(classifier="hsv").segment(frame)
+    lut_result = ColorSegmenter(classifier="lut").segment(frame)
+
+    # Nicemleme farkları yalnızca eşiğe yakın koyu arka plan piksellerinde görülür
+    assert np.mean(hsv_result.labels == lut_result.labels) > 0.95
+    for name in ("green_lamp", "orange_obstacle"):
+        expected = hsv_result.components(name, min_area=500)
+        actual = lut_result.components(name, min_area=500)
+        assert [component[:4] for component in actual] == [component[:4] for component in expected]
+        assert abs(actual[0][4] - expected[0][4]) < 0.01 * expected[0][4]
+
+
+def test_counts_and_components_per_roi():
+    frame = make_scene()
+    result = ColorSegmenter(classifier="hsv").segment(frame)
+
+    # Sayımlar tek geçişte, sınıf maskeleriyle aynı
+    box = (0, 250, 640, 480)
+    counts = result.counts(box)
+    for name in result.class_names:
+        assert counts[name] == cv2.countNonZero(result.mask(name, box))
+
+    obstacles = result.components("orange_obstacle", box, min_area=500)
+    assert obstacles == [(60, 300, 101, 81, 101 * 81)]
+    parking = result.region_stats(box, min_area=500)["red_parking"]["components"]
+    x, y, w, h, area = parking[0]
+    # Kenara değen kırmızımsı gürültü pikselleri bileşene katılabilir
+    assert abs(x - 400) <= 5 and abs(y - 380) <= 5 and abs(w - 201) <= 10 and abs(h - 91) <= 10
+
+    # Üst bölgede engel yok
+    assert result.counts((0, 0, 640, 200))["orange_obstacle"] == 0
+
+
+def test_downscaled_components_are_in_frame_coordinates():
+    frame = make_scene()
+    result = ColorSegmenter(classifier="hsv", scale=0.5).segment(frame)
+    x, y, w, h, area = result.components("orange_obstacle", min_area=500)[0]
+    assert abs(x - 60) <= 2 and abs(y - 300) <= 2
+    assert abs(w - 101) <= 2 and abs(h - 81) <= 2
+    assert abs(area - 101 * 81) < 0.05 * 101 * 81
+
+
+@pytest.mark.parametrize("scale", [1.0, 0.5])
+def test_box_segmentation_matches_full_frame_queries(scale):
+    frame = make_scene()
+    box = (40, 280, 620, 480)
+    full = ColorSegmenter(classifier="hsv", scale=scale).segment(frame)
+    partial = ColorSegmenter(classifier="hsv", scale=scale).segment(frame, box)
+    assert partial.labels.size < full.labels.size
+
+    # Bölge içindeki sorgular görüntü koordinatlarında aynı sonucu verir
+    assert partial.counts((60, 300, 300, 400)) == pytest.approx(full.counts((60, 300, 300, 400)), abs=40)
+    x, y, w, h, area = partial.components("orange_obstacle", min_area=500)[0]
+    assert abs(x - 60) <= 2 and abs(y - 300) <= 2 and abs(w - 101) <= 2 and abs(h - 81) <= 2
+
+    # Bölge dışı sorgular boştur
+    assert partial.counts((0, 0, 640, 200))["orange_obstacle"] == 0
+
+
+def test_detector_decisions_match_with_roi_segmentation():
+    segmenter = ColorSegmenter(classifier="hsv")
+    for frame, is_green in make_labelled_frames(640, 480, 12):
+        detector = TrafficLightDetector()
+        expected, expected_info = detector.detect_green_light(frame)
+        segmentation = segmenter.segment(frame, detector.get_roi_box(frame.shape))
+        actual, info = detector.detect_green_light(frame, segmentation=segmentation)
+        assert actual == expected
+        assert info["green_pixel_count"] == expected_info["green_pixel_count"]
+
+
+def test_detector_decisions_match_with_shared_segmentation():
+    segmenter = ColorSegmenter(classifier="hsv")
+    for frame, is_green in make_labelled_frames(640, 480, 12):
+        detector = TrafficLightDetector()
+        expected, expected_info = detector.detect_green_light(frame)
+        actual, info = detector.detect_green_light(frame, segmentation=segmenter.segment(frame))
+        assert actual == expected
+        assert info["green_pixel_count"] == expected_info["green_pixel_count"]
+
+
+def test_tracking_locks_onto_red_lamp_from_segmentation():
+    segmenter = ColorSegmenter(classifier="lut")
+    detector = TrafficLightDetector()
+    detector.set_tracking(True, margin=0.5)
+    frame = make_synthetic_frame(640, 480, green=False)
+    is_green, _ = detector.detect_green_light(frame, segmentation=segmenter.segment(frame))
+    assert not is_green
+    x1, y1, x2, y2 = detector.track_window
+    assert x1 <= 320 <= x2 and y1 <= 72 <= y2
+
+
+def test_invalid_configuration_raises():
+    with pytest.raises(ValueError):
+        ColorSegmenter(classes=[(f"class{i}", [([0, 0, 0], [1, 1, 1])]) for i in range(9)])
+    segmenter = ColorSegmenter(classifier="hsv")
+    with pytest.raises(ValueError):
+        segmenter.set_class_range("blue_sign", [([100, 50, 50], [130, 255, 255])])
+    with pytest.raises(ValueError):
+        segmenter.set_classifier("yuv")
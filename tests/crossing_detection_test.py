@@ -0,0 +1,90 @@
+import tempfile
+import cv2
+import numpy as np
+import pytest
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from crossing_detection import CrossingDetector
+from motor_control import create_mock_motor_controller
+from replay import ReplayCamera, ReplayRecorder
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_crossing_detection import make_synthetic_crossing_frame
+
+
+@pytest.mark.parametrize("kind", ["crosswalk", "stop_line"])
+def test_marking_kind_and_distance_are_found(kind):
+    detector = CrossingDetector()
+    distances = []
+    for position in (0.35, 0.25, 0.15, 0.05):
+        found, info = detector.detect_crossing(make_synthetic_crossing_frame(640, 480, kind, position))
+        assert found and info["kind"] == kind
+        distances.append(info["distance"])
+
+    # Yaklaşan işaretin uzaklığı azalır
+    assert distances == sorted(distances, reverse=True)
+    assert distances[0] > 0.5 > distances[-1]
+
+    if kind == "crosswalk":
+        assert info["stripes"] >= detector.min_stripes and info["period"] > 0
+
+
+def test_unmarked_road_is_not_a_crossing():
+    detector = CrossingDetector()
+
+    # Yalnızca şerit çizgileri
+    found, info = detector.detect_crossing(make_synthetic_crossing_frame(640, 480, None))
+    assert not found and info["kind"] is None and info["distance"] is None
+
+    # Bandı kaplayan düzensiz parlak lekeler ne şeritli ne kesintisiz
+    frame = make_synthetic_crossing_frame(640, 480, None)
+    for x, width in ((170, 60), (260, 15), (300, 90)):
+        cv2.rectangle(frame, (x, 380), (x + width, 420), (235, 235, 235), -1)
+    found, _ = detector.detect_crossing(frame)
+    assert not found
+
+    # Band dışındaki işaret görülmez
+    found, _ = detector.detect_crossing(make_synthetic_crossing_frame(640, 480, "crosswalk", 0.7))
+    assert not found
+
+
+def test_invalid_band_is_rejected():
+    detector = CrossingDetector()
+    with pytest.raises(ValueError):
+        detector.set_band((0.9, 0.7))
+    with pytest.raises(ValueError):
+        detector.set_band((0.7, 0.95), (0.25, 1.2))
+
+
+def test_autonomous_mode_stops_at_crosswalk_and_continues(monkeypatch):
+    monkeypatch.setattr(main, "CROSSING_STOP_FRAMES", 3)
+
+    # Kırmızı, yeşil, uzakta ve yakında yaya geçidi, geçidin üzeri, işaretsiz yol
+    scenes = [(False, None, 0.0)] * 2 + [(True, None, 0.0)] + [(True, "crosswalk", 0.35)] * 2 + \
+             [(True, "crosswalk", 0.1)] * 7 + [(True, None, 0.0)] * 12
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (green, kind, position) in enumerate(scenes):
+            frame = make_synthetic_crossing_frame(640, 480, kind, position, seed=index)
+            cv2.circle(frame, (320, 72), 40, (40, 220, 40) if green else (40, 40, 220), -1)
+            cv2.imwrite(os.path.join(directory, f"{index:03d}.png"), frame)
+
+        detector = TrafficLightDetector()
+        detector.camera = ReplayCamera(directory)
+        motor = create_mock_motor_controller()
+        recorder = ReplayRecorder(detector.camera, motor)
+        try:
+            main.run_autonomous_mode(detector, recorder, crossing_detector=CrossingDetector())
+        finally:
+            detector.stop_camera()
+            motor.cleanup()
+
+    # Yeşilde hareket, ikinci yakın karede dur, üç kare bekle, geçidin üzerinde yeniden durmadan
+    # devam et (sonraki yazımlar çıkıştaki temizliktendir)
+    assert recorder.get_writes()[:6] == [(2, "left", 0.5), (2, "right", 0.5),
+                                           (6, "left", 0.0), (6, "right", 0.0),
+                                           (10, "left", 0.5), (10, "right", 0.5)]
+    assert all(frame_index == len(scenes) - 1 for frame_index, _, _ in recorder.get_writes()[6:])
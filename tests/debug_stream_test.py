@@ -0,0 +1,61 @@
+import time
+import urllib.request
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from debug_stream import DebugStreamer, BOUNDARY
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+
+def make_overlay():
+    return {"roi": (160, 0, 480, 144), "search_window": (160, 0, 480, 144), "is_green": True, "green_ratio": 0.1}
+
+
+def test_submit_is_rate_limited_and_drops_oldest():
+    streamer = DebugStreamer(port=0, max_fps=1000, queue_size=2)
+    streamer.running = True  # İş parçacıkları başlatılmadan yalnızca kuyruk sınanır
+    frame = make_synthetic_frame(640, 480)
+    mask = np.zeros((144, 320), np.uint8)
+
+    for index in range(5):
+        frame[0, 0, 0] = index
+        assert streamer.submit(frame, mask, make_overlay())
+        time.sleep(0.002)
+
+    assert len(streamer.queue) == 2
+    assert streamer.frames_dropped == 3
+    # Kuyrukta en yeni iki görüntü kalır ve kopyalanmıştır
+    assert [item[0][0, 0, 0] for item in streamer.queue] == [3, 4]
+
+    # Kare hızı sınırı içinde ikinci gönderim reddedilir
+    streamer.max_fps = 1
+    streamer._next_submit_time = 0.0
+    assert streamer.submit(frame, mask, make_overlay())
+    assert not streamer.submit(frame, mask, make_overlay())
+
+
+def test_detector_debug_frames_are_served_as_mjpeg():
+    detector = TrafficLightDetector(debug=True)
+    detector.set_debug_stream(port=0, max_fps=100)
+    frame = make_synthetic_frame(1280, 720)
+
+    try:
+        detector.detect_green_light(frame)
+        port = detector.debug_stream.port
+        # Varsayılan olarak yalnızca bu cihazdan erişilir
+        assert detector.debug_stream.server.server_address[0] == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/stream", timeout=5) as response:
+            assert BOUNDARY in response.headers["Content-Type"]
+            data = b""
+            while b"\xff\xd9" not in data:
+                data += response.read1(65536)
+        assert b"Content-Type: image/jpeg" in data
+        assert b"\xff\xd8" in data
+    finally:
+        detector.stop_camera()
+    assert detector.debug_stream is None
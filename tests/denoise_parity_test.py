@@ -0,0 +1,74 @@
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import FRAME_SIZES, make_labelled_frames, time_function
+
+DENOISE_METHODS = ["downsampled", "components"]
+
+# Eşiğe bu oranda yakın olan kararlar sınırda sayılır; yöntemler piksel sayısını
+# birebir değil yaklaşık olarak verdiği için bu karelerde farklı karar verebilir
+BORDERLINE_MARGIN = 0.1
+
+
+def compare_with_reference(method, frames):
+    """
+    Bir gürültü azaltma yönteminin kararlarını referans yöntemle karşılaştırır
+
+    Args:
+        method (str): Gürültü azaltma yöntemi
+        frames (list): (görüntü, etiket) çiftleri
+
+    Returns:
+        list: Sınırda olmayan ve kararı farklı olan karelerin indeksleri
+    """
+    reference = TrafficLightDetector()
+    detector = TrafficLightDetector()
+    detector.set_denoise_method(method)
+
+    mismatches = []
+    for index, (frame, _) in enumerate(frames):
+        reference_result, reference_info = reference.detect_green_light(frame)
+        result, _ = detector.detect_green_light(frame)
+
+        distance = abs(reference_info["green_ratio"] - reference.green_threshold)
+        borderline = distance < reference.green_threshold * BORDERLINE_MARGIN
+        if result != reference_result and not borderline:
+            mismatches.append(index)
+    return mismatches
+
+
+def test_downsampled_matches_reference():
+    for width, height in FRAME_SIZES:
+        assert compare_with_reference("downsampled", make_labelled_frames(width, height, 30, seed=11)) == []
+
+
+def test_components_matches_reference():
+    for width, height in FRAME_SIZES:
+        assert compare_with_reference("components", make_labelled_frames(width, height, 30, seed=11)) == []
+
+
+def main():
+    """Gürültü azaltma yöntemlerinin uyumunu ve süresini yazdırır"""
+    for width, height in FRAME_SIZES:
+        frames = make_labelled_frames(width, height, 60, seed=11)
+        for method in ["reference"] + DENOISE_METHODS:
+            detector = TrafficLightDetector()
+            detector.set_denoise_method(method)
+
+            index = [0]
+
+            def detect():
+                detector.detect_green_light(frames[index[0] % len(frames)][0])
+                index[0] += 1
+
+            mismatches = compare_with_reference(method, frames)
+            print(f"{width}x{height} {method:>12}: {time_function(detect, 100):.3f} ms, "
+                  f"farklı karar: {len(mismatches)}")
+
+
+if __name__ == "__main__":
+    main()
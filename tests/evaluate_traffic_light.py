@@ -0,0 +1,243 @@
+import time
+import json
+import cv2
+import numpy as np
+import argparse
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import create_detector
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov", ".h264")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def find_sequences(dataset_dir):
+    """
+    Veri kümesi klasöründeki etiketli dizileri bulur. Her dizi bir video dosyası
+    veya görüntü dosyaları içeren bir alt klasördür; etiketi aynı adlı bir
+    JSON dosyasındadır:
+
+        kayit1.mp4 + kayit1.json
+        kayit2/ (000.png, 001.png, ...) + kayit2.json
+
+    Etiket dosyası: {"green_start": 42, "green_end": null}
+    green_start yeşil ışığın yandığı ilk karedir (yoksa null); green_end
+    verilmezse yeşil ışık dizinin sonuna kadar yanık kabul edilir.
+
+    Args:
+        dataset_dir (str): Veri kümesi klasörü
+
+    Returns:
+        list: (dizi yolu, etiket sözlüğü) çiftleri
+    """
+    sequences = []
+    for name in sorted(os.listdir(dataset_dir)):
+        path = os.path.join(dataset_dir, name)
+        base, extension = os.path.splitext(name)
+        if os.path.isdir(path):
+            base = name
+        elif extension.lower() not in VIDEO_EXTENSIONS:
+            continue
+
+        label_path = os.path.join(dataset_dir, base + ".json")
+        if not os.path.exists(label_path):
+            print(f"Uyarı: {name} için etiket dosyası yok, atlanıyor")
+            continue
+
+        with open(label_path) as f:
+            sequences.append((path, json.load(f)))
+    return sequences
+
+
+def read_frames(path):
+    """
+    Video dosyasındaki veya görüntü klasöründeki kareleri sırayla döndürür
+
+    Args:
+        path (str): Video dosyası veya görüntü klasörü
+
+    Yields:
+        np.array: BGR görüntü
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                frame = cv2.imread(os.path.join(path, name))
+                if frame is not None:
+                    yield frame
+        return
+
+    capture = cv2.VideoCapture(path)
+    try:
+        while True:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        capture.release()
+
+
+def score_decisions(decisions, green_start, green_end=None):
+    """
+    Bir dizinin kare kararlarını etiket aralığıyla karşılaştırır
+
+    Args:
+        decisions (list): Kare başına yeşil kararları
+        green_start (int): Yeşil ışığın yandığı ilk kare (yoksa None)
+        green_end (int, optional): Yeşil ışığın söndüğü ilk kare (None: dizinin sonu)
+
+    Returns:
+        list: Kare başına etiketler (yeşil ışık yanıyorsa True)
+        int: Gecikme (kare) veya yeşil ışık yanarken hiç algılanmadıysa None
+        bool: Yeşil ışık yanmadan önce yeşil algılandıysa True
+    """
+    labels = [green_start is not None and index >= green_start and (green_end is None or index < green_end)
+              for index in range(len(decisions))]
+
+    # Gecikme: yeşil ışık yandıktan sonraki ilk doğru algılamaya kadar geçen kare sayısı.
+    # Yeşil ışık söndükten sonraki algılamalar sayılmaz.
+    latency = None
+    if green_start is not None:
+        for index in range(green_start, green_end if green_end is not None else len(decisions)):
+            if decisions[index]:
+                latency = index - green_start
+                break
+
+    # Yanlış kalkış: yeşil ışık yanmadan önce yeşil algılanması
+    false_start = any(decisions[:green_start] if green_start is not None else decisions)
+    return labels, latency, false_start
+
+
+def evaluate_sequence(task):
+    """
+    Bir diziyi baştan sona işler (işlem havuzunda çalışır)
+
+    Args:
+        task (tuple): (dizi yolu, etiket sözlüğü, detektör ayarları)
+
+    Returns:
+        dict: Dizi sonuçları (kare kararları, etiketler ve işlem süreleri)
+    """
+    path, label, config = task
+    detector = create_detector(config)
+
+    decisions = []
+    durations_ms = []
+    for frame in read_frames(path):
+        start_time = time.perf_counter()
+        is_green, _ = detector.detect_green_light(frame)
+        durations_ms.append((time.perf_counter() - start_time) * 1000)
+        decisions.append(bool(is_green))
+
+    labels, latency, false_start = score_decisions(decisions, label.get("green_start"), label.get("green_end"))
+
+    return {
+        "sequence": os.path.basename(path),
+        "decisions": decisions,
+        "labels": labels,
+        "durations_ms": durations_ms,
+        "latency_frames": latency,
+        "false_start": false_start
+    }
+
+
+def summarize(results):
+    """
+    Dizi sonuçlarından toplam doğruluk ve performans ölçütlerini hesaplar
+
+    Args:
+        results (list): evaluate_sequence sonuçları
+
+    Returns:
+        dict: Özet ölçütler
+    """
+    decisions = np.array([d for r in results for d in r["decisions"]], bool)
+    labels = np.array([l for r in results for l in r["labels"]], bool)
+    durations = np.array([d for r in results for d in r["durations_ms"]])
+
+    true_positive = int(np.sum(decisions & labels))
+    false_positive = int(np.sum(decisions & ~labels))
+    false_negative = int(np.sum(~decisions & labels))
+
+    latencies = [r["latency_frames"] for r in results if r["latency_frames"] is not None]
+    missed = sum(1 for r in results if r["labels"] and any(r["labels"]) and r["latency_frames"] is None)
+
+    return {
+        "sequences": len(results),
+        "frames": int(len(decisions)),
+        "precision": true_positive / (true_positive + false_positive) if true_positive + false_positive else None,
+        "recall": true_positive / (true_positive + false_negative) if true_positive + false_negative else None,
+        "false_starts": sum(1 for r in results if r["false_start"]),
+        "missed_lights": missed,
+        "latency_frames_mean": float(np.mean(latencies)) if latencies else None,
+        "latency_frames_max": int(np.max(latencies)) if latencies else None,
+        "time_ms_p50": float(np.percentile(durations, 50)) if len(durations) else None,
+        "time_ms_p90": float(np.percentile(durations, 90)) if len(durations) else None,
+        "time_ms_p99": float(np.percentile(durations, 99)) if len(durations) else None
+    }
+
+
+def format_value(value, digits=3):
+    """Özet değerini yazdırmak için biçimlendirir"""
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.{digits}f}"
+    return str(value)
+
+
+def main():
+    """
+    Kaydedilmiş etiketli videolar üzerinde trafik ışığı detektörünün doğruluğunu
+    ve hızını ölçen değerlendirme aracı. Diziler işlem havuzunda paralel işlenir.
+    """
+    parser = argparse.ArgumentParser(description="Trafik Işığı Detektörü Değerlendirmesi")
+    parser.add_argument("dataset", help="Etiketli videoları/görüntü klasörlerini içeren klasör")
+    parser.add_argument("--config", help="Detektör ayarlarını içeren JSON dosyası")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="İşlem sayısı")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    sequences = find_sequences(args.dataset)
+    if not sequences:
+        print("Etiketli dizi bulunamadı!")
+        return
+
+    print(f"{len(sequences)} dizi {args.workers} işlemle değerlendiriliyor...")
+    tasks = [(path, label, config) for path, label in sequences]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(evaluate_sequence, tasks))
+
+    for result in results:
+        print(f"  {result['sequence']}: gecikme={format_value(result['latency_frames'])} kare, "
+              f"yanlış kalkış={'evet' if result['false_start'] else 'hayır'}")
+
+    summary = summarize(results)
+    print("\nÖzet:")
+    for key, value in summary.items():
+        print(f"  {key}: {format_value(value)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "config": config,
+                "summary": summary,
+                "sequences": [{k: v for k, v in r.items() if k not in ("decisions", "labels", "durations_ms")}
+                              for r in results]
+            }, f, indent=2)
+        print(f"Sonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import tempfile
+import cv2
+import pytest
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.benchmark_traffic_light import make_synthetic_frame
+from tests.evaluate_traffic_light import evaluate_sequence, score_decisions, summarize
+
+
+def make_result(decisions, green_start, green_end=None):
+    """Elle verilen kararlardan evaluate_sequence biçiminde sonuç oluşturur"""
+    labels, latency, false_start = score_decisions(decisions, green_start, green_end)
+    return {"sequence": "elle", "decisions": decisions, "labels": labels,
+            "durations_ms": [1.0] * len(decisions), "latency_frames": latency, "false_start": false_start}
+
+
+def test_detection_after_green_window_is_a_miss():
+    # Yeşil pencere 2-4 karelerinde; algılama pencereden sonra geliyor
+    labels, latency, false_start = score_decisions([False] * 5 + [True, True], 2, 5)
+    assert labels == [False, False, True, True, True, False, False]
+    assert latency is None and not false_start
+
+    labels, latency, _ = score_decisions([False, False, False, True, True, False, True], 2, 5)
+    assert latency == 1
+
+
+def test_false_start_and_no_green_sequences():
+    _, latency, false_start = score_decisions([False, True, False, True, True], 3)
+    assert false_start and latency == 0
+
+    # Yeşil ışık hiç yanmayan dizide her yeşil karar yanlış kalkıştır
+    labels, latency, false_start = score_decisions([False, True, False], None)
+    assert labels == [False, False, False] and latency is None and false_start
+
+
+def test_summarize_counts_precision_recall_and_misses():
+    results = [
+        make_result([False, False, True, True, False], 1, 4),  # 1 kare gecikme
+        make_result([True, False, False, False, True], 1, 4),  # yanlış kalkış, pencerede kaçırıldı
+        make_result([False, False, False], None),  # yeşil yok
+    ]
+    summary = summarize(results)
+
+    # TP: 2 (ilk dizi), FP: 2 (ikinci dizinin 0. ve 4. kareleri), FN: 1 + 3
+    assert summary["sequences"] == 3 and summary["frames"] == 13
+    assert summary["precision"] == pytest.approx(2 / 4)
+    assert summary["recall"] == pytest.approx(2 / 6)
+    assert summary["false_starts"] == 1
+    assert summary["missed_lights"] == 1
+    assert summary["latency_frames_mean"] == 1.0 and summary["latency_frames_max"] == 1
+    assert summary["time_ms_p50"] == 1.0
+
+
+def test_evaluate_sequence_ignores_detection_after_green_end():
+    with tempfile.TemporaryDirectory() as directory:
+        # Etiketteki yeşil pencerede (3-4) lamba kırmızı görünüyor; sonraki karelerde yeşil
+        for index in range(7):
+            frame = make_synthetic_frame(640, 480, green=index >= 5, seed=index)
+            cv2.imwrite(os.path.join(directory, f"{index:03d}.png"), frame)
+
+        result = evaluate_sequence((directory, {"green_start": 3, "green_end": 5}, {}))
+
+    assert result["decisions"] == [False] * 5 + [True, True]
+    assert result["labels"] == [False] * 3 + [True, True] + [False, False]
+    assert result["latency_frames"] is None and not result["false_start"]
+    assert summarize([result])["missed_lights"] == 1
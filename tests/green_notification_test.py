@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+RED = make_synthetic_frame(640, 480, green=False)
+GREEN = make_synthetic_frame(640, 480, green=True)
+
+
+def test_notification_fires_on_the_deciding_frame():
+    detector = TrafficLightDetector()
+    calls = []
+    subscription = detector.subscribe_green(lambda timestamp, info: calls.append(timestamp))
+
+    for index, frame in enumerate([RED, RED, GREEN, GREEN]):
+        detector.detect_green_light(frame, timestamp=float(index))
+
+    # Yalnızca ilk yeşil karede, o karenin yakalanma zamanıyla tetiklenir
+    assert calls == [2.0]
+    assert subscription.event.is_set()
+    assert subscription.timestamp == 2.0
+    assert subscription.info["green_ratio"] > detector.green_threshold
+    assert not subscription.active
+
+
+def test_confirm_frames_require_consecutive_green():
+    detector = TrafficLightDetector()
+    subscription = detector.subscribe_green(confirm_frames=3, once=False)
+
+    for index, frame in enumerate([GREEN, GREEN, RED, GREEN, GREEN, GREEN, GREEN, RED, GREEN, GREEN, GREEN]):
+        detector.detect_green_light(frame, timestamp=float(index))
+        if index == 5:
+            assert subscription.timestamp == 5.0
+
+    # Her yeni yeşil seride bir kez tetiklenir
+    assert subscription.trigger_count == 2
+    assert subscription.timestamp == 10.0
+
+
+def test_future_resolves_from_detection_thread():
+    detector = TrafficLightDetector()
+    subscription = detector.subscribe_green()
+
+    async def wait_for_green():
+        future = subscription.as_future()
+        thread = threading.Thread(target=lambda: [detector.detect_green_light(frame, timestamp=7.0)
+                                                  for frame in (RED, GREEN)])
+        thread.start()
+        result = await asyncio.wait_for(future, timeout=5)
+        thread.join()
+        return result
+
+    timestamp, info = asyncio.run(wait_for_green())
+    assert timestamp == 7.0
+    assert info["green_pixel_count"] > 0
+
+
+def test_batch_detection_does_not_notify():
+    detector = TrafficLightDetector()
+    detector.set_detection_scale(0.5)
+    subscription = detector.subscribe_green()
+    detector.detect_green_light_batch(np.stack([GREEN, GREEN]))
+    assert not subscription.event.is_set()
+
+
+def test_future_requested_while_firing_is_resolved():
+    detector = TrafficLightDetector()
+    subscription = detector.subscribe_green()
+    loop = asyncio.new_event_loop()
+    futures = []
+
+    class InterleavingEvent(threading.Event):
+        def set(self):
+            # Tetikleme sırasında başka bir iş parçacığı future ister; kilit tutuluyorsa
+            # bekler, tutulmuyorsa tetikleme bitmeden future'ı ekler
+            self.requester = threading.Thread(target=lambda: futures.append(subscription.as_future(loop)))
+            self.requester.start()
+            self.requester.join(timeout=0.2)
+            super().set()
+
+    subscription.event = InterleavingEvent()
+    try:
+        detector.detect_green_light(GREEN, timestamp=3.0)
+        subscription.event.requester.join(timeout=5)
+        assert len(futures) == 1
+
+        result = loop.run_until_complete(asyncio.wait_for(futures[0], timeout=1))
+        assert result[0] == 3.0
+    finally:
+        loop.close()
@@ -0,0 +1,77 @@
+import tempfile
+import cv2
+import numpy as np
+import pytest
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lane_detection import LaneDetector
+from main import run_autonomous_mode
+from motor_control import create_mock_motor_controller
+from replay import ReplayCamera, ReplayRecorder
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_lane_detection import make_synthetic_lane_frame
+
+
+@pytest.mark.parametrize("center_offset, curvature", [(0.0, 0.0), (0.1, 0.0), (-0.08, 0.4), (0.03, -0.6)])
+def test_offset_and_curvature_are_recovered(center_offset, curvature):
+    detector = LaneDetector()
+    frame = make_synthetic_lane_frame(640, 480, center_offset, curvature)
+
+    found, info = detector.detect_lane(frame)
+    assert found and info["lines"] == "both" and info["search"] == "window"
+    assert abs(info["center_offset"] - center_offset) < 0.01
+    assert abs(info["curvature"] - curvature) < 0.05
+
+    # Sonraki karede önceki eğrilerin çevresinde aranır
+    found, info = detector.detect_lane(frame)
+    assert found and info["search"] == "previous"
+    assert abs(info["center_offset"] - center_offset) < 0.01
+
+
+def test_single_line_is_extended_by_lane_width():
+    detector = LaneDetector()
+    frame = make_synthetic_lane_frame(640, 480, 0.05, 0.0)
+    frame[:, 320:] = 40  # Sağ çizgiyi sil
+
+    found, info = detector.detect_lane(frame)
+    assert found and info["lines"] == "left"
+    assert abs(info["center_offset"] - 0.05) < 0.02
+
+
+def test_no_lane_resets_previous_fits():
+    detector = LaneDetector()
+    detector.detect_lane(make_synthetic_lane_frame(640, 480))
+    found, info = detector.detect_lane(np.full((480, 640, 3), 40, np.uint8))
+    assert not found and info["lines"] == "none"
+    assert detector.left_fit is None and detector.right_fit is None
+
+
+def test_autonomous_mode_steers_into_left_curve():
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(6):
+            # Önce kırmızı, sonra yeşil ışık; yol sola dönüyor
+            frame = make_synthetic_lane_frame(640, 480, curvature=0.8, seed=index)
+            cv2.circle(frame, (320, 72), 40, (40, 220, 40) if index >= 2 else (40, 40, 220), -1)
+            cv2.imwrite(os.path.join(directory, f"{index:03d}.png"), frame)
+
+        detector = TrafficLightDetector()
+        detector.camera = ReplayCamera(directory)
+        motor = create_mock_motor_controller()
+        recorder = ReplayRecorder(detector.camera, motor)
+        try:
+            run_autonomous_mode(detector, recorder, lane_detector=LaneDetector())
+            assert motor.right_pwm.value > motor.left_pwm.value > 0
+        finally:
+            detector.stop_camera()
+            motor.cleanup()
+
+    # Yeşil karede düz, sonraki karede şeride göre direksiyon
+    writes = recorder.get_writes()
+    assert writes[:2] == [(2, "left", 0.5), (2, "right", 0.5)]
+    assert [side for frame_index, side, _ in writes if frame_index == 3] == ["left", "right"]
+    assert all(right_speed > left_speed for frame_index, left_speed, right_speed in recorder.get_commands()
+               if frame_index >= 3)
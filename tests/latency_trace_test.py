@@ -0,0 +1,55 @@
+import tempfile
+import cv2
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from latency_trace import LatencyTracer
+from main import run_autonomous_mode
+from motor_control import create_mock_motor_controller
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+RED_FRAMES = 10
+GREEN_FRAMES = 10
+
+
+def write_replay_video(path):
+    """Önce kırmızı, sonra yeşil ışıklı kısa bir video kaydeder"""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (640, 480))
+    for index in range(RED_FRAMES + GREEN_FRAMES):
+        writer.write(make_synthetic_frame(640, 480, green=index >= RED_FRAMES))
+    writer.release()
+
+
+def test_motor_writes_are_traced_to_the_triggering_frame():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "replay.avi")
+        write_replay_video(path)
+
+        detector = TrafficLightDetector(camera_index=path)
+        motor = create_mock_motor_controller()
+        tracer = LatencyTracer()
+        motor.set_tracer(tracer)
+        try:
+            # Video bitince döngü sona erer
+            run_autonomous_mode(detector, motor)
+            assert motor.left_pwm.value == 0.5 and motor.right_pwm.value == 0.5
+        finally:
+            detector.stop_camera()
+            motor.cleanup()
+
+    traced = [write for write in tracer.get_writes() if write[0] is not None]
+    assert [(write[0], write[1], write[2]) for write in traced] == [
+        (RED_FRAMES, "left", 0.5), (RED_FRAMES, "right", 0.5)]
+    for sequence, side, speed, capture_time, decision_time, write_time in traced:
+        assert capture_time <= decision_time <= write_time
+
+    stats = tracer.get_stats()
+    assert stats["capture_to_actuation"]["count"] == 2
+    assert stats["capture_to_decision"]["count"] == 2
+    # Kapanıştaki durdurma komutu bir görüntüye bağlı değildir
+    assert tracer.untraced_writes == 2
+    assert "capture_to_actuation" in tracer.report()
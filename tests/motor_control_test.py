@@ -0,0 +1,90 @@
+import random
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from motor_control import create_mock_motor_controller
+
+
+def expected_pin_states(speed):
+    """Bir motor hızı için beklenen (ileri pini, geri pini, PWM) durumu"""
+    speed = max(-1.0, min(1.0, speed))
+    return speed > 0, speed < 0, abs(speed)
+
+
+def pin_states(forward, backward, pwm):
+    return bool(forward.pin.state), bool(backward.pin.state), pwm.pin.state
+
+
+def test_elided_writes_leave_identical_pin_states():
+    motor = create_mock_motor_controller()
+    rng = random.Random(5)
+    speeds = [0.0, 0.5, -0.5, 1.0, -1.0, 0.3, 1.5]
+    left = right = expected_left = expected_right = 0.0
+    try:
+        for _ in range(300):
+            # Komutların çoğu bir öncekinin tekrarıdır (kontrol döngüsündeki gibi)
+            if rng.random() < 0.3:
+                left, right = rng.choice(speeds), rng.choice(speeds)
+            command = rng.choice(["set_motors", "set_left_motor", "set_right_motor", "forward", "stop"])
+            if command == "set_motors":
+                motor.set_motors(left, right)
+                expected_left, expected_right = left, right
+            elif command == "set_left_motor":
+                motor.set_left_motor(left)
+                expected_left = left
+            elif command == "set_right_motor":
+                motor.set_right_motor(right)
+                expected_right = right
+            elif command == "forward":
+                motor.forward(0.5)
+                expected_left = expected_right = 0.5
+            else:
+                motor.stop()
+                expected_left = expected_right = 0.0
+
+            assert pin_states(motor.left_forward, motor.left_backward, motor.left_pwm) == \
+                expected_pin_states(expected_left)
+            assert pin_states(motor.right_forward, motor.right_backward, motor.right_pwm) == \
+                expected_pin_states(expected_right)
+
+        stats = motor.get_write_stats()
+        assert stats["writes_elided"] > stats["writes_issued"]
+    finally:
+        motor.cleanup()
+
+
+def test_repeated_commands_issue_no_writes():
+    motor = create_mock_motor_controller()
+    try:
+        motor.forward(0.5)
+        issued = motor.get_write_stats()["writes_issued"]
+        for _ in range(10):
+            motor.forward(0.5)
+            motor.set_motors(0.5, 0.5)
+        assert motor.get_write_stats()["writes_issued"] == issued
+
+        # Yalnızca değişen PWM değeri yazılır
+        motor.set_motors(0.5, 0.7)
+        assert motor.get_write_stats()["writes_issued"] == issued + 1
+    finally:
+        motor.cleanup()
+
+
+def test_direction_change_never_enables_both_bridge_pins():
+    motor = create_mock_motor_controller()
+    try:
+        motor.forward(0.5)
+        motor.left_forward.pin.clear_states()
+        motor.left_backward.pin.clear_states()
+
+        motor.backward(0.5)
+
+        # İleri pini, geri pini açılmadan önce kapatılmış olmalı
+        forward_off = [t for t, state in motor.left_forward.pin.states if not state][-1]
+        backward_on = [t for t, state in motor.left_backward.pin.states if state][-1]
+        assert forward_off <= backward_on
+    finally:
+        motor.cleanup()
@@ -0,0 +1,129 @@
+import time
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from latency_trace import LatencyTracer, TraceContext
+from motor_control import MotorService, create_mock_motor_controller
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_speed_ramps_with_acceleration_limit():
+    motor = create_mock_motor_controller()
+    now = [0.0]
+    service = MotorService(motor, rate=100, max_acceleration=2.0, watchdog_timeout=1.0, clock=lambda: now[0])
+    try:
+        service.forward(1.0)
+        for step in range(11):
+            service._update(now[0])
+            now[0] += 0.01
+        # 0.1 saniyede en fazla 0.2 hız değişimi
+        assert abs(motor.left_pwm.value - 0.2) < 1e-9
+        assert motor.left_pwm.value == motor.right_pwm.value
+
+        for step in range(40):
+            service._update(now[0])
+            now[0] += 0.01
+        assert motor.left_pwm.value == 1.0
+    finally:
+        motor.cleanup()
+
+
+def test_only_first_write_of_a_setpoint_is_traced():
+    motor = create_mock_motor_controller()
+    tracer = LatencyTracer()
+    motor.set_tracer(tracer)
+    now = [0.0]
+    service = MotorService(motor, rate=100, max_acceleration=2.0, watchdog_timeout=1.0, clock=lambda: now[0])
+    try:
+        # 0 -> 0.5 rampası 0.25 s sürer; iz yalnızca hedefin ilk uygulanışında verilir
+        service.forward(0.5, cause=TraceContext(1, 0.0, 0.0))
+        for step in range(30):
+            service._update(now[0])
+            now[0] += 0.01
+        assert motor.left_pwm.value == 0.5
+
+        traced = [write for write in tracer.get_writes() if write[0] is not None]
+        assert [write[1] for write in traced] == ["left", "right"]
+        assert tracer.capture_to_actuation.count == 2
+        assert tracer.untraced_writes > 0
+    finally:
+        motor.cleanup()
+
+
+def test_stop_is_applied_without_ramp():
+    motor = create_mock_motor_controller()
+    now = [0.0]
+    service = MotorService(motor, rate=100, max_acceleration=2.0, watchdog_timeout=1.0, clock=lambda: now[0])
+    try:
+        service.forward(0.5)
+        for step in range(30):
+            service._update(now[0])
+            now[0] += 0.01
+        assert motor.left_pwm.value == 0.5
+
+        # Durma komutu bir sonraki adımda uygulanır, yavaşlayarak durulmaz
+        service.stop()
+        service._update(now[0])
+        assert motor.left_pwm.value == motor.right_pwm.value == 0.0
+        assert service.get_stats()["watchdog_trips"] == 0
+    finally:
+        motor.cleanup()
+
+
+def test_watchdog_stops_motors_without_setpoints():
+    motor = create_mock_motor_controller()
+    service = MotorService(motor, rate=100, max_acceleration=None, watchdog_timeout=0.1)
+    service.start()
+    try:
+        service.forward(0.5)
+        assert wait_until(lambda: motor.left_pwm.value == 0.5)
+
+        # Yeni hedef gelmezse motorlar durdurulur, tetiklenme bir kez sayılır
+        assert wait_until(lambda: motor.left_pwm.value == 0.0)
+        time.sleep(0.05)
+        assert service.get_stats()["watchdog_trips"] == 1
+
+        # Yeni hedefle tekrar hareket edilir
+        service.forward(0.5)
+        assert wait_until(lambda: motor.left_pwm.value == 0.5)
+    finally:
+        service.shutdown()
+        motor.cleanup()
+
+
+def test_update_rate_is_independent_of_setpoints():
+    motor = create_mock_motor_controller()
+    service = MotorService(motor, rate=100, watchdog_timeout=1.0)
+    service.start()
+    try:
+        # Hedefler servisten çok daha hızlı gönderilir
+        start_time = time.monotonic()
+        setpoints = 0
+        while time.monotonic() - start_time < 0.3:
+            service.set_motors(0.5, -0.5)
+            setpoints += 1
+        elapsed = time.monotonic() - start_time
+        updates = service.get_stats()["updates"]
+        assert 0 < updates < setpoints
+
+        # Servis periyottan hızlı çalışmaz: geride kalırsa kaçırılan adımlar telafi edilmez
+        assert updates <= elapsed * 100 + 2
+        assert wait_until(lambda: motor.left_pwm.value == 0.5)
+
+        # Kapatılınca motorlar durdurulur
+        service.shutdown()
+        assert motor.left_pwm.value == 0.0
+    finally:
+        service.shutdown()
+        motor.cleanup()
@@ -0,0 +1,112 @@
+import multiprocessing
+import threading
+import time
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from perception_pipeline import SharedFrameRing, PerceptionPipeline, traffic_light_worker, _worker_process
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+
+class SyntheticCamera:
+    """Önce yeşil ışıksız, sonra yeşil ışıklı görüntü veren sahte kamera"""
+
+    def __init__(self):
+        self.frames = [make_synthetic_frame(640, 480, green=False), make_synthetic_frame(640, 480, green=True)]
+        self.count = 0
+
+    def read(self):
+        time.sleep(0.01)
+        self.count += 1
+        return True, self.frames[0 if self.count < 20 else 1]
+
+
+def test_ring_detects_overwritten_frames():
+    ring = SharedFrameRing((4, 4, 3), slots=2, create=True)
+    try:
+        reader = SharedFrameRing((4, 4, 3), slots=2, name=ring.name, lock=ring.lock)
+        for value in range(3):
+            sequence, slot = ring.begin_write()
+            slot[:] = value
+            ring.end_write(sequence, float(value))
+
+        assert reader.latest_sequence() == 2
+        frame, timestamp = reader.get_frame(2)
+        assert frame[0, 0, 0] == 2 and timestamp == 2.0
+        # Görüntü kopyalanmadan paylaşılan bellekten okunur
+        assert not frame.flags.owndata
+
+        # Sıra 0'ın yuvası sıra 2 ile yeniden kullanıldı
+        assert reader.get_frame(0)[0] is None
+        # Sıra 2 okunurken yazıcı iki görüntü daha yazarsa aynı yuvaya gelir
+        sequence = ring.begin_write()[0]
+        ring.end_write(sequence, 3.0)
+        assert reader.is_valid(2)
+        ring.begin_write()
+        assert not reader.is_valid(2)
+        frame = None
+        reader.close()
+    finally:
+        ring.close()
+
+
+def test_overwritten_frame_is_counted_once():
+    ring = SharedFrameRing((4, 4, 3), slots=2, create=True)
+    stop_event = threading.Event()
+    results = multiprocessing.Queue()
+
+    def publish():
+        sequence, _ = ring.begin_write()
+        ring.end_write(sequence, float(sequence))
+
+    def factory():
+        calls = []
+
+        def process(frame):
+            calls.append(None)
+            if len(calls) == 1:
+                publish()  # Sıra 1, sıra 0 işlenirken gelir
+            elif len(calls) == 2:
+                publish()  # Sıra 2 atlanacak,
+                publish()  # sıra 3 işlenen sıra 1'in üzerine yazılır
+            else:
+                stop_event.set()
+            return {}
+
+        return process
+
+    try:
+        publish()
+        _worker_process("test", factory, (), ring.name, ring.shape, ring.slots, ring.lock,
+                        threading.Condition(), stop_event, results)
+        records = [results.get(timeout=1.0), results.get(timeout=1.0)]
+    finally:
+        ring.close()
+
+    # Sıra 1 (üzerine yazıldı) ve sıra 2 (atlandı) bir kez sayılır
+    assert [(record["sequence"], record["frames_dropped"]) for record in records] == [(0, 0), (3, 2)]
+
+
+def test_pipeline_publishes_latest_results():
+    pipeline = PerceptionPipeline(source=SyntheticCamera)
+    pipeline.add_worker("traffic_light", traffic_light_worker, {})
+    pipeline.start()
+    try:
+        deadline = time.monotonic() + 10
+        result = None
+        while time.monotonic() < deadline:
+            result = pipeline.get_latest_result("traffic_light")
+            if result is not None and result["is_green"]:
+                break
+            time.sleep(0.01)
+
+        assert result is not None and result["is_green"]
+        assert result["sequence"] >= 19
+        assert result["completed"] >= result["timestamp"]
+        assert pipeline.is_running()
+    finally:
+        pipeline.stop()
@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from profiling import HISTOGRAM_EDGES, StageHistogram, StageProfiler
+
+
+def test_percentiles_are_bin_upper_edges():
+    histogram = StageHistogram()
+    assert histogram.percentile(50) == 0.0
+
+    # 1.1 ms, [1, 1.26) ms kutusuna; 40 ms, [39.8, 50.1) ms kutusuna düşer
+    for _ in range(97):
+        histogram.add(1.1e-3)
+    for _ in range(2):
+        histogram.add(40e-3)
+    histogram.add(100e-3)
+
+    assert histogram.count == 100
+    assert histogram.total == pytest.approx(97 * 1.1e-3 + 80e-3 + 100e-3)
+    assert histogram.percentile(50) == HISTOGRAM_EDGES[31]
+    assert histogram.percentile(97) == HISTOGRAM_EDGES[31]
+    assert histogram.percentile(99) == HISTOGRAM_EDGES[47]
+    assert histogram.percentile(100) == histogram.maximum == 100e-3
+
+
+def test_percentile_is_capped_by_maximum():
+    histogram = StageHistogram()
+    histogram.add(5e-3)
+    # Kutunun üst sınırı (5.01 ms) gözlenen en büyük değeri aşmaz
+    assert histogram.percentile(50) == 5e-3
+
+    # Son sınırın üstündeki ölçüm taşma kutusuna düşer ve en büyük değer döner
+    histogram.add(20.0)
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(99) == 20.0
+
+
+def test_profiler_accounts_marks_laps_and_iterations():
+    now = [0.0]
+    profiler = StageProfiler(clock=lambda: now[0])
+
+    for start in (0.0, 0.020):
+        now[0] = start
+        profiler.begin_iteration()
+        now[0] = start + 0.002
+        profiler.lap("capture")
+
+        # mark ile lap arasındaki süre yalnızca sonraki aşamaya yazılır
+        now[0] = start + 0.003
+        profiler.mark()
+        now[0] = start + 0.008
+        profiler.lap("detect")
+        now[0] = start + 0.010
+        profiler.end_iteration()
+
+    stats = profiler.get_stats()
+    assert list(stats) == ["capture", "detect", "loop"]
+    assert all(stage["count"] == 2 for stage in stats.values())
+    assert stats["capture"]["mean_ms"] == pytest.approx(2.0)
+    assert stats["detect"]["mean_ms"] == pytest.approx(5.0)
+    assert stats["detect"]["max_ms"] == pytest.approx(5.0)
+    assert stats["loop"]["mean_ms"] == pytest.approx(10.0)
+
+    # İki adım 0 ile 30 ms arasında tamamlandı
+    assert profiler.get_loop_rate() == pytest.approx(2 / 0.030)
+    assert "Döngü hızı: 66.7 Hz" in profiler.summary()
+
+
+def test_end_without_begin_is_not_counted():
+    profiler = StageProfiler(clock=lambda: 1.0)
+    profiler.end_iteration()
+    assert profiler.loop.count == 0
+    assert profiler.get_loop_rate() == 0.0
+    assert profiler.get_stats() == {}
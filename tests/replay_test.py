@@ -0,0 +1,87 @@
+import json
+import subprocess
+import tempfile
+import time
+import cv2
+import sys
+import os
+
+# Ana dizini import path'e ekle
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from main import run_autonomous_mode
+from motor_control import create_mock_motor_controller
+from replay import ReplayCamera, ReplayRecorder
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_synthetic_frame
+
+RED_FRAMES = 8
+GREEN_FRAMES = 6
+
+
+def write_frame_dir(directory):
+    """Önce kırmızı, sonra yeşil ışıklı kareleri görüntü dosyaları olarak kaydeder"""
+    for index in range(RED_FRAMES + GREEN_FRAMES):
+        frame = make_synthetic_frame(640, 480, green=index >= RED_FRAMES)
+        cv2.imwrite(os.path.join(directory, f"{index:04d}.png"), frame)
+
+
+def replay(path, rate=None):
+    detector = TrafficLightDetector()
+    detector.camera = ReplayCamera(path, rate=rate)
+    motor = create_mock_motor_controller()
+    recorder = ReplayRecorder(detector.camera, motor)
+    try:
+        run_autonomous_mode(detector, recorder)
+    finally:
+        detector.stop_camera()
+        motor.cleanup()
+    return recorder, detector.camera.frame_index
+
+
+def test_replay_records_commands_with_frame_index():
+    with tempfile.TemporaryDirectory() as directory:
+        write_frame_dir(directory)
+        recorder, last_frame = replay(directory)
+        assert replay(directory)[0].get_commands() == recorder.get_commands()
+
+    assert last_frame == RED_FRAMES + GREEN_FRAMES - 1
+    # Her karenin komutu, pinlere yazılmasa da kaydedilir: beklerken dur, yeşil
+    # ışığın yandığı ilk karede hareket et ve her karede komutu yenile
+    assert recorder.get_commands() == [(index, 0, 0) for index in range(RED_FRAMES + 1)] + \
+        [(index, 0.5, 0.5) for index in range(RED_FRAMES, last_frame + 1)]
+
+    # Pinlere yalnızca değişen komutlar yazılır; kapanıştaki durma motorun kendisindendir
+    assert recorder.get_writes() == [(RED_FRAMES, "left", 0.5), (RED_FRAMES, "right", 0.5),
+                                     (last_frame, "left", 0.0), (last_frame, "right", 0.0)]
+
+
+def test_fixed_rate_replay_is_paced():
+    with tempfile.TemporaryDirectory() as directory:
+        write_frame_dir(directory)
+        start_time = time.monotonic()
+        recorder, _ = replay(directory, rate=100)
+        elapsed = time.monotonic() - start_time
+
+    assert elapsed >= (RED_FRAMES + GREEN_FRAMES - 1) / 100
+    assert recorder.get_writes()[0] == (RED_FRAMES, "left", 0.5)
+
+
+def test_command_line_replay_output_is_deterministic():
+    with tempfile.TemporaryDirectory() as directory:
+        frames = os.path.join(directory, "frames")
+        os.mkdir(frames)
+        write_frame_dir(frames)
+
+        outputs = []
+        for run in range(2):
+            output = os.path.join(directory, f"run{run}.jsonl")
+            subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--replay", frames,
+                            "--replay-output", output], check=True, capture_output=True, timeout=120)
+            with open(output) as f:
+                outputs.append([json.loads(line) for line in f])
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0][0] == {"frame": 0, "left": 0, "right": 0}
+    assert outputs[0].index({"frame": RED_FRAMES, "left": 0.5, "right": 0.5}) == RED_FRAMES + 1
@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+import pytest
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+
+
+def make_lamp_frame(center=None, green=False, seed=0):
+    """
+    Gürültülü arka plan üzerinde verilen konumda lamba bulunan 640x480 görüntü
+    (ROI: x 160-480, y 0-144). center None ise lamba çizilmez.
+    """
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 80, (480, 640, 3), dtype=np.uint8)
+    if center is not None:
+        cv2.circle(frame, center, 20, (40, 220, 40) if green else (40, 40, 220), -1)
+    return frame
+
+
+def make_tracking_detector(classifier, max_misses=3):
+    detector = TrafficLightDetector()
+    detector.set_color_classifier(classifier)
+    detector.set_tracking(True, max_misses=max_misses, margin=0.5)
+    return detector
+
+
+@pytest.mark.parametrize("classifier", ["hsv", "lut"])
+@pytest.mark.parametrize("green", [False, True])
+def test_window_locks_onto_lamp(classifier, green):
+    detector = make_tracking_detector(classifier)
+    _, info = detector.detect_green_light(make_lamp_frame((260, 72), green))
+    assert info["search_window"] == info["roi"]
+
+    # Pencere lambayı kapsar ve boyutu lamba boyutunun (1 + 2 * kenar payı) katıdır
+    # (yeşil maskenin genişletilmesi lekeyi birkaç piksel büyütür)
+    x1, y1, x2, y2 = detector.track_window
+    assert x1 <= 240 and 280 <= x2 and y1 <= 52 and 92 <= y2
+    assert 82 <= x2 - x1 <= 90 and y2 - y1 == x2 - x1
+
+    # Sonraki karede yalnızca pencere işlenir
+    _, info = detector.detect_green_light(make_lamp_frame((260, 72), green, seed=1))
+    assert (info["green_pixel_count"] > 0) == green
+    assert info["search_window"] == detector.track_window
+
+
+@pytest.mark.parametrize("classifier", ["hsv", "lut"])
+def test_window_follows_moving_lamp(classifier):
+    detector = make_tracking_detector(classifier)
+    for step in range(6):
+        center_x = 260 + 15 * step
+        detector.detect_green_light(make_lamp_frame((center_x, 72), seed=step))
+        x1, y1, x2, y2 = detector.track_window
+
+        # Pencere lambanın merkezinde kalır, boyutu değişmez
+        assert abs((x1 + x2) / 2 - center_x) <= 2
+        assert x2 - x1 == 82 and detector.track_misses == 0
+
+
+@pytest.mark.parametrize("classifier", ["hsv", "lut"])
+def test_tracking_resets_after_max_misses(classifier):
+    detector = make_tracking_detector(classifier, max_misses=3)
+    detector.detect_green_light(make_lamp_frame((260, 72)))
+    window = detector.track_window
+    assert window is not None
+
+    # max_misses kayba kadar pencere korunur
+    for miss in range(1, 4):
+        _, info = detector.detect_green_light(make_lamp_frame(seed=miss))
+        assert detector.track_window == window and detector.track_misses == miss
+        assert info["search_window"] == window
+
+    # Bir sonraki kayıpta takip bırakılır ve tam ROI yeniden aranır
+    detector.detect_green_light(make_lamp_frame(seed=4))
+    assert detector.track_window is None and detector.track_misses == 0
+    _, info = detector.detect_green_light(make_lamp_frame((380, 72), seed=5))
+    assert info["search_window"] == info["roi"]
+    x1, _, x2, _ = detector.track_window
+    assert x1 <= 360 and 400 <= x2
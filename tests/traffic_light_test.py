@@ -1,5 +1,4 @@
 import time
-import cv2
 import sys
 import os
 
@@ -29,7 +28,7 @@ def main():
     
     try:
         print("Yeşil ışık için bekleniyor...")
-        print("Çıkmak için 'q' tuşuna basın")
+        print("Çıkmak için Ctrl+C tuşlarına basın")
         
         detector.start_camera()
         
@@ -51,17 +50,12 @@ def main():
                 
                 print("Araç durdu. Tekrar yeşil ışık bekleniyor...")
                 green_light_detected = False  # Tekrar yeşil ışık algılamaya hazır
-            
-            # 'q' tuşuna basılırsa çık
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
                 
     except KeyboardInterrupt:
         print("Program kullanıcı tarafından durduruldu")
     finally:
         motor.cleanup()
         detector.stop_camera()
-        cv2.destroyAllWindows()
         print("Program sonlandırıldı")
 
 
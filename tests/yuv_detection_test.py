@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+import sys
+import os
+
+# Ana dizini import path'e ekle
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from traffic_light_detection import TrafficLightDetector
+from tests.benchmark_traffic_light import make_labelled_frames, time_function
+
+
+def bgr_to_i420(frame):
+    """BGR görüntüyü (H * 3 / 2, W) boyutunda I420 tamponuna dönüştürür"""
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+
+
+def bgr_to_nv12(frame):
+    """BGR görüntüyü (H * 3 / 2, W) boyutunda NV12 tamponuna dönüştürür"""
+    i420 = bgr_to_i420(frame)
+    height, width = frame.shape[:2]
+    chroma_size = (height // 2) * (width // 2)
+    chroma = i420[height:].reshape(-1)
+    uv = np.stack([chroma[:chroma_size], chroma[chroma_size:]], axis=-1)
+    return np.concatenate([i420[:height].reshape(-1), uv.reshape(-1)]).reshape(i420.shape)
+
+
+def make_frames():
+    """Yeşil, kırmızı ve sönük lambalı etiketli test görüntüleri"""
+    return make_labelled_frames(640, 480, 30, seed=3)
+
+
+def test_i420_matches_bgr_path():
+    bgr_detector = TrafficLightDetector()
+    yuv_detector = TrafficLightDetector()
+
+    for frame, _ in make_frames():
+        bgr_result, bgr_info = bgr_detector.detect_green_light(frame)
+        yuv_result, yuv_info = yuv_detector.detect_green_light_yuv420(bgr_to_i420(frame))
+        assert yuv_result == bgr_result
+        assert abs(yuv_info["green_ratio"] - bgr_info["green_ratio"]) < 0.02
+
+
+def test_nv12_matches_i420():
+    detector = TrafficLightDetector()
+
+    for frame, _ in make_frames():
+        i420_result = detector.detect_green_light_yuv420(bgr_to_i420(frame), layout="I420")
+        nv12_result = detector.detect_green_light_yuv420(bgr_to_nv12(frame), layout="NV12")
+        assert i420_result == nv12_result
+
+
+def test_hsv_range_change_updates_yuv_table():
+    detector = TrafficLightDetector()
+    frame, _ = make_frames()[0]
+    yuv = bgr_to_i420(frame)
+    assert detector.detect_green_light_yuv420(yuv)[0]
+
+    # Yeşil tonunu dışarıda bırakan bir aralık
+    detector.set_hsv_range([100, 50, 50], [130, 255, 255])
+    assert not detector.detect_green_light_yuv420(yuv)[0]
+
+
+def main():
+    """BGR ve YUV420 algılama yollarının süresini karşılaştırır"""
+    frames = make_frames()
+    detector = TrafficLightDetector()
+
+    index = [0]
+
+    def bgr_path():
+        # Kameradan YUV420 geldiğinde BGR yolu önce dönüşüm gerektirir
+        yuv = yuv_frames[index[0] % len(yuv_frames)]
+        detector.detect_green_light(cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420))
+        index[0] += 1
+
+    def yuv_path():
+        detector.detect_green_light_yuv420(yuv_frames[index[0] % len(yuv_frames)])
+        index[0] += 1
+
+    yuv_frames = [bgr_to_i420(frame) for frame, _ in frames]
+    print(f"YUV420 -> BGR -> HSV: {time_function(bgr_path, 200):.3f} ms")
+    print(f"YUV420 doğrudan:      {time_function(yuv_path, 200):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,129 @@
 import cv2
 import numpy as np
 import time
+import asyncio
+import threading
+from camera_capture import FrameGrabber
+from debug_stream import DebugStreamer
+from color_lut import ColorLookupTable, LabelLookupTable, YuvLookupTable
+
+class GreenLightSubscription:
+    def __init__(self, callback=None, confirm_frames=1, once=True):
+        """
+        Yeşil ışık bildirimi aboneliği. Yeşil karar art arda confirm_frames karede
+        doğru olduğunda, tam o karenin işlenmesi sırasında tetiklenir: event
+        ayarlanır, geri çağırma fonksiyonu çağrılır ve bekleyen asyncio future'ları
+        tamamlanır.
+        
+        Args:
+            callback (callable, optional): callback(timestamp, info) şeklinde çağrılır
+            confirm_frames (int): Tetikleme için gereken ardışık yeşil kare sayısı
+            once (bool): True ise ilk tetiklemeden sonra abonelik sona erer
+        """
+        self.callback = callback
+        self.confirm_frames = confirm_frames
+        self.once = once
+        
+        self.event = threading.Event()
+        self.timestamp = None  # Tetikleyen görüntünün yakalanma zamanı (time.monotonic)
+        self.info = None  # Tetikleyen karenin tespit bilgileri
+        self.trigger_count = 0
+        self.active = True
+        self._armed = True  # Yeşil seri kesilene kadar yeniden tetiklenmez
+        self._futures = []
+        self._lock = threading.Lock()
+    
+    def wait(self, timeout=None):
+        """
+        Tetiklenene kadar bekler (threading.Event)
+        
+        Args:
+            timeout (float, optional): Maksimum bekleme süresi (saniye)
+            
+        Returns:
+            bool: Tetiklendiyse True, zaman aşımında False
+        """
+        return self.event.wait(timeout)
+    
+    def as_future(self, loop=None):
+        """
+        Tetiklenince tamamlanan asyncio future'ı döndürür. Algılama başka bir
+        iş parçacığında çalışsa da güvenlidir.
+        
+        Args:
+            loop (asyncio.AbstractEventLoop, optional): Olay döngüsü (varsayılan: çalışan döngü)
+            
+        Returns:
+            asyncio.Future: (timestamp, info) sonucunu veren future
+        """
+        loop = loop or asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self.event.is_set() and self.once:
+                future.set_result((self.timestamp, self.info))
+            else:
+                self._futures.append((loop, future))
+        return future
+    
+    def cancel(self):
+        """Aboneliği sonlandırır"""
+        self.active = False
+    
+    def _fire(self, timestamp, info):
+        """Aboneliği tetikler (algılama iş parçacığında çağrılır)"""
+        self.timestamp = timestamp
+        self.info = info
+        self.trigger_count += 1
+        if self.once:
+            self.active = False
+        
+        # Event kilit altında ayarlanır: as_future araya girerse ya event'i ayarlanmış görür
+        # ya da future'ı buradaki listeye ekler; boş listede tamamlanmadan kalmaz
+        with self._lock:
+            self.event.set()
+            futures, self._futures = self._futures, []
+        for loop, future in futures:
+            loop.call_soon_threadsafe(_resolve_future, future, (timestamp, info))
+        if self.callback is not None:
+            self.callback(timestamp, info)
+
+
+def _resolve_future(future, result):
+    """Future iptal edilmediyse sonucunu ayarlar"""
+    if not future.done():
+        future.set_result(result)
+
 
 class TrafficLightDetector:
-    def __init__(self, camera_index=0, debug=False):
+    def __init__(self, camera_index=0, debug=False, threaded_capture=False):
         """
         Trafik ışığı tespit edici sınıf
         
         Args:
             camera_index (int): Kamera indeksi (varsayılan: 0)
-            debug (bool): Hata ayıklama modunu etkinleştirir (varsayılan: False)
+            debug (bool): Hata ayıklama görüntüsünü MJPEG olarak yayınlar (varsayılan: False)
+            threaded_capture (bool): Görüntüleri arka plan iş parçacığında yakalar (varsayılan: False)
         """
         self.camera_index = camera_index
         self.debug = debug
         self.camera = None
+        self.threaded_capture = threaded_capture
+        self.grabber = None
+        
+        # En son okunan görüntünün sıra numarası ve yakalama zamanı
+        self.frame_sequence = -1
+        self.frame_timestamp = None
         
         # Yeşil renk için HSV aralığı (bu değerler ayarlanabilir)
         self.lower_green = np.array([40, 50, 50])
         self.upper_green = np.array([90, 255, 255])
         
+        # Renk sınıflandırıcı: "hsv" (cvtColor + inRange) veya "lut" (arama tablosu)
+        self.color_classifier = "hsv"
+        self.green_lut = None
+        self.yuv_lut = None  # YUV420 algılama yolu için (ilk kullanımda oluşturulur)
+        self.red_lut = None  # Takipte kırmızı lamba araması için (ilk kullanımda oluşturulur)
+        
         # İlgi alanı (ROI) - trafik ışığının beklendiği bölge
         # Varsayılan olarak görüntünün üst orta kısmı
         self.roi_x = 0.25  # Görüntünün sol kenarından itibaren % olarak
@@ -30,18 +135,141 @@ class TrafficLightDetector:
         self.min_green_area = 100  # Minimum yeşil piksel alanı
         self.green_threshold = 0.05  # Yeşil alan eşik değeri (ROI'nin yüzdesi olarak)
         
+        # Kırmızı lamba için HSV aralıkları (kırmızı renk tonu 0 ve 179 etrafında iki parçadır).
+        # Yalnızca adaptif ROI takibinde lambanın yerini bulmak için kullanılır.
+        self.red_ranges = [
+            (np.array([0, 100, 100]), np.array([10, 255, 255])),
+            (np.array([170, 100, 100]), np.array([179, 255, 255]))
+        ]
+        
+        # Adaptif ROI takibi: lamba bulunduktan sonra yalnızca çevresindeki
+        # küçük pencere işlenir
+        self.tracking_enabled = False
+        self.track_margin = 2.0  # Pencere kenar payı (lamba boyutunun katı olarak)
+        self.track_max_misses = 10  # Tam ROI aramasına dönmeden önceki ardışık kayıp sayısı
+        self.min_lamp_area = 30  # Lamba olarak kabul edilecek minimum leke alanı
+        self.track_window = None  # (x1, y1, x2, y2) piksel koordinatları
+        self.track_misses = 0
+        
+        # Çok çözünürlüklü algılama: renk sınıflandırma küçültülmüş bölgede yapılır.
+        # min_green_area ölçek faktörünün karesiyle otomatik olarak ölçeklenir.
+        self.detection_scale = 1.0
+        self.refine_detection = False  # Aday lekelerin çevresini tam çözünürlükte yeniden işler
+        self._scaled_kernel = None
+        self._yuv_kernel = None
+        self._segmentation_kernel = None  # (bölütleme ölçeği, çekirdek)
+        
+        # Görüntü değişim kapısı: sahne değişmediyse tam işlem atlanır ve
+        # önceki sonuç döndürülür
+        self.gating_enabled = False
+        self.gate_threshold = 2.0  # Küçük resimler arası ortalama mutlak fark eşiği (0-255)
+        self.gate_thumbnail_size = (32, 16)  # Küçük resim boyutu (genişlik, yükseklik)
+        self.gate_max_skipped = 15  # Ardışık atlanabilecek maksimum kare sayısı (0: sınırsız)
+        self._gate_reference = None  # Son tam işlenen karenin küçük resmi
+        self._gate_result = None
+        self._gate_skipped_in_row = 0
+        
+        # İşlem sayaçları
+        self.frames_processed = 0
+        self.frames_skipped = 0
+        
+        # Aşama süre ölçümü (profiling.StageProfiler). None ise ölçüm yapılmaz.
+        self.profiler = None
+        
+        # Yeşil ışık bildirimi abonelikleri ve ardışık yeşil kare sayısı
+        self._green_subscriptions = []
+        self._green_streak = 0
+        
+        # Debug yayını: ilk debug karesinde başlatılır (http://127.0.0.1:8080/). Varsayılan
+        # olarak yalnızca bu cihazdan erişilir; ağdan izlemek için host açıkça verilmelidir.
+        self.debug_host = "127.0.0.1"
+        self.debug_port = 8080
+        self.debug_max_fps = 10
+        self.debug_stream = None
+        
+        # Gürültü azaltma için morfolojik çekirdek (her karede yeniden oluşturulmaz)
+        self.kernel = np.ones((5, 5), np.uint8)
+        
+        # Gürültü azaltma yöntemi: "reference" (erozyon + 2x genişletme),
+        # "downsampled" (yarı çözünürlükte açma) veya "components" (bağlı bileşen alanı)
+        self.denoise_method = "reference"
+        self._half_kernels = {}
+        
+        # ROI geometrisi önbelleği: (görüntü boyutu, ROI koordinatları)
+        self._roi_cache = None
+        
+        # Ara sonuçlar için önceden ayrılmış tamponlar. Etkinse ısınmadan sonra
+        # karelerde yeni bellek ayrılmaz.
+        self.reuse_buffers = True
+        self._buffers = {}
+        
     def start_camera(self):
         """Kamerayı başlatır"""
         self.camera = cv2.VideoCapture(self.camera_index)
         if not self.camera.isOpened():
             raise RuntimeError("Kamera başlatılamadı!")
+        
+        if self.threaded_capture:
+            # Sürücü tamponunda eski görüntü birikmesin
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.grabber = FrameGrabber(self.camera)
+            self.grabber.start()
         return self.camera.isOpened()
     
     def stop_camera(self):
-        """Kamerayı durdurur"""
+        """Kamerayı ve debug yayınını durdurur"""
+        if self.debug_stream is not None:
+            self.debug_stream.stop()
+            self.debug_stream = None
+        if self.grabber is not None:
+            self.grabber.stop()
+            self.grabber = None
         if self.camera is not None:
             self.camera.release()
     
+    def read_frame(self, timeout=None):
+        """
+        Kameradan bir görüntü okur. Arka plan yakalama etkinse, en son işlenen
+        görüntüden daha yeni bir görüntü gelene kadar bekler.
+        
+        Args:
+            timeout (float, optional): Maksimum bekleme süresi (saniye). Yalnızca arka plan yakalamada kullanılır.
+            
+        Returns:
+            bool: Görüntü alındıysa True
+            np.array: Görüntü
+        """
+        if self.camera is None:
+            self.start_camera()
+        
+        if self.grabber is not None:
+            frame, sequence, timestamp = self.grabber.wait_for_frame(self.frame_sequence, timeout)
+            if frame is None:
+                return False, None
+        else:
+            ret, frame = self.camera.read()
+            if not ret:
+                return False, None
+            sequence = self.frame_sequence + 1
+            timestamp = time.monotonic()
+        
+        self.frame_sequence = sequence
+        self.frame_timestamp = timestamp
+        return True, frame
+    
+    def get_latest_frame(self):
+        """
+        En son yakalanan görüntüyü beklemeden döndürür (yalnızca arka plan yakalamada)
+        
+        Returns:
+            np.array: En son görüntü (henüz görüntü yoksa None)
+            int: Görüntü sıra numarası
+            float: Yakalama zamanı (time.monotonic)
+        """
+        if self.grabber is None:
+            return None, -1, None
+        return self.grabber.get_latest()
+    
     def set_roi(self, x, y, width, height):
         """
         İlgi alanını (ROI) ayarlar
@@ -56,6 +284,9 @@ class TrafficLightDetector:
         self.roi_y = max(0, min(1, y))
         self.roi_width = max(0, min(1, width))
         self.roi_height = max(0, min(1, height))
+        self._roi_cache = None
+        self._gate_reference = None
+        self.reset_tracking()
     
     def set_green_threshold(self, threshold):
         """
@@ -65,6 +296,7 @@ class TrafficLightDetector:
             threshold (float): Yeşil alan eşik değeri (0-1 arası)
         """
         self.green_threshold = max(0, min(1, threshold))
+        self._gate_reference = None
     
     def set_hsv_range(self, lower_green, upper_green):
         """
@@ -76,28 +308,530 @@ class TrafficLightDetector:
         """
         self.lower_green = np.array(lower_green)
         self.upper_green = np.array(upper_green)
+        self._gate_reference = None
+        
+        # Arama tablosu yalnızca aralık değiştiyse yeniden oluşturulur
+        if self.green_lut is not None:
+            self.green_lut.set_range(self.lower_green, self.upper_green)
+        if self.yuv_lut is not None:
+            self.yuv_lut.set_range(self.lower_green, self.upper_green)
     
-    def detect_green_light(self, frame=None):
+    def set_color_classifier(self, classifier):
         """
-        Görüntüde yeşil trafik ışığını tespit eder
+        Renk sınıflandırma yöntemini seçer
         
         Args:
-            frame (np.array, optional): İşlenecek görüntü. None ise kameradan alınır.
+            classifier (str): "hsv" (cvtColor + inRange) veya "lut" (BGR->maske arama tablosu)
+        """
+        if classifier not in ("hsv", "lut"):
+            raise ValueError(f"Bilinmeyen renk sınıflandırıcı: {classifier}")
+        
+        if classifier == "lut" and self.green_lut is None:
+            self.green_lut = ColorLookupTable(self.lower_green, self.upper_green)
+        self.color_classifier = classifier
+        self._gate_reference = None
+    
+    def set_tracking(self, enabled, max_misses=10, margin=2.0):
+        """
+        Adaptif ROI takibini ayarlar. Etkinse, yeşil veya kırmızı lamba bulunduktan
+        sonra yalnızca lambanın çevresindeki küçük pencere işlenir.
+        
+        Args:
+            enabled (bool): Takibi etkinleştirir
+            max_misses (int): Tam ROI aramasına dönmeden önceki ardışık kayıp sayısı
+            margin (float): Pencere kenar payı (lamba boyutunun katı olarak)
+        """
+        self.tracking_enabled = enabled
+        self.track_max_misses = max(0, int(max_misses))
+        self.track_margin = max(0.0, margin)
+        self.reset_tracking()
+    
+    def reset_tracking(self):
+        """Takip penceresini bırakır, sonraki karede tam ROI araması yapılır"""
+        self.track_window = None
+        self.track_misses = 0
+    
+    def set_detection_scale(self, scale, refine=False):
+        """
+        Algılama ölçeğini ayarlar. Renk sınıflandırma ve morfolojik işlemler
+        küçültülmüş bölgede yapılır; işlem maliyeti ölçeğin karesiyle azalır.
+        
+        Args:
+            scale (float): Ölçek faktörü (0-1 arası, 1: tam çözünürlük)
+            refine (bool): Aday lekelerin çevresini tam çözünürlükte yeniden işler
+        """
+        if not 0 < scale <= 1:
+            raise ValueError(f"Ölçek faktörü 0 ile 1 arasında olmalı: {scale}")
+        
+        self.detection_scale = float(scale)
+        self.refine_detection = refine
+        
+        self._scaled_kernel = self._kernel_for_scale(scale)
+        self._gate_reference = None
+    
+    def _kernel_for_scale(self, scale):
+        """
+        Morfolojik çekirdeği verilen ölçeğe göre küçültür (tek boyutlu kalacak şekilde)
+        
+        Args:
+            scale (float): Ölçek faktörü
             
         Returns:
-            bool: Yeşil ışık tespit edilirse True, aksi halde False
-            dict: Tespit sonuçları hakkında ek bilgiler
+            np.array: Ölçeklenmiş çekirdek
         """
-        if frame is None:
-            if self.camera is None:
-                self.start_camera()
+        kernel_size = max(1, int(round(self.kernel.shape[0] * scale)))
+        if kernel_size % 2 == 0:
+            kernel_size += 1
+        return np.ones((kernel_size, kernel_size), np.uint8)
+    
+    def set_denoise_method(self, method):
+        """
+        Maske gürültü azaltma yöntemini seçer
+        
+        Args:
+            method (str): "reference" (erozyon + 2x genişletme, varsayılan),
+                          "downsampled" (maske yarı çözünürlükte açılır) veya
+                          "components" (bağlı bileşenler alan/boyuta göre süzülür)
+        """
+        if method not in ("reference", "downsampled", "components"):
+            raise ValueError(f"Bilinmeyen gürültü azaltma yöntemi: {method}")
+        self.denoise_method = method
+        self._gate_reference = None
+    
+    def set_change_gating(self, enabled, threshold=2.0, thumbnail_size=(32, 16), max_skipped=15):
+        """
+        Görüntü değişim kapısını ayarlar. Etkinse, ROI'nin küçük resmi son tam
+        işlenen kareden yeterince farklı değilse önceki sonuç döndürülür.
+        
+        Args:
+            enabled (bool): Değişim kapısını etkinleştirir
+            threshold (float): Ortalama mutlak fark eşiği (0-255 arası)
+            thumbnail_size (tuple): Küçük resim boyutu (genişlik, yükseklik)
+            max_skipped (int): Ardışık atlanabilecek maksimum kare sayısı (0: sınırsız)
+        """
+        self.gating_enabled = enabled
+        self.gate_threshold = max(0.0, threshold)
+        self.gate_thumbnail_size = (max(1, int(thumbnail_size[0])), max(1, int(thumbnail_size[1])))
+        self.gate_max_skipped = max(0, int(max_skipped))
+        self._gate_reference = None
+        self._gate_result = None
+        self._gate_skipped_in_row = 0
+    
+    def get_processing_stats(self):
+        """
+        Tam işlenen ve atlanan kare sayılarını döndürür
+        
+        Returns:
+            dict: İşlem sayaçları
+        """
+        total = self.frames_processed + self.frames_skipped
+        return {
+            "frames_processed": self.frames_processed,
+            "frames_skipped": self.frames_skipped,
+            "skip_ratio": self.frames_skipped / total if total > 0 else 0
+        }
+    
+    def _scene_unchanged(self, roi):
+        """
+        ROI'nin küçük resmini son tam işlenen kareninkiyle karşılaştırır
+        
+        Args:
+            roi (np.array): Tam ROI
             
-            ret, frame = self.camera.read()
-            if not ret:
-                return False, {"error": "Kameradan görüntü alınamadı"}
+        Returns:
+            bool: Sahne değişmediyse True
+        """
+        width, height = self.gate_thumbnail_size
+        thumbnail = cv2.resize(roi, (width, height), dst=self._get_buffer("gate_thumbnail", (height, width, 3)),
+                               interpolation=cv2.INTER_AREA)
+        
+        if self._gate_reference is not None and self._gate_reference.shape == thumbnail.shape:
+            difference = cv2.absdiff(thumbnail, self._gate_reference,
+                                     dst=self._get_buffer("gate_difference", thumbnail.shape))
+            mean_difference = sum(cv2.mean(difference)[:3]) / 3
+            
+            can_skip = self.gate_max_skipped == 0 or self._gate_skipped_in_row < self.gate_max_skipped
+            if mean_difference < self.gate_threshold and can_skip:
+                return True
+        
+        # Referans yalnızca tam işlenen karelerde güncellenir; böylece yavaş
+        # değişimler birikerek fark edilir
+        if self._gate_reference is None or self._gate_reference.shape != thumbnail.shape:
+            self._gate_reference = thumbnail.copy()
+        else:
+            np.copyto(self._gate_reference, thumbnail)
+        return False
+    
+    def _locate_lamp(self, region, green_mask, green_pixel_count, min_area, red_mask=None):
+        """
+        Bölgedeki en büyük yeşil veya kırmızı lamba lekesini bulur
+        
+        Args:
+            region (np.array): BGR görüntü bölgesi. Yeşil maskesi _compute_green_mask ile bu
+                               bölgeden hesaplanmış olmalıdır (renk dönüşümü yeniden kullanılır).
+            green_mask (np.array): Bölgenin gürültüsü azaltılmış yeşil maskesi
+            green_pixel_count (int): Maskedeki yeşil piksel sayısı
+            min_area (float): Lamba olarak kabul edilecek minimum leke alanı
+            red_mask (np.array, optional): Bölgenin hazır kırmızı lamba maskesi (ör. paylaşılan bölütlemeden)
+            
+        Returns:
+            tuple: Bölge koordinatlarında (x, y, genişlik, yükseklik) veya bulunamazsa None
+        """
+        if green_pixel_count > 0:
+            # Gürültü azaltma maskeyi küçültmüş olabilir
+            lamp_mask = green_mask
+        elif red_mask is not None:
+            lamp_mask = red_mask
+        else:
+            # Yeşil yoksa kırmızı lambayı ara. Yeşil maske için yapılan renk dönüşümü
+            # (HSV görüntüsü veya arama tablosu indeksleri) yeniden kullanılır.
+            mask_shape = region.shape[:2]
+            lamp_mask = self._get_buffer("track_red", mask_shape)
+            if self.color_classifier == "lut":
+                if self.red_lut is None:
+                    self.red_lut = LabelLookupTable([self.red_ranges])
+                index = self.green_lut.last_index()
+                if index is None or index.shape != mask_shape:
+                    self.green_lut.classify(region, out=self._get_buffer("track_green", mask_shape))
+                    index = self.green_lut.last_index()
+                lamp_mask = self.red_lut.lookup(index, out=lamp_mask)
+            else:
+                hsv = self._buffers.get("hsv")
+                if hsv is None or hsv.shape != region.shape:
+                    hsv = cv2.cvtColor(region, cv2.COLOR_BGR2HSV, dst=self._get_buffer("hsv", region.shape))
+                red_part = self._get_buffer("track_red_part", mask_shape)
+                lamp_mask = cv2.inRange(hsv, self.red_ranges[0][0], self.red_ranges[0][1], dst=lamp_mask)
+                for lower, upper in self.red_ranges[1:]:
+                    red_part = cv2.inRange(hsv, lower, upper, dst=red_part)
+                    cv2.bitwise_or(lamp_mask, red_part, dst=lamp_mask)
+        
+        # Lamba yoksa bileşen etiketleme atlanır
+        if not cv2.countNonZero(lamp_mask):
+            return None
+        
+        count, _, stats, _ = cv2.connectedComponentsWithStats(lamp_mask)
+        if count < 2:
+            return None
+        
+        # Maske ile bölge arasındaki ölçek farkı
+        scale_x = region.shape[1] / lamp_mask.shape[1]
+        scale_y = region.shape[0] / lamp_mask.shape[0]
+        
+        # 0 etiketi arka plandır
+        largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+        if stats[largest, cv2.CC_STAT_AREA] * scale_x * scale_y < min_area:
+            return None
+        
+        x, y, w, h = stats[largest, :4]
+        return int(x * scale_x), int(y * scale_y), int(w * scale_x), int(h * scale_y)
+    
+    def _update_tracking(self, roi_box, region_origin, lamp_box):
+        """
+        Takip penceresini bulunan lambaya göre günceller
+        
+        Args:
+            roi_box (tuple): Tam ROI (x1, y1, x2, y2)
+            region_origin (tuple): İşlenen bölgenin görüntüdeki sol üst köşesi (x, y)
+            lamp_box (tuple): Bölge koordinatlarında lamba (x, y, genişlik, yükseklik) veya None
+        """
+        if lamp_box is None:
+            if self.track_window is not None:
+                self.track_misses += 1
+                if self.track_misses > self.track_max_misses:
+                    self.reset_tracking()
+            return
+        
+        self.track_misses = 0
+        roi_x1, roi_y1, roi_x2, roi_y2 = roi_box
+        x, y, w, h = lamp_box
+        center_x = region_origin[0] + x + w / 2
+        center_y = region_origin[1] + y + h / 2
+        
+        if self.track_window is None:
+            # Pencere boyutu kilitlenirken belirlenir ve takip süresince sabit kalır,
+            # böylece tamponlar her karede yeniden ayrılmaz
+            window_w = min(roi_x2 - roi_x1, int(w * (1 + 2 * self.track_margin)))
+            window_h = min(roi_y2 - roi_y1, int(h * (1 + 2 * self.track_margin)))
+        else:
+            window_w = self.track_window[2] - self.track_window[0]
+            window_h = self.track_window[3] - self.track_window[1]
+        
+        # Pencereyi lambaya ortala ve ROI içinde tut
+        x1 = int(max(roi_x1, min(roi_x2 - window_w, center_x - window_w / 2)))
+        y1 = int(max(roi_y1, min(roi_y2 - window_h, center_y - window_h / 2)))
+        self.track_window = (x1, y1, x1 + window_w, y1 + window_h)
+    
+    def _downscale(self, region, scale):
+        """
+        Bölgeyi verilen ölçeğe küçültür. Önce tam 2 kat küçültmeler (piramit
+        seviyeleri) yapılır; INTER_AREA'nın 2 kat için hızlı yolu genel orandan
+        çok daha ucuzdur. Kalan oran varsa son bir yeniden boyutlandırma yapılır.
+        
+        Args:
+            region (np.array): BGR görüntü bölgesi
+            scale (float): Ölçek faktörü (0-1 arası)
+            
+        Returns:
+            np.array: Küçültülmüş bölge
+        """
+        work = region
+        remaining = scale
+        level = 0
+        while remaining <= 0.5 and work.shape[0] >= 2 and work.shape[1] >= 2:
+            half_height, half_width = work.shape[0] // 2, work.shape[1] // 2
+            # Tek boyutlarda hızlı yol kullanılamadığından son satır/sütun atlanır
+            work = cv2.resize(work[:half_height * 2, :half_width * 2], (half_width, half_height),
+                              dst=self._get_buffer(f"pyramid{level}", (half_height, half_width, 3)),
+                              interpolation=cv2.INTER_AREA)
+            remaining *= 2
+            level += 1
+        
+        if remaining < 0.999:
+            scaled_width = max(1, int(round(work.shape[1] * remaining)))
+            scaled_height = max(1, int(round(work.shape[0] * remaining)))
+            work = cv2.resize(work, (scaled_width, scaled_height),
+                              dst=self._get_buffer("scaled", (scaled_height, scaled_width, 3)),
+                              interpolation=cv2.INTER_AREA)
+        return work
+    
+    def _denoise(self, mask, kernel, buffer_prefix=""):
+        """
+        Maskedeki gürültüyü seçili yönteme göre azaltır ve yeşil piksel sayısını
+        referans yöntemle (erozyon + 2x genişletme) karşılaştırılabilir biçimde döndürür
+        
+        Args:
+            mask (np.array): Renk sınıflandırma maskesi
+            kernel (np.array): Referans yöntemin morfolojik çekirdeği
+            buffer_prefix (str): Tampon adlarının öneki
+            
+        Returns:
+            np.array: Gürültüsü azaltılmış maske (yöntem maskeyi küçültebilir)
+            int: Maske çözünürlüğünde yeşil piksel sayısı
+        """
+        mask_shape = mask.shape[:2]
+        profiler = self.profiler
+        
+        if self.denoise_method == "downsampled" and mask_shape[0] >= 2 and mask_shape[1] >= 2:
+            # Maskeyi 2 kat küçült (çoğunluk oyu), küçük çekirdekle aç ve genişlet
+            half_height, half_width = mask_shape[0] // 2, mask_shape[1] // 2
+            small = cv2.resize(mask[:half_height * 2, :half_width * 2], (half_width, half_height),
+                               dst=self._get_buffer(buffer_prefix + "denoise_small", (half_height, half_width)),
+                               interpolation=cv2.INTER_AREA)
+            cv2.threshold(small, 127, 255, cv2.THRESH_BINARY, dst=small)
+            
+            half_kernel = self._half_kernels.get(kernel.shape[0])
+            if half_kernel is None:
+                half_kernel = self._kernel_for_scale(kernel.shape[0] / self.kernel.shape[0] / 2)
+                self._half_kernels[kernel.shape[0]] = half_kernel
+            
+            small_shape = small.shape
+            small = cv2.erode(small, half_kernel, dst=self._get_buffer(buffer_prefix + "denoise_eroded", small_shape))
+            small = cv2.dilate(small, half_kernel, dst=self._get_buffer(buffer_prefix + "denoise_dilated", small_shape),
+                               iterations=2)
+            if profiler:
+                profiler.lap("morphology")
+            area_scale = (mask_shape[0] * mask_shape[1]) / (small_shape[0] * small_shape[1])
+            green_pixel_count = int(round(cv2.countNonZero(small) * area_scale))
+            if profiler:
+                profiler.lap("count")
+            return small, green_pixel_count
+        
+        if self.denoise_method == "components":
+            # Erozyonda kaybolacak kadar küçük bileşenleri at; kalanların alanını
+            # referans yöntemdeki net genişlemeye göre düzelt
+            _, _, stats, _ = cv2.connectedComponentsWithStats(
+                mask, labels=self._get_buffer(buffer_prefix + "labels", mask_shape, np.int32))
+            widths = stats[1:, cv2.CC_STAT_WIDTH]
+            heights = stats[1:, cv2.CC_STAT_HEIGHT]
+            areas = stats[1:, cv2.CC_STAT_AREA]
+            size = kernel.shape[0]
+            fill = areas / np.maximum(widths * heights, 1)
+            # Erozyondan yalnızca çekirdek boyutunda dolu bir kare içeren lekeler kurtulur;
+            # seyrek gürültü zincirleri düşük doluluk oranıyla elenir
+            keep = (widths >= size) & (heights >= size) & (areas >= size * size) & (fill >= 0.5)
+            
+            # Erozyon + 2x genişletme lekeyi her yönde size // 2 piksel büyütür
+            grow = 2 * (size // 2)
+            estimated = ((widths[keep] + grow) * (heights[keep] + grow) * fill[keep]).sum()
+            if profiler:
+                profiler.lap("morphology")
+            return mask, int(round(estimated))
+        
+        # Referans yöntem
+        mask = cv2.erode(mask, kernel, dst=self._get_buffer(buffer_prefix + "eroded", mask_shape), iterations=1)
+        mask = cv2.dilate(mask, kernel, dst=self._get_buffer(buffer_prefix + "dilated", mask_shape), iterations=2)
+        if profiler:
+            profiler.lap("morphology")
+        green_pixel_count = cv2.countNonZero(mask)
+        if profiler:
+            profiler.lap("count")
+        return mask, green_pixel_count
+    
+    def _compute_green_mask(self, region, kernel, buffer_prefix=""):
+        """
+        Bölge için gürültüsü azaltılmış yeşil maskeyi hesaplar
+        
+        Args:
+            region (np.array): BGR görüntü bölgesi
+            kernel (np.array): Morfolojik çekirdek
+            buffer_prefix (str): Tampon adlarının öneki (farklı boyutlu bölgeler için)
+            
+        Returns:
+            np.array: Yeşil maske (0 veya 255). Gürültü azaltma yöntemi maskeyi küçültebilir.
+            int: Bölge çözünürlüğünde yeşil piksel sayısı
+        """
+        mask_shape = region.shape[:2]
+        profiler = self.profiler
+        
+        if self.color_classifier == "lut":
+            # Arama tablosu ile BGR'den doğrudan maske oluştur
+            mask = self.green_lut.classify(region, out=self._get_buffer(buffer_prefix + "mask", mask_shape))
+            if profiler:
+                profiler.lap("color_lookup")
+        else:
+            # HSV'ye dönüştür
+            hsv = cv2.cvtColor(region, cv2.COLOR_BGR2HSV, dst=self._get_buffer(buffer_prefix + "hsv", region.shape))
+            if profiler:
+                profiler.lap("color_conversion")
+            
+            # Yeşil renk maskesi oluştur
+            mask = cv2.inRange(hsv, self.lower_green, self.upper_green,
+                               dst=self._get_buffer(buffer_prefix + "mask", mask_shape))
+            if profiler:
+                profiler.lap("threshold")
+        
+        # Gürültüyü azalt
+        return self._denoise(mask, kernel, buffer_prefix)
+    
+    def subscribe_green(self, callback=None, confirm_frames=1, once=True):
+        """
+        Yeşil ışık bildirimine abone olur. Bildirim, yeşil kararın (art arda
+        confirm_frames karede) doğru olduğu karenin işlenmesi sırasında, hareket
+        kararı için beklemeden verilir; tetikleyen görüntünün yakalanma zamanı
+        abonelikte ve geri çağırmada bulunur.
+        
+        Args:
+            callback (callable, optional): callback(timestamp, info) şeklinde çağrılır
+            confirm_frames (int): Tetikleme için gereken ardışık yeşil kare sayısı
+            once (bool): True ise ilk tetiklemeden sonra abonelik sona erer; False ise
+                         her yeni yeşil seride yeniden tetiklenir
+            
+        Returns:
+            GreenLightSubscription: Abonelik (event, wait(), as_future(), cancel())
+        """
+        if confirm_frames < 1:
+            raise ValueError("Onay kare sayısı en az 1 olmalıdır")
+        
+        subscription = GreenLightSubscription(callback, confirm_frames, once)
+        self._green_subscriptions = self._green_subscriptions + [subscription]
+        return subscription
+    
+    def _notify_green(self, is_green_light, timestamp, info):
+        """
+        Ardışık yeşil kare sayısını günceller ve koşulu sağlanan abonelikleri tetikler
+        
+        Args:
+            is_green_light (bool): Bu karenin kararı
+            timestamp (float): Görüntünün yakalanma zamanı (None ise şimdi)
+            info (dict): Tespit bilgileri
+        """
+        subscriptions = self._green_subscriptions
+        if is_green_light:
+            self._green_streak += 1
+        else:
+            self._green_streak = 0
+        
+        if any(not subscription.active for subscription in subscriptions):
+            subscriptions = self._green_subscriptions = [s for s in subscriptions if s.active]
+        if not subscriptions:
+            return
+        
+        if timestamp is None:
+            timestamp = time.monotonic()
+        for subscription in subscriptions:
+            if not is_green_light:
+                subscription._armed = True
+            elif subscription._armed and self._green_streak >= subscription.confirm_frames:
+                subscription._armed = False
+                subscription._fire(timestamp, info)
+    
+    def set_profiler(self, profiler):
+        """
+        Aşama süre ölçümünü ayarlar
+        
+        Args:
+            profiler (profiling.StageProfiler): Ölçüm nesnesi (None: ölçüm kapalı)
+        """
+        self.profiler = profiler
+    
+    def set_debug_stream(self, port=8080, max_fps=10, host="127.0.0.1"):
+        """
+        Debug yayınının ayarlarını değiştirir. Yayın çalışıyorsa durdurulur ve
+        sonraki debug karesinde yeni ayarlarla yeniden başlatılır.
+        
+        Args:
+            port (int): HTTP sunucu portu (0: boş bir port seçilir)
+            max_fps (float): Yayının en yüksek kare hızı
+            host (str): Sunucunun dinleyeceği adres ("0.0.0.0": tüm ağ arayüzleri)
+        """
+        if max_fps <= 0:
+            raise ValueError("Debug yayını kare hızı pozitif olmalıdır")
+        
+        self.debug_host = host
+        self.debug_port = port
+        self.debug_max_fps = max_fps
+        if self.debug_stream is not None:
+            self.debug_stream.stop()
+            self.debug_stream = None
+    
+    def set_buffer_reuse(self, enabled):
+        """
+        Ara sonuçlar için önceden ayrılmış tamponların kullanımını açar/kapatır
+        
+        Args:
+            enabled (bool): True ise tamponlar karelerde yeniden kullanılır
+        """
+        self.reuse_buffers = enabled
+        self._buffers = {}
+    
+    def _get_buffer(self, name, shape, dtype=np.uint8):
+        """
+        Verilen isim ve boyutta bir tampon döndürür. Tampon yeniden kullanım
+        kapalıysa None döner (OpenCV yeni dizi ayırır).
+        
+        Args:
+            name (str): Tampon adı
+            shape (tuple): Tampon boyutu
+            dtype (np.dtype): Tampon veri tipi (varsayılan: uint8)
+            
+        Returns:
+            np.array: Tampon veya None
+        """
+        if not self.reuse_buffers:
+            return None
+        
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            self._buffers[name] = buffer
+        return buffer
+    
+    def _get_roi_geometry(self, frame_shape):
+        """
+        ROI piksel koordinatlarını döndürür. Sonuç görüntü boyutu ve set_roi
+        çağrısı değişene kadar önbellekte tutulur.
+        
+        Args:
+            frame_shape (tuple): Görüntü boyutu
+            
+        Returns:
+            tuple: (roi_x1, roi_y1, roi_x2, roi_y2)
+        """
+        if self._roi_cache is not None and self._roi_cache[0] == frame_shape:
+            return self._roi_cache[1]
         
         # Görüntü boyutlarını al
-        height, width = frame.shape[:2]
+        height, width = frame_shape[:2]
         
         # ROI koordinatlarını hesapla
         roi_x1 = int(width * self.roi_x)
@@ -105,63 +839,403 @@ class TrafficLightDetector:
         roi_x2 = int(roi_x1 + width * self.roi_width)
         roi_y2 = int(roi_y1 + height * self.roi_height)
         
-        # ROI'yi kes
-        roi = frame[roi_y1:roi_y2, roi_x1:roi_x2]
+        self._roi_cache = (frame_shape, (roi_x1, roi_y1, roi_x2, roi_y2))
+        return self._roi_cache[1]
+    
+    def get_roi_box(self, frame_shape):
+        """
+        ROI'nin görüntü koordinatlarını döndürür (ör. paylaşılan bölütlemenin
+        yalnızca bu bölgeyi işlemesi için)
         
-        # HSV'ye dönüştür
-        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        Args:
+            frame_shape (tuple): Görüntü boyutu
+            
+        Returns:
+            tuple: (x1, y1, x2, y2)
+        """
+        return self._get_roi_geometry(frame_shape)
+    
+    def detect_green_light(self, frame=None, timestamp=None, sequence=None, segmentation=None):
+        """
+        Görüntüde yeşil trafik ışığını tespit eder
         
-        # Yeşil renk maskesi oluştur
-        mask = cv2.inRange(hsv, self.lower_green, self.upper_green)
+        Args:
+            frame (np.array, optional): İşlenecek görüntü. None ise kameradan alınır.
+            timestamp (float, optional): Görüntünün yakalanma zamanı (time.monotonic).
+                Verilmezse en son read_frame ile okunan görüntünün zamanı kullanılır.
+            sequence (int, optional): Görüntü sıra numarası. Verilmezse en son
+                read_frame ile okunan görüntünün sıra numarası kullanılır.
+            segmentation (color_segmentation.SegmentationResult, optional): Görüntünün
+                paylaşılan renk bölütlemesi. Verilirse renk sınıflandırma yapılmaz;
+                "green_lamp" ve "red_lamp" sınıfları sorgulanır (detection_scale yerine
+                bölütleme ölçeği geçerlidir).
+            
+        Returns:
+            bool: Yeşil ışık tespit edilirse True, aksi halde False
+            dict: Tespit sonuçları hakkında ek bilgiler (frame_sequence ve
+                  capture_timestamp ile kararın hangi görüntüye ait olduğu)
+        """
+        profiler = self.profiler
+        if profiler:
+            profiler.mark()
         
-        # Gürültüyü azaltmak için morfolojik işlemler
-        kernel = np.ones((5, 5), np.uint8)
-        mask = cv2.erode(mask, kernel, iterations=1)
-        mask = cv2.dilate(mask, kernel, iterations=2)
+        if frame is None:
+            ret, frame = self.read_frame()
+            if not ret:
+                return False, {"error": "Kameradan görüntü alınamadı"}
+            if profiler:
+                profiler.lap("capture")
+        if timestamp is None:
+            timestamp = self.frame_timestamp
+        if sequence is None:
+            sequence = self.frame_sequence
+        
+        # ROI koordinatlarını al
+        roi_x1, roi_y1, roi_x2, roi_y2 = self._get_roi_geometry(frame.shape)
+        
+        # Sahne değişmediyse önceki sonucu döndür
+        if self.gating_enabled:
+            unchanged = self._scene_unchanged(frame[roi_y1:roi_y2, roi_x1:roi_x2])
+            if profiler:
+                profiler.lap("change_gate")
+            if unchanged and self._gate_result is not None:
+                self.frames_skipped += 1
+                self._gate_skipped_in_row += 1
+                # Karar önceki kareden gelir ama bu görüntüye aittir
+                is_green_light, info = self._gate_result
+                info = dict(info, frame_sequence=sequence, capture_timestamp=timestamp)
+                self._notify_green(is_green_light, timestamp, info)
+                return is_green_light, info
+            self._gate_skipped_in_row = 0
+        
+        # İşlenecek bölge: takip penceresi varsa yalnızca pencere, yoksa tam ROI
+        if self.tracking_enabled and self.track_window is not None:
+            region_x1, region_y1, region_x2, region_y2 = self.track_window
+        else:
+            region_x1, region_y1, region_x2, region_y2 = roi_x1, roi_y1, roi_x2, roi_y2
+        
+        # Bölgeyi kes
+        roi = frame[region_y1:region_y2, region_x1:region_x2]
+        region_box = (region_x1, region_y1, region_x2, region_y2)
+        
+        if segmentation is not None:
+            # Paylaşılan bölütlemede bölgenin etiketleri kullanılır (ölçeği bölütlemeninkidir)
+            work, _ = segmentation.region(region_box)
+            area_scale = (work.shape[0] * work.shape[1]) / (roi.shape[0] * roi.shape[1]) if roi.size > 0 else 1.0
+            if self._segmentation_kernel is None or self._segmentation_kernel[0] != segmentation.scale_x:
+                self._segmentation_kernel = (segmentation.scale_x, self._kernel_for_scale(segmentation.scale_x))
+            kernel = self._segmentation_kernel[1]
+        # Algılama ölçeği 1'den küçükse bölgeyi küçült
+        elif self.detection_scale < 1.0 and roi.size > 0:
+            work = self._downscale(roi, self.detection_scale)
+            area_scale = (work.shape[0] * work.shape[1]) / (roi.shape[0] * roi.shape[1])
+            kernel = self._scaled_kernel
+        else:
+            work = roi
+            area_scale = 1.0
+            kernel = self.kernel
+        
+        if profiler:
+            profiler.lap("roi")
+        
+        # Yeşil maskeyi ve piksel sayısını hesapla. Oran, karar davranışı değişmesin
+        # diye takip penceresinde de tam ROI alanına göre hesaplanır.
+        if segmentation is not None:
+            mask = segmentation.mask("green_lamp", region_box, out=self._get_buffer("segmentation_mask", work.shape))
+            if profiler:
+                profiler.lap("segmentation_query")
+            mask, green_pixel_count = self._denoise(mask, kernel)
+        else:
+            mask, green_pixel_count = self._compute_green_mask(work, kernel)
+        mask_pixel_count = green_pixel_count
+        total_roi_pixels = int(round((roi_y2 - roi_y1) * (roi_x2 - roi_x1) * area_scale))
+        min_green_area = self.min_green_area * area_scale
+        
+        if self.refine_detection and segmentation is None and work is not roi and green_pixel_count > 0:
+            # Aday lekelerin çevresini tam çözünürlükte yeniden işle
+            x, y, w, h = cv2.boundingRect(mask)
+            scale_x = roi.shape[1] / mask.shape[1]
+            scale_y = roi.shape[0] / mask.shape[0]
+            padding = self.kernel.shape[0] * 2
+            x1 = max(0, int(x * scale_x) - padding)
+            y1 = max(0, int(y * scale_y) - padding)
+            x2 = min(roi.shape[1], int((x + w) * scale_x) + padding)
+            y2 = min(roi.shape[0], int((y + h) * scale_y) + padding)
+            
+            _, green_pixel_count = self._compute_green_mask(roi[y1:y2, x1:x2], self.kernel, "refine_")
+            total_roi_pixels = (roi_y2 - roi_y1) * (roi_x2 - roi_x1)
+            min_green_area = self.min_green_area
         
-        # Yeşil piksellerin sayısını hesapla
-        green_pixel_count = cv2.countNonZero(mask)
-        total_roi_pixels = roi.shape[0] * roi.shape[1]
         green_ratio = green_pixel_count / total_roi_pixels if total_roi_pixels > 0 else 0
         
         # Yeşil ışık tespit edildi mi?
-        is_green_light = green_pixel_count > self.min_green_area and green_ratio > self.green_threshold
+        is_green_light = green_pixel_count > min_green_area and green_ratio > self.green_threshold
+        info = {
+            "green_pixel_count": green_pixel_count,
+            "total_roi_pixels": total_roi_pixels,
+            "green_ratio": green_ratio,
+            "roi": (roi_x1, roi_y1, roi_x2, roi_y2),
+            "search_window": (region_x1, region_y1, region_x2, region_y2),
+            "detection_scale": self.detection_scale if segmentation is None else segmentation.scale_x,
+            "frame_sequence": sequence,
+            "capture_timestamp": timestamp
+        }
+        
+        # Aboneler karar verilir verilmez bilgilendirilir
+        self._notify_green(is_green_light, timestamp, info)
+        
+        if self.tracking_enabled:
+            red_mask = None
+            if segmentation is not None and mask_pixel_count == 0:
+                red_mask = segmentation.mask("red_lamp", region_box, out=self._get_buffer("track_red", work.shape))
+            lamp_box = self._locate_lamp(work, mask, mask_pixel_count, self.min_lamp_area * area_scale, red_mask)
+            if lamp_box is not None and work is not roi:
+                # Küçültülmüş koordinatları bölge koordinatlarına dönüştür
+                scale_x = roi.shape[1] / work.shape[1]
+                scale_y = roi.shape[0] / work.shape[0]
+                lamp_box = (int(lamp_box[0] * scale_x), int(lamp_box[1] * scale_y),
+                            int(lamp_box[2] * scale_x), int(lamp_box[3] * scale_y))
+            self._update_tracking((roi_x1, roi_y1, roi_x2, roi_y2), (region_x1, region_y1), lamp_box)
         
-        # Debug modunda görselleştirme
+        if profiler:
+            profiler.lap("decision")
+        
+        # Debug modunda görselleştirme: çizim ve yayın ayrı iş parçacığında yapılır,
+        # burada yalnızca (kare hızı sınırı içinde) görüntü kuyruğa eklenir
         if self.debug:
-            # ROI'yi çiz
-            debug_frame = frame.copy()
-            cv2.rectangle(debug_frame, (roi_x1, roi_y1), (roi_x2, roi_y2), (0, 255, 0), 2)
-            
-            # Maskeyi renkli görüntüye dönüştür
-            mask_colored = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
-            
-            # Sonuç metni
-            text = "YESIL ISIK TESPIT EDILDI" if is_green_light else "YESIL ISIK YOK"
-            color = (0, 255, 0) if is_green_light else (0, 0, 255)
-            cv2.putText(debug_frame, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
-            cv2.putText(debug_frame, f"Yesil Oran: {green_ratio:.4f}", (10, 60), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-            
-            # Görüntüleri göster
-            cv2.imshow("Orijinal Goruntu", debug_frame)
-            cv2.imshow("ROI", roi)
-            cv2.imshow("Yesil Maske", mask_colored)
-            cv2.waitKey(1)
-        
-        return is_green_light, {
+            if self.debug_stream is None:
+                self.debug_stream = DebugStreamer(host=self.debug_host, port=self.debug_port,
+                                                  max_fps=self.debug_max_fps)
+                self.debug_stream.start()
+                print(f"Debug yayını: http://{self.debug_host}:{self.debug_stream.port}/")
+            self.debug_stream.submit(frame, mask, {
+                "roi": (roi_x1, roi_y1, roi_x2, roi_y2),
+                "search_window": (region_x1, region_y1, region_x2, region_y2),
+                "is_green": is_green_light,
+                "green_ratio": green_ratio
+            })
+        
+        self.frames_processed += 1
+        result = is_green_light, info
+        if self.gating_enabled:
+            self._gate_result = result
+        return result
+    
+    def detect_green_light_batch(self, frames, chunk_size=8):
+        """
+        Çok sayıda görüntüyü toplu olarak işler (çevrimdışı değerlendirme ve kalibrasyon için).
+        Sonuçlar detect_green_light ile birebir aynıdır. Takip ve değişim kapısı
+        kullanılmaz; her görüntü bağımsız işlenir.
+        
+        Aynı parçadaki ROI'ler arada dolgu satırları olacak şekilde alt alta dizilir
+        ve tek bir görüntü gibi işlenir. Dolgu satırları erozyondan önce 255,
+        genişletmeden önce 0 yapılır; böylece morfolojik işlemler görüntüler arasında
+        taşmaz ve her ROI'nin kenarları tek tek işlemedeki gibi davranır.
+        
+        Args:
+            frames (np.array): (N, H, W, 3) boyutunda BGR görüntü yığını (np.memmap olabilir)
+            chunk_size (int): Aynı anda işlenecek görüntü sayısı
+            
+        Returns:
+            dict: "green_pixel_count", "green_ratio" ve "is_green" NumPy dizileri
+        """
+        count = len(frames)
+        green_pixel_counts = np.zeros(count, np.int64)
+        
+        if count == 0:
+            return {"green_pixel_count": green_pixel_counts,
+                    "green_ratio": np.zeros(0),
+                    "is_green": np.zeros(0, bool)}
+        
+        roi_x1, roi_y1, roi_x2, roi_y2 = self._get_roi_geometry(frames.shape[1:])
+        roi_height, roi_width = roi_y2 - roi_y1, roi_x2 - roi_x1
+        total_roi_pixels = roi_height * roi_width
+        
+        # Toplu yol yalnızca varsayılan işlem zincirini destekler; diğer ayarlarda
+        # görüntüler tek tek işlenir
+        vectorized = (self.detection_scale == 1.0 and self.denoise_method == "reference"
+                      and roi_height > 0 and roi_width > 0)
+        
+        if not vectorized:
+            green_ratios = np.zeros(count)
+            is_green = np.zeros(count, bool)
+            for index in range(count):
+                is_green[index], info = self._detect_single_stateless(frames[index])
+                green_pixel_counts[index] = info["green_pixel_count"]
+                green_ratios[index] = info["green_ratio"]
+            
+            return {
+                "green_pixel_count": green_pixel_counts,
+                "green_ratio": green_ratios,
+                "is_green": is_green
+            }
+        
+        # Erozyon ve 2x genişletme en fazla bu kadar satır uzağa etki eder
+        padding = (self.kernel.shape[0] // 2) * 2
+        padded_height = roi_height + padding
+        
+        for start in range(0, count, chunk_size):
+            chunk = frames[start:start + chunk_size, roi_y1:roi_y2, roi_x1:roi_x2]
+            chunk_count = len(chunk)
+            
+            stacked = self._get_buffer("batch_bgr", (chunk_count, padded_height, roi_width, 3))
+            if stacked is None:
+                stacked = np.empty((chunk_count, padded_height, roi_width, 3), np.uint8)
+            np.copyto(stacked[:, :roi_height], chunk)
+            stacked[:, roi_height:] = 0
+            image = stacked.reshape(chunk_count * padded_height, roi_width, 3)
+            
+            stacked_shape = image.shape[:2]
+            if self.color_classifier == "lut":
+                mask = self.green_lut.classify(image, out=self._get_buffer("batch_mask", stacked_shape))
+            else:
+                hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=self._get_buffer("batch_hsv", image.shape))
+                mask = cv2.inRange(hsv, self.lower_green, self.upper_green,
+                                   dst=self._get_buffer("batch_mask", stacked_shape))
+            
+            # Dolgu satırları erozyonda kenar gibi davranmalı (erimeye yol açmamalı)
+            mask.reshape(chunk_count, padded_height, roi_width)[:, roi_height:] = 255
+            mask = cv2.erode(mask, self.kernel, dst=self._get_buffer("batch_eroded", stacked_shape), iterations=1)
+            
+            # Genişletmede ise komşu ROI'ye taşmamalı
+            mask.reshape(chunk_count, padded_height, roi_width)[:, roi_height:] = 0
+            mask = cv2.dilate(mask, self.kernel, dst=self._get_buffer("batch_dilated", stacked_shape), iterations=2)
+            
+            frames_mask = mask.reshape(chunk_count, padded_height, roi_width)
+            for offset in range(chunk_count):
+                green_pixel_counts[start + offset] = cv2.countNonZero(frames_mask[offset, :roi_height])
+        
+        green_ratios = green_pixel_counts / total_roi_pixels if total_roi_pixels > 0 else np.zeros(count)
+        is_green = (green_pixel_counts > self.min_green_area) & (green_ratios > self.green_threshold)
+        
+        return {
+            "green_pixel_count": green_pixel_counts,
+            "green_ratio": green_ratios,
+            "is_green": is_green
+        }
+    
+    def _detect_single_stateless(self, frame):
+        """
+        Takip, değişim kapısı ve debug görselleştirmesi olmadan tek bir görüntüyü işler.
+        Canlı algılamanın durumu (takip penceresi, kayıp ve işlenen kare sayaçları)
+        değiştirilmez.
+        
+        Args:
+            frame (np.array): BGR görüntü
+            
+        Returns:
+            bool: Yeşil ışık tespit edilirse True, aksi halde False
+            dict: Tespit sonuçları hakkında ek bilgiler
+        """
+        saved = (self.tracking_enabled, self.gating_enabled, self.debug, self.track_window, self.track_misses,
+                 self.frames_processed, self._green_subscriptions, self._green_streak)
+        self.tracking_enabled = self.gating_enabled = self.debug = False
+        self._green_subscriptions = []
+        try:
+            return self.detect_green_light(np.ascontiguousarray(frame))
+        finally:
+            (self.tracking_enabled, self.gating_enabled, self.debug, self.track_window, self.track_misses,
+             self.frames_processed, self._green_subscriptions, self._green_streak) = saved
+    
+    def detect_green_light_yuv420(self, frame, layout="I420", timestamp=None, sequence=None):
+        """
+        Düzlemsel YUV420 görüntüde yeşil trafik ışığını tespit eder. Renk dönüşümü
+        yapılmaz; sınıflandırma HSV aralığından türetilmiş arama tablosuyla doğrudan
+        kroma çözünürlüğünde (çeyrek çözünürlük) Y, U ve V düzlemleri üzerinde yapılır.
+        
+        Takip, değişim kapısı ve debug görselleştirmesi bu yolda kullanılmaz.
+        
+        Args:
+            frame (np.array): (H * 3 / 2, W) boyutunda YUV420 tamponu (picamera2 "YUV420" biçimi)
+            layout (str): "I420" (Y, U, V düzlemleri) veya "NV12" (Y düzlemi, iç içe UV)
+            timestamp (float, optional): Görüntünün yakalanma zamanı (time.monotonic)
+            sequence (int, optional): Görüntü sıra numarası
+            
+        Returns:
+            bool: Yeşil ışık tespit edilirse True, aksi halde False
+            dict: Tespit sonuçları hakkında ek bilgiler
+        """
+        profiler = self.profiler
+        if profiler:
+            profiler.mark()
+        
+        if layout not in ("I420", "NV12"):
+            raise ValueError(f"Bilinmeyen YUV420 düzeni: {layout}")
+        
+        if self.yuv_lut is None:
+            self.yuv_lut = YuvLookupTable(self.lower_green, self.upper_green)
+        
+        height = frame.shape[0] * 2 // 3
+        width = frame.shape[1]
+        chroma_height, chroma_width = height // 2, width // 2
+        
+        # Düzlemleri kopyalamadan ayır
+        y_plane = frame[:height]
+        if layout == "I420":
+            chroma = frame[height:].reshape(-1)
+            chroma_size = chroma_height * chroma_width
+            u_plane = chroma[:chroma_size].reshape(chroma_height, chroma_width)
+            v_plane = chroma[chroma_size:2 * chroma_size].reshape(chroma_height, chroma_width)
+        else:
+            uv_plane = frame[height:].reshape(chroma_height, chroma_width, 2)
+            u_plane = uv_plane[..., 0]
+            v_plane = uv_plane[..., 1]
+        
+        # ROI koordinatlarını al ve kroma çözünürlüğüne dönüştür
+        roi_x1, roi_y1, roi_x2, roi_y2 = self._get_roi_geometry((height, width, 3))
+        chroma_x1, chroma_y1 = roi_x1 // 2, roi_y1 // 2
+        chroma_x2, chroma_y2 = roi_x2 // 2, roi_y2 // 2
+        
+        # Y düzlemi kroma çözünürlüğüne örneklenir (her 2x2 bloğun sol üst pikseli)
+        y_roi = y_plane[chroma_y1 * 2:chroma_y2 * 2:2, chroma_x1 * 2:chroma_x2 * 2:2]
+        u_roi = u_plane[chroma_y1:chroma_y2, chroma_x1:chroma_x2]
+        v_roi = v_plane[chroma_y1:chroma_y2, chroma_x1:chroma_x2]
+        mask_shape = u_roi.shape
+        
+        if profiler:
+            profiler.lap("roi")
+        
+        mask = self.yuv_lut.classify(y_roi, u_roi, v_roi, out=self._get_buffer("yuv_mask", mask_shape))
+        if profiler:
+            profiler.lap("color_lookup")
+        
+        # Gürültüyü azalt (çekirdek yarı ölçekte) ve yeşil piksellerin sayısını hesapla.
+        # Alan eşiği kroma çözünürlüğüne ölçeklenir.
+        if self._yuv_kernel is None:
+            self._yuv_kernel = self._kernel_for_scale(0.5)
+        mask, green_pixel_count = self._denoise(mask, self._yuv_kernel, "yuv_")
+        total_roi_pixels = mask_shape[0] * mask_shape[1]
+        full_roi_pixels = (roi_y2 - roi_y1) * (roi_x2 - roi_x1)
+        area_scale = total_roi_pixels / full_roi_pixels if full_roi_pixels > 0 else 0
+        green_ratio = green_pixel_count / total_roi_pixels if total_roi_pixels > 0 else 0
+        
+        # Yeşil ışık tespit edildi mi?
+        is_green_light = (green_pixel_count > self.min_green_area * area_scale
+                          and green_ratio > self.green_threshold)
+        info = {
             "green_pixel_count": green_pixel_count,
             "total_roi_pixels": total_roi_pixels,
             "green_ratio": green_ratio,
-            "roi": (roi_x1, roi_y1, roi_x2, roi_y2)
+            "roi": (roi_x1, roi_y1, roi_x2, roi_y2),
+            "detection_scale": 0.5,
+            "frame_sequence": sequence,
+            "capture_timestamp": timestamp
         }
+        self._notify_green(is_green_light, timestamp, info)
+        if profiler:
+            profiler.lap("decision")
+        
+        self.frames_processed += 1
+        return is_green_light, info
     
-    def wait_for_green_light(self, timeout=None):
+    def wait_for_green_light(self, timeout=None, confirm_frames=1):
         """
-        Yeşil ışık tespit edilene kadar bekler
+        Yeşil ışık tespit edilene kadar bekler. Kareler geldikçe işlenir (uyku
+        yoktur); bekleme, yeşil kararın verildiği karede biter.
         
         Args:
             timeout (float, optional): Maksimum bekleme süresi (saniye). None ise süresiz bekler.
+            confirm_frames (int): Yeşil kabul edilmesi için gereken ardışık yeşil kare sayısı
             
         Returns:
             bool: Yeşil ışık tespit edilirse True, zaman aşımı olursa False
@@ -169,19 +1243,60 @@ class TrafficLightDetector:
         if self.camera is None:
             self.start_camera()
         
-        start_time = time.time()
-        
-        while True:
-            is_green, _ = self.detect_green_light()
-            
-            if is_green:
-                return True
-            
-            if timeout is not None and (time.time() - start_time) > timeout:
-                return False
-            
-            # CPU yükünü azaltmak için kısa bir bekleme
-            time.sleep(0.05)
+        subscription = self.subscribe_green(confirm_frames=confirm_frames)
+        start_time = time.monotonic()
+        try:
+            while not subscription.event.is_set():
+                remaining = None
+                if timeout is not None:
+                    remaining = timeout - (time.monotonic() - start_time)
+                    if remaining <= 0:
+                        return False
+                
+                ret, frame = self.read_frame(timeout=remaining)
+                if ret:
+                    self.detect_green_light(frame)
+                else:
+                    # Kamera görüntü vermiyorsa döngü işlemciyi meşgul etmesin
+                    time.sleep(0.01)
+            return True
+        finally:
+            subscription.cancel()
+
+
+def create_detector(config):
+    """
+    Yapılandırma sözlüğüne göre bir detektör oluşturur (değerlendirme aracı ve
+    algılama işlemleri için; kamera açılmaz)
+
+    Args:
+        config (dict): Detektör ayarları (hsv_min, hsv_max, roi, green_threshold,
+                       min_green_area, color_classifier, detection_scale, denoise,
+                       tracking, change_gating)
+
+    Returns:
+        TrafficLightDetector: Ayarlanmış detektör
+    """
+    detector = TrafficLightDetector()
+    if "hsv_min" in config and "hsv_max" in config:
+        detector.set_hsv_range(config["hsv_min"], config["hsv_max"])
+    if "roi" in config:
+        detector.set_roi(*config["roi"])
+    if "green_threshold" in config:
+        detector.set_green_threshold(config["green_threshold"])
+    if "min_green_area" in config:
+        detector.min_green_area = config["min_green_area"]
+    if "color_classifier" in config:
+        detector.set_color_classifier(config["color_classifier"])
+    if "detection_scale" in config:
+        detector.set_detection_scale(config["detection_scale"], refine=config.get("refine", False))
+    if "denoise" in config:
+        detector.set_denoise_method(config["denoise"])
+    if config.get("tracking"):
+        detector.set_tracking(True)
+    if config.get("change_gating"):
+        detector.set_change_gating(True)
+    return detector
 
 
 def main():
@@ -191,7 +1306,7 @@ def main():
     try:
         print("Trafik ışığı tespit ediliyor...")
         print("Yeşil ışık için bekleniyor...")
-        print("Çıkmak için 'q' tuşuna basın")
+        print("Çıkmak için Ctrl+C tuşlarına basın")
         
         detector.start_camera()
         
@@ -200,16 +1315,11 @@ def main():
             
             if is_green:
                 print("YEŞİL IŞIK TESPİT EDİLDİ!")
-            
-            # 'q' tuşuna basılırsa çık
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
                 
     except KeyboardInterrupt:
         print("Program kullanıcı tarafından durduruldu")
     finally:
         detector.stop_camera()
-        cv2.destroyAllWindows()
         print("Program sonlandırıldı")
 
 